@@ -0,0 +1,33 @@
+"""add task team/assignee/status index
+
+Revision ID: 3b7e91c2d4a5
+Revises: 658824f25e3d
+Create Date: 2025-11-20 10:10:41.218804
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3b7e91c2d4a5'
+down_revision: Union[str, Sequence[str], None] = '658824f25e3d'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        'ix_task_team_assignee_status',
+        'task',
+        ['team_id', 'assignee_id', 'status'],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_task_team_assignee_status', table_name='task')
@@ -0,0 +1,33 @@
+"""add evaluation task/rated_at covering index
+
+Revision ID: 8c41d0e7a2f6
+Revises: 3b7e91c2d4a5
+Create Date: 2025-11-21 09:30:12.604417
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8c41d0e7a2f6'
+down_revision: Union[str, Sequence[str], None] = '3b7e91c2d4a5'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        'ix_evaluation_task_rated',
+        'evaluation',
+        ['task_id', 'rated_at', 'value'],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_evaluation_task_rated', table_name='evaluation')
@@ -0,0 +1,40 @@
+"""add meeting overlap exclusion constraint
+
+Revision ID: d9f2a6b13c78
+Revises: 8c41d0e7a2f6
+Create Date: 2025-11-24 11:15:37.902155
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd9f2a6b13c78'
+down_revision: Union[str, Sequence[str], None] = '8c41d0e7a2f6'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema.
+
+    Уже существующие пересекающиеся запланированные встречи одной команды
+    нужно отменить или перенести до применения миграции.
+    """
+    op.execute("CREATE EXTENSION IF NOT EXISTS btree_gist")
+    op.create_exclude_constraint(
+        'ex_meeting_team_overlap',
+        'meeting',
+        ('team_id', '='),
+        (sa.text('tsrange(starts_at, ends_at)'), '&&'),
+        where=sa.text("status = 'scheduled'"),
+        using='gist',
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_constraint('ex_meeting_team_overlap', 'meeting', type_='exclude')
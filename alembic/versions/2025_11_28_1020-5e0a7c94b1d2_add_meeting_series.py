@@ -0,0 +1,56 @@
+"""add meeting series
+
+Revision ID: 5e0a7c94b1d2
+Revises: d9f2a6b13c78
+Create Date: 2025-11-28 10:20:11.408532
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5e0a7c94b1d2'
+down_revision: Union[str, Sequence[str], None] = 'd9f2a6b13c78'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('meetingseries',
+    sa.Column('team_id', sa.Integer(), nullable=False),
+    sa.Column('title', sa.String(length=255), nullable=False),
+    sa.Column('description', sa.Text(), nullable=True),
+    sa.Column('starts_at', sa.DateTime(), nullable=False),
+    sa.Column('ends_at', sa.DateTime(), nullable=False),
+    sa.Column('freq', sa.Enum('daily', 'weekly', 'monthly', name='recurrencefreq'), nullable=False),
+    sa.Column('interval', sa.Integer(), nullable=False),
+    sa.Column('until', sa.DateTime(), nullable=True),
+    sa.Column('exdates', sa.JSON(), nullable=False),
+    sa.Column('materialized_until', sa.DateTime(), nullable=False),
+    sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.ForeignKeyConstraint(['team_id'], ['team.id'], name=op.f('fk_meetingseries_team_id_team'), ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id', name=op.f('pk_meetingseries'))
+    )
+    op.create_index(op.f('ix_meetingseries_team_id'), 'meetingseries', ['team_id'], unique=False)
+    op.add_column('meeting', sa.Column('series_id', sa.Integer(), nullable=True))
+    op.create_index(op.f('ix_meeting_series_id'), 'meeting', ['series_id'], unique=False)
+    op.create_foreign_key(
+        op.f('fk_meeting_series_id_meetingseries'), 'meeting', 'meetingseries',
+        ['series_id'], ['id'], ondelete='CASCADE',
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_constraint(op.f('fk_meeting_series_id_meetingseries'), 'meeting', type_='foreignkey')
+    op.drop_index(op.f('ix_meeting_series_id'), table_name='meeting')
+    op.drop_column('meeting', 'series_id')
+    op.drop_index(op.f('ix_meetingseries_team_id'), table_name='meetingseries')
+    op.drop_table('meetingseries')
+    sa.Enum(name='recurrencefreq').drop(op.get_bind(), checkfirst=True)
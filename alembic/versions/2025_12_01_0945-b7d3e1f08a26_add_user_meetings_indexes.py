@@ -0,0 +1,34 @@
+"""add user meetings indexes
+
+Revision ID: b7d3e1f08a26
+Revises: 5e0a7c94b1d2
+Create Date: 2025-12-01 09:45:52.114870
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b7d3e1f08a26'
+down_revision: Union[str, Sequence[str], None] = '5e0a7c94b1d2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_mp_user_meeting', 'meeting_participants', ['user_id', 'meeting_id'], unique=False)
+    op.drop_index('ix_mp_user', table_name='meeting_participants')
+    op.create_index('ix_meeting_starts_at_id', 'meeting', ['starts_at', 'id'], unique=False)
+    op.drop_index(op.f('ix_meeting_starts_at'), table_name='meeting')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.create_index(op.f('ix_meeting_starts_at'), 'meeting', ['starts_at'], unique=False)
+    op.drop_index('ix_meeting_starts_at_id', table_name='meeting')
+    op.create_index('ix_mp_user', 'meeting_participants', ['user_id'], unique=False)
+    op.drop_index('ix_mp_user_meeting', table_name='meeting_participants')
@@ -0,0 +1,28 @@
+"""add task team deadline index
+
+Revision ID: e4a9c2d7f315
+Revises: b7d3e1f08a26
+Create Date: 2025-12-03 14:10:26.551092
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e4a9c2d7f315'
+down_revision: Union[str, Sequence[str], None] = 'b7d3e1f08a26'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_task_team_deadline', 'task', ['team_id', 'deadline_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_task_team_deadline', table_name='task')
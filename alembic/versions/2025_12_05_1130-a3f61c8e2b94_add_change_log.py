@@ -0,0 +1,40 @@
+"""add change log
+
+Revision ID: a3f61c8e2b94
+Revises: e4a9c2d7f315
+Create Date: 2025-12-05 11:30:42.118304
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a3f61c8e2b94'
+down_revision: Union[str, Sequence[str], None] = 'e4a9c2d7f315'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('changelog',
+    sa.Column('team_id', sa.Integer(), nullable=False, comment='ID команды; без FK, чтобы надгробия переживали удаление сущностей'),
+    sa.Column('entity', sa.String(length=32), nullable=False, comment='Тип сущности: task / meeting / comment / membership'),
+    sa.Column('entity_id', sa.Integer(), nullable=False, comment='ID сущности (для membership — ID пользователя)'),
+    sa.Column('op', sa.Enum('upsert', 'delete', name='changeop'), nullable=False, comment='upsert — актуальный снимок в payload, delete — надгробие'),
+    sa.Column('payload', sa.JSON(), nullable=True, comment='Снимок сущности на момент изменения'),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+    sa.PrimaryKeyConstraint('id', name=op.f('pk_changelog'))
+    )
+    op.create_index('ix_changelog_team_id_id', 'changelog', ['team_id', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_changelog_team_id_id', table_name='changelog')
+    op.drop_table('changelog')
+    sa.Enum(name='changeop').drop(op.get_bind(), checkfirst=True)
@@ -0,0 +1,44 @@
+"""add participant period
+
+Revision ID: c8e2d5a71f03
+Revises: a3f61c8e2b94
+Create Date: 2025-12-08 09:15:07.340219
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c8e2d5a71f03'
+down_revision: Union[str, Sequence[str], None] = 'a3f61c8e2b94'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('meeting_participants', sa.Column('starts_at', sa.DateTime(), nullable=True, comment='Начало встречи (денормализовано из meeting)'))
+    op.add_column('meeting_participants', sa.Column('ends_at', sa.DateTime(), nullable=True, comment='Окончание встречи (денормализовано из meeting)'))
+    op.execute(
+        "UPDATE meeting_participants AS mp "
+        "SET starts_at = m.starts_at, ends_at = m.ends_at "
+        "FROM meeting AS m WHERE m.id = mp.meeting_id"
+    )
+    # btree_gist уже подключено миграцией d9f2a6b13c78.
+    op.create_index(
+        'ix_mp_user_period',
+        'meeting_participants',
+        ['user_id', sa.text('tsrange(starts_at, ends_at)')],
+        unique=False,
+        postgresql_using='gist',
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_mp_user_period', table_name='meeting_participants', postgresql_using='gist')
+    op.drop_column('meeting_participants', 'ends_at')
+    op.drop_column('meeting_participants', 'starts_at')
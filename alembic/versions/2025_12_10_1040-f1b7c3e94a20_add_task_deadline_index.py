@@ -0,0 +1,28 @@
+"""add task deadline index
+
+Revision ID: f1b7c3e94a20
+Revises: c8e2d5a71f03
+Create Date: 2025-12-10 10:40:51.902316
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f1b7c3e94a20'
+down_revision: Union[str, Sequence[str], None] = 'c8e2d5a71f03'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_task_deadline_at', 'task', ['deadline_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_task_deadline_at', table_name='task')
@@ -0,0 +1,42 @@
+"""add outbox
+
+Revision ID: 9d4e7b2c6a51
+Revises: f1b7c3e94a20
+Create Date: 2025-12-12 16:20:33.481027
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9d4e7b2c6a51'
+down_revision: Union[str, Sequence[str], None] = 'f1b7c3e94a20'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('outboxmessage',
+    sa.Column('endpoint', sa.String(length=2048), nullable=False, comment='URL вебхука-получателя'),
+    sa.Column('team_id', sa.Integer(), nullable=False, comment='ID команды, к которой относится событие'),
+    sa.Column('event', sa.JSON(), nullable=False, comment='Тело события: entity, id, op, data'),
+    sa.Column('status', sa.Enum('pending', 'dead', name='outboxstatus'), nullable=False, comment='pending — ждёт доставки, dead — попытки исчерпаны'),
+    sa.Column('attempts', sa.Integer(), nullable=False, comment='Число неудачных попыток доставки'),
+    sa.Column('next_attempt_at', sa.DateTime(), nullable=False, comment='Когда можно пробовать снова (UTC); при выдаче воркеру сдвигается на время аренды'),
+    sa.Column('last_error', sa.Text(), nullable=True, comment='Последняя ошибка доставки'),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+    sa.PrimaryKeyConstraint('id', name=op.f('pk_outboxmessage'))
+    )
+    op.create_index('ix_outboxmessage_status_next_attempt', 'outboxmessage', ['status', 'next_attempt_at', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_outboxmessage_status_next_attempt', table_name='outboxmessage')
+    op.drop_table('outboxmessage')
+    sa.Enum(name='outboxstatus').drop(op.get_bind(), checkfirst=True)
@@ -0,0 +1,52 @@
+"""add job
+
+Revision ID: 5b8f2a6d0c17
+Revises: 9d4e7b2c6a51
+Create Date: 2025-12-15 11:05:12.604318
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5b8f2a6d0c17'
+down_revision: Union[str, Sequence[str], None] = '9d4e7b2c6a51'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('job',
+    sa.Column('kind', sa.String(length=64), nullable=False, comment='Тип задания, например team.delete'),
+    sa.Column('status', sa.Enum('queued', 'running', 'done', 'failed', name='jobstatus'), nullable=False, comment='queued — ждёт воркера, running — выполняется, done/failed — завершено'),
+    sa.Column('payload', sa.JSON(), nullable=False, comment='Параметры задания'),
+    sa.Column('result', sa.JSON(), nullable=True, comment='Результат выполнения'),
+    sa.Column('error', sa.Text(), nullable=True, comment='Последняя ошибка'),
+    sa.Column('progress_done', sa.Integer(), nullable=False, comment='Сколько единиц работы выполнено'),
+    sa.Column('progress_total', sa.Integer(), nullable=True, comment='Сколько единиц работы всего (если известно)'),
+    sa.Column('attempts', sa.Integer(), nullable=False, comment='Сколько раз задание выдавалось воркеру'),
+    sa.Column('user_id', sa.Integer(), nullable=True, comment='ID пользователя, поставившего задание'),
+    sa.Column('team_id', sa.Integer(), nullable=True, comment='ID команды, над которой работает задание (без FK: команда может быть уже удалена)'),
+    sa.Column('locked_until', sa.DateTime(), nullable=True, comment='Аренда воркера (UTC); после истечения задание можно выдать снова'),
+    sa.Column('started_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('finished_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+    sa.ForeignKeyConstraint(['user_id'], ['user.id'], name=op.f('fk_job_user_id_user'), ondelete='SET NULL'),
+    sa.PrimaryKeyConstraint('id', name=op.f('pk_job'))
+    )
+    op.create_index('ix_job_status_id', 'job', ['status', 'id'], unique=False)
+    op.create_index('ix_job_kind_team_status', 'job', ['kind', 'team_id', 'status'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_job_kind_team_status', table_name='job')
+    op.drop_index('ix_job_status_id', table_name='job')
+    op.drop_table('job')
+    sa.Enum(name='jobstatus').drop(op.get_bind(), checkfirst=True)
@@ -0,0 +1,37 @@
+"""add team snapshot
+
+Revision ID: 3c7e1a9f5d28
+Revises: 5b8f2a6d0c17
+Create Date: 2025-12-16 09:40:27.118204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3c7e1a9f5d28'
+down_revision: Union[str, Sequence[str], None] = '5b8f2a6d0c17'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('teamsnapshot',
+    sa.Column('team_id', sa.Integer(), nullable=False, comment='ID команды'),
+    sa.Column('body', sa.LargeBinary(), nullable=False, comment='Готовый JSON-документ: команда, участники, открытые задачи, предстоящие встречи'),
+    sa.Column('version', sa.Integer(), nullable=False, comment='Растёт при каждом изменении документа (ETag)'),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+    sa.ForeignKeyConstraint(['team_id'], ['team.id'], name=op.f('fk_teamsnapshot_team_id_team'), ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id', name=op.f('pk_teamsnapshot')),
+    sa.UniqueConstraint('team_id', name=op.f('uq_teamsnapshot_team_id'))
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('teamsnapshot')
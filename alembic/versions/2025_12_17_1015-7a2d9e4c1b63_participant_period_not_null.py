@@ -0,0 +1,37 @@
+"""participant period not null
+
+Revision ID: 7a2d9e4c1b63
+Revises: 3c7e1a9f5d28
+Create Date: 2025-12-17 10:15:44.502917
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7a2d9e4c1b63'
+down_revision: Union[str, Sequence[str], None] = '3c7e1a9f5d28'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # строки, добавленные через ORM-связь до появления default, остались с NULL
+    op.execute(
+        "UPDATE meeting_participants AS mp "
+        "SET starts_at = m.starts_at, ends_at = m.ends_at "
+        "FROM meeting AS m WHERE m.id = mp.meeting_id "
+        "AND (mp.starts_at IS NULL OR mp.ends_at IS NULL)"
+    )
+    op.alter_column('meeting_participants', 'starts_at', existing_type=sa.DateTime(), nullable=False)
+    op.alter_column('meeting_participants', 'ends_at', existing_type=sa.DateTime(), nullable=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.alter_column('meeting_participants', 'ends_at', existing_type=sa.DateTime(), nullable=True)
+    op.alter_column('meeting_participants', 'starts_at', existing_type=sa.DateTime(), nullable=True)
@@ -0,0 +1,38 @@
+"""add reminder log
+
+Revision ID: e4b8c2a7f915
+Revises: 7a2d9e4c1b63
+Create Date: 2025-12-17 11:40:09.731562
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e4b8c2a7f915'
+down_revision: Union[str, Sequence[str], None] = '7a2d9e4c1b63'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('reminderlog',
+    sa.Column('kind', sa.String(length=16), nullable=False, comment='task или meeting'),
+    sa.Column('entity_id', sa.Integer(), nullable=False, comment='ID задачи или встречи (без FK: запись переживает удаление)'),
+    sa.Column('due_at', sa.DateTime(), nullable=False, comment='Срок, о котором напомнили; перенос срока даёт новое напоминание'),
+    sa.Column('sent_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+    sa.PrimaryKeyConstraint('id', name=op.f('pk_reminderlog')),
+    sa.UniqueConstraint('kind', 'entity_id', 'due_at', name=op.f('uq_reminderlog_kind_entity_id_due_at'))
+    )
+    op.create_index(op.f('ix_reminderlog_due_at'), 'reminderlog', ['due_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_reminderlog_due_at'), table_name='reminderlog')
+    op.drop_table('reminderlog')
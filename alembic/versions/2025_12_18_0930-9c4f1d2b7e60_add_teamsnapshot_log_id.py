@@ -0,0 +1,36 @@
+"""add teamsnapshot log_id
+
+Revision ID: 9c4f1d2b7e60
+Revises: e4b8c2a7f915
+Create Date: 2025-12-18 09:30:41.218305
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9c4f1d2b7e60'
+down_revision: Union[str, Sequence[str], None] = 'e4b8c2a7f915'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('teamsnapshot', sa.Column(
+        'log_id', sa.Integer(), server_default='0', nullable=False,
+        comment='Последняя запись changelog, учтённая в документе',
+    ))
+    # до этой ревизии снимки обновлялись в транзакциях писателей — они уже учитывают весь журнал
+    op.execute(
+        "UPDATE teamsnapshot SET log_id = COALESCE("
+        "(SELECT max(changelog.id) FROM changelog WHERE changelog.team_id = teamsnapshot.team_id), 0)"
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('teamsnapshot', 'log_id')
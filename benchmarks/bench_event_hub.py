@@ -0,0 +1,73 @@
+"""Нагрузка на EventHub: тысячи простаивающих SSE-подписчиков в одном процессе.
+
+Запуск из корня репозитория:
+
+    python -m benchmarks.bench_event_hub --subscribers 10000
+"""
+import argparse
+import asyncio
+import gc
+import time
+import tracemalloc
+
+from src.events.hub import EventHub
+
+
+async def _consume(hub: EventHub, team_id: int, received: list[int]) -> None:
+    async for message in hub.stream(team_id):
+        if message.startswith(b"event: change"):
+            received[0] += 1
+
+
+async def main(subscribers: int, teams: int, events: int, keepalive: float) -> None:
+    hub = EventHub(keepalive=keepalive)
+    received = [0]
+    gc.collect()
+    tracemalloc.start()
+    base = tracemalloc.get_traced_memory()[0]
+
+    started = time.perf_counter()
+    tasks = [
+        asyncio.create_task(_consume(hub, i % teams, received))
+        for i in range(subscribers)
+    ]
+    while hub.subscriber_count() < subscribers:
+        await asyncio.sleep(0)
+    print(f"subscribed {subscribers} in {time.perf_counter() - started:.2f}s")
+    memory = tracemalloc.get_traced_memory()[0] - base
+    print(f"memory: {memory / 2**20:.1f} MiB total, {memory / subscribers / 1024:.2f} KiB per subscriber")
+
+    # Простой: подписчики только получают keepalive.
+    await asyncio.sleep(keepalive * 3)
+    loop_started = time.perf_counter()
+    await asyncio.sleep(0)
+    print(f"event loop latency while idle: {(time.perf_counter() - loop_started) * 1000:.2f} ms")
+
+    per_team = subscribers // teams
+    started = time.perf_counter()
+    for n in range(events):
+        hub.publish(n % teams, [{"entity": "task", "id": n, "op": "upsert", "data": {"name": f"t{n}"}}])
+    publish = time.perf_counter() - started
+    while received[0] < events * per_team:
+        await asyncio.sleep(0)
+    delivered = time.perf_counter() - started
+    print(
+        f"{events} events to {per_team} subscribers each: publish {publish / events * 1000:.3f} ms/event, "
+        f"all delivered in {delivered * 1000:.1f} ms"
+    )
+    print(f"dropped subscribers: {hub.dropped}")
+
+    tracemalloc.stop()
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--subscribers", type=int, default=10_000)
+    parser.add_argument("--teams", type=int, default=100)
+    parser.add_argument("--events", type=int, default=1_000)
+    parser.add_argument("--keepalive", type=float, default=1.0)
+    args = parser.parse_args()
+    asyncio.run(main(args.subscribers, args.teams, args.events, args.keepalive))
@@ -0,0 +1,129 @@
+"""Пропускная способность одного узла: SQLite (WAL + очередь писателей) против Postgres.
+
+Одна и та же смешанная нагрузка — чтение снимка команды и списка задач,
+создание задач через TaskCRUD (журнал изменений, снимок, outbox) — от
+нескольких конкурентных клиентов в течение заданного времени.
+
+Запуск из корня репозитория:
+
+    python -m benchmarks.bench_sqlite_vs_postgres --clients 16 --seconds 10
+    python -m benchmarks.bench_sqlite_vs_postgres --postgres-url postgresql+asyncpg://u:p@localhost:5432/bench
+
+SQLite-базы создаются во временном каталоге. Схема в Postgres создаётся
+и удаляется целиком — указывайте пустую базу.
+"""
+import argparse
+import asyncio
+import os
+import random
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker, create_async_engine
+
+import src  # noqa: F401 — все модели в Base.metadata
+from src.config import SqliteConfig
+from src.core.sqlite import configure_sqlite
+from src.models.base import Base
+from src.tasks.crud import TaskCRUD
+from src.teams.models import Team
+from src.teams.snapshot import get_snapshot
+from src.users.models import User
+
+TEAMS = 20
+USERS_PER_TEAM = 10
+DEADLINE = datetime(2030, 1, 1)
+
+
+async def _populate(Session: async_sessionmaker) -> None:
+    async with Session() as session:
+        for t in range(1, TEAMS + 1):
+            session.add(Team(id=t, name=f"team-{t}"))
+        await session.flush()
+        for u in range(1, TEAMS * USERS_PER_TEAM + 1):
+            session.add(User(
+                id=u, email=f"u{u}@bench.io", hashed_password="x",
+                team_id=(u - 1) // USERS_PER_TEAM + 1,
+            ))
+        await session.commit()
+
+
+async def _client(Session: async_sessionmaker, client: int, write_ratio: float, deadline: float,
+                  latencies: dict[str, list[float]]) -> None:
+    rnd = random.Random(client)
+    crud, n = TaskCRUD(), 0
+    while time.perf_counter() < deadline:
+        team_id = rnd.randint(1, TEAMS)
+        started = time.perf_counter()
+        async with Session() as session:
+            if rnd.random() < write_ratio:
+                n += 1
+                await crud.create_task(
+                    session, team_id=team_id, author_id=(team_id - 1) * USERS_PER_TEAM + 1,
+                    name=f"c{client}-{n}", description="-", deadline_at=DEADLINE + timedelta(hours=n),
+                )
+                kind = "write"
+            else:
+                await get_snapshot(session, team_id)
+                await crud.get_all_tasks(session, team_id)
+                kind = "read"
+        latencies[kind].append(time.perf_counter() - started)
+
+
+def _percentile(values: list[float], q: float) -> float:
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(len(values) - 1, int(q * len(values)))] * 1000
+
+
+async def run(label: str, engine: AsyncEngine, clients: int, seconds: float, write_ratio: float) -> None:
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    Session = async_sessionmaker(engine, expire_on_commit=False, autoflush=False)
+    await _populate(Session)
+
+    latencies: dict[str, list[float]] = {"read": [], "write": []}
+    deadline = time.perf_counter() + seconds
+    await asyncio.gather(*(
+        _client(Session, i, write_ratio, deadline, latencies) for i in range(clients)
+    ))
+    total = len(latencies["read"]) + len(latencies["write"])
+    print(f"{label}: {total / seconds:8.0f} ops/s")
+    for kind, values in latencies.items():
+        print(
+            f"  {kind:<6}{len(values) / seconds:8.0f}/s"
+            f"  p50 {_percentile(values, 0.5):7.2f} ms  p99 {_percentile(values, 0.99):7.2f} ms"
+        )
+    if engine.dialect.name == "postgresql":
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.drop_all)
+    await engine.dispose()
+
+
+async def main(clients: int, seconds: float, write_ratio: float, postgres_url: str | None) -> None:
+    directory = tempfile.mkdtemp()
+    for label, options in (
+        ("sqlite, WAL + write queue", SqliteConfig()),
+        ("sqlite, WAL, busy_timeout only", SqliteConfig(serialize_writes=False)),
+    ):
+        path = os.path.join(directory, f"bench-{options.serialize_writes}.sqlite3")
+        engine = create_async_engine(f"sqlite+aiosqlite:///{path}", pool_size=clients, max_overflow=0)
+        queue = configure_sqlite(engine, options)
+        await run(label, engine, clients, seconds, write_ratio)
+        if queue is not None:
+            print(f"  write queue: {queue.stats()}")
+    if postgres_url:
+        engine = create_async_engine(postgres_url, pool_size=clients, max_overflow=0)
+        await run("postgres", engine, clients, seconds, write_ratio)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--clients", type=int, default=16)
+    parser.add_argument("--seconds", type=float, default=10.0)
+    parser.add_argument("--write-ratio", type=float, default=0.2)
+    parser.add_argument("--postgres-url", default=os.getenv("BENCH_POSTGRES_URL"))
+    args = parser.parse_args()
+    asyncio.run(main(args.clients, args.seconds, args.write_ratio, args.postgres_url))
@@ -0,0 +1,115 @@
+"""Сравнение выборки встреч пользователя: EXISTS по participants против join от meeting_participants.
+
+Запуск из корня репозитория:
+
+    python -m benchmarks.bench_user_meetings --participations 1000000
+"""
+import argparse
+import asyncio
+import os
+import random
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+from sqlalchemy import insert, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from src.meetings.crud import MeetingCRUD
+from src.meetings.models import Meeting, MeetingStatus, meeting_participants
+from src.models.base import Base
+from src.teams.models import Team
+from src.users.models import User
+
+PER_MEETING = 5
+BATCH = 50_000
+
+
+async def _populate(session: AsyncSession, participations: int, users: int) -> None:
+    session.add(Team(id=1, name="bench"))
+    await session.execute(insert(User), [
+        {"id": i, "email": f"u{i}@bench.io", "hashed_password": "x", "team_id": 1}
+        for i in range(1, users + 1)
+    ])
+    meetings = participations // PER_MEETING
+    start = datetime(2025, 1, 1)
+    rnd = random.Random(42)
+    for offset in range(0, meetings, BATCH):
+        ids = range(offset + 1, min(offset + BATCH, meetings) + 1)
+        rows = [
+            {
+                "id": i, "team_id": 1, "title": f"m{i}",
+                "starts_at": start + timedelta(minutes=15 * i),
+                "ends_at": start + timedelta(minutes=15 * i + 30),
+                "status": MeetingStatus.scheduled,
+            }
+            for i in ids
+        ]
+        await session.execute(insert(Meeting), rows)
+        # Пользователь 1 — «тяжёлый»: участвует в каждой десятой встрече.
+        # Время встречи передаётся явно: иначе default колонки делает SELECT на каждую строку.
+        await session.execute(insert(meeting_participants), [
+            {"meeting_id": i, "user_id": uid, "starts_at": row["starts_at"], "ends_at": row["ends_at"]}
+            for i, row in zip(ids, rows)
+            for uid in ([1] if i % 10 == 0 else []) + rnd.sample(range(2, users + 1), PER_MEETING - (i % 10 == 0))
+        ])
+    await session.commit()
+
+
+async def _old_query(session: AsyncSession, user_id: int, limit: int) -> list[Meeting]:
+    stmt = (
+        select(Meeting)
+        .where(Meeting.participants.any(id=user_id), Meeting.status == MeetingStatus.scheduled)
+        .order_by(Meeting.starts_at.asc(), Meeting.id.asc())
+        .limit(limit)
+    )
+    return list((await session.scalars(stmt)).unique().all())
+
+
+async def _timed(label: str, runs: int, call) -> None:
+    started = time.perf_counter()
+    for _ in range(runs):
+        await call()
+    print(f"{label:<28}{(time.perf_counter() - started) / runs * 1000:8.2f} ms")
+
+
+async def main(participations: int, users: int, limit: int, runs: int) -> None:
+    path = os.path.join(tempfile.mkdtemp(), "bench.sqlite3")
+    engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    Session = async_sessionmaker(engine, expire_on_commit=False)
+
+    async with Session() as session:
+        started = time.perf_counter()
+        await _populate(session, participations, users)
+        print(f"populated {participations} participations in {time.perf_counter() - started:.1f}s")
+
+    async with Session() as session:
+        # 1 — участник каждой десятой встречи, 2 — обычный пользователь.
+        for user_id in (2, 1):
+            user = await session.get(User, user_id)
+            print(f"user {user_id}:")
+            await _timed("  EXISTS (before)", runs, lambda: _old_query(session, user.id, limit))
+            await _timed("  join (after)", runs, lambda: MeetingCRUD.get_user_meetings(session, user, limit=limit))
+
+        page = await MeetingCRUD.get_user_meetings(session, user, limit=limit)
+        for _ in range(20):
+            page = await MeetingCRUD.get_user_meetings(
+                session, user, limit=limit, after=(page[-1].starts_at, page[-1].id),
+            )
+        cursor = (page[-1].starts_at, page[-1].id)
+        await _timed("  join, page 21 (after)", runs, lambda: MeetingCRUD.get_user_meetings(
+            session, user, limit=limit, after=cursor,
+        ))
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--participations", type=int, default=1_000_000)
+    parser.add_argument("--users", type=int, default=10_000)
+    parser.add_argument("--limit", type=int, default=50)
+    parser.add_argument("--runs", type=int, default=20)
+    args = parser.parse_args()
+    asyncio.run(main(args.participations, args.users, args.limit, args.runs))
@@ -1,7 +1,11 @@
 from .models.base import Base
 from src.tasks.models import Task, TaskComment
-from src.teams.models import Team
+from src.teams.models import Team, TeamSnapshot
 from src.users.models import User
 from src.auth.backend import AccessToken
 from src.evaluations.models import Evaluation
-from src.meetings.models import Meeting
+from src.meetings.models import Meeting, MeetingSeries
+from src.sync.models import ChangeLog
+from src.outbox.models import OutboxMessage
+from src.jobs.models import Job
+from src.reminders.models import ReminderLog
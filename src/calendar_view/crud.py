@@ -0,0 +1,69 @@
+import asyncio
+from collections import defaultdict
+from datetime import date, datetime, time, timedelta
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.meetings.crud import MeetingCRUD
+from src.meetings.models import Meeting
+from src.tasks.models import Task
+from src.users.models import User
+
+
+class CalendarCRUD:
+    @staticmethod
+    async def get_team_tasks(
+        session: AsyncSession,
+        team_id: int | None,
+        starts_at: datetime,
+        ends_at: datetime,
+    ) -> list:
+        if team_id is None:
+            return []
+        stmt = (
+            select(Task.id, Task.name, Task.description, Task.deadline_at, Task.status, Task.assignee_id)
+            .where(
+                Task.team_id == team_id,
+                Task.deadline_at >= starts_at,
+                Task.deadline_at < ends_at,
+            )
+            .order_by(Task.deadline_at, Task.id)
+        )
+        return list((await session.execute(stmt)).all())
+
+    async def get_window(
+        self,
+        meetings_session: AsyncSession,
+        tasks_session: AsyncSession,
+        user: User,
+        date_from: date,
+        date_to: date,
+    ) -> dict[date, dict[str, list]]:
+        """Встречи пользователя и задачи команды за [date_from, date_to], по дням.
+
+        Запросы идут параллельно, поэтому каждому нужна своя сессия.
+        """
+        starts_at = datetime.combine(date_from, time.min)
+        ends_at = datetime.combine(date_to + timedelta(days=1), time.min)
+        meetings, tasks = await asyncio.gather(
+            MeetingCRUD.get_user_meetings(
+                meetings_session, user, starts_after=starts_at, ends_before=ends_at,
+            ),
+            self.get_team_tasks(tasks_session, user.team_id, starts_at, ends_at),
+        )
+
+        days: dict[date, dict[str, list]] = defaultdict(lambda: {"meetings": [], "tasks": []})
+        for meeting in meetings:
+            for day in _meeting_days(meeting, date_from, date_to):
+                days[day]["meetings"].append(meeting)
+        for task in tasks:
+            days[task.deadline_at.date()]["tasks"].append(task)
+        return dict(sorted(days.items()))
+
+
+def _meeting_days(meeting: Meeting, date_from: date, date_to: date) -> list[date]:
+    """Дни окна, которые задевает встреча (встреча до полуночи не переходит на следующий день)."""
+    first = max(meeting.starts_at.date(), date_from)
+    last = min((meeting.ends_at - timedelta(microseconds=1)).date(), date_to)
+    return [first + timedelta(days=i) for i in range((last - first).days + 1)]
@@ -0,0 +1,38 @@
+from datetime import date, timedelta
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.calendar_view.crud import CalendarCRUD
+from src.calendar_view.schemas import CalendarWindow
+from src.core.dependencies import CurrentUser, SessionDep
+from src.database import db_helper
+
+
+crud = CalendarCRUD()
+MAX_CALENDAR_RANGE = timedelta(days=62)
+calendar_router = APIRouter(prefix="/calendar", tags=["calendar"])
+
+
+@calendar_router.get("", response_model=CalendarWindow)
+async def get_calendar_window(
+    session: SessionDep,
+    current_user: CurrentUser,
+    date_from: date = Query(..., alias="from", description="Первый день окна, ГГГГ-ММ-ДД"),
+    date_to: date = Query(..., alias="to", description="Последний день окна включительно"),
+    # Отдельная сессия для параллельного запроса задач.
+    tasks_session: AsyncSession = Depends(db_helper.session_getter, use_cache=False),
+):
+    if date_to < date_from:
+        raise HTTPException(status_code=400, detail="to must not be before from")
+    if date_to - date_from > MAX_CALENDAR_RANGE:
+        raise HTTPException(status_code=400, detail="Range is too long")
+
+    days = await crud.get_window(
+        meetings_session=session,
+        tasks_session=tasks_session,
+        user=current_user,
+        date_from=date_from,
+        date_to=date_to,
+    )
+    return {"date_from": date_from, "date_to": date_to, "days": days}
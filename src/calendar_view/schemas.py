@@ -0,0 +1,29 @@
+from datetime import date, datetime
+from typing import Optional
+
+from pydantic import BaseModel, ConfigDict
+
+from src.meetings.schemas import MeetingOut
+from src.tasks.models import Status
+
+
+class CalendarTask(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    id: int
+    name: str
+    description: Optional[str] = None
+    deadline_at: datetime
+    status: Status
+    assignee_id: Optional[int] = None
+
+
+class CalendarDay(BaseModel):
+    meetings: list[MeetingOut] = []
+    tasks: list[CalendarTask] = []
+
+
+class CalendarWindow(BaseModel):
+    date_from: date
+    date_to: date
+    days: dict[date, CalendarDay]
@@ -77,6 +77,174 @@ def create_superuser(
     )
 
 
+@app.command("extend-meeting-series")
+def extend_meeting_series():
+    """Продлить горизонт материализации повторяющихся встреч (запускать по cron раз в сутки)."""
+    from src.database import db_helper
+    from src.meetings.crud import MeetingSeriesCRUD
+
+    async def _run() -> int:
+        async with db_helper.session_factory() as session:
+            return await MeetingSeriesCRUD().extend_horizon(session)
+
+    try:
+        created = asyncio.run(_run())
+    except Exception as e:
+        typer.secho("Ошибка при продлении серий:", fg=typer.colors.RED)
+        typer.echo("".join(traceback.format_exception(e)))
+        raise typer.Exit(1)
+    typer.secho(f"Создано встреч: {created}", fg=typer.colors.GREEN)
+
+
+@app.command("compact-change-log")
+def compact_change_log():
+    """Сжать журнал изменений для /sync до последней записи на сущность (запускать по cron)."""
+    from src.database import db_helper
+    from src.sync.crud import SyncCRUD
+
+    async def _run() -> int:
+        async with db_helper.session_factory() as session:
+            return await SyncCRUD().compact(session)
+
+    try:
+        removed = asyncio.run(_run())
+    except Exception as e:
+        typer.secho("Ошибка при сжатии журнала:", fg=typer.colors.RED)
+        typer.echo("".join(traceback.format_exception(e)))
+        raise typer.Exit(1)
+    typer.secho(f"Удалено записей: {removed}", fg=typer.colors.GREEN)
+
+
+@app.command("rebuild-team-snapshots")
+def rebuild_team_snapshots(
+    team_id: int | None = typer.Option(None, "--team-id", "-t", help="Только эта команда"),
+):
+    """Пересобрать снимки команд целиком и сдвинуть окно предстоящих встреч (запускать по cron раз в сутки)."""
+    from sqlalchemy import select
+    from src.database import db_helper
+    from src.teams.models import Team
+    from src.teams.snapshot import rebuild_snapshot
+
+    async def _run() -> int:
+        async with db_helper.session_factory() as session:
+            ids = [team_id] if team_id is not None else (await session.scalars(select(Team.id))).all()
+            for tid in ids:
+                await rebuild_snapshot(session, tid)
+                await session.commit()
+            return len(ids)
+
+    try:
+        rebuilt = asyncio.run(_run())
+    except Exception as e:
+        typer.secho("Ошибка при пересборке снимков:", fg=typer.colors.RED)
+        typer.echo("".join(traceback.format_exception(e)))
+        raise typer.Exit(1)
+    typer.secho(f"Пересобрано снимков: {rebuilt}", fg=typer.colors.GREEN)
+
+
+@app.command("check-team-snapshots")
+def check_team_snapshots(
+    fix: bool = typer.Option(False, "--fix", help="Пересобрать разошедшиеся снимки"),
+):
+    """Сверить снимки команд с данными; код выхода 1, если есть расхождения и не указан --fix."""
+    from sqlalchemy import select
+    from src.database import db_helper
+    from src.teams.models import Team
+    from src.teams.snapshot import check_snapshot, rebuild_snapshot
+
+    async def _run() -> dict[int, list[str]]:
+        problems = {}
+        async with db_helper.session_factory() as session:
+            for tid in (await session.scalars(select(Team.id))).all():
+                sections = await check_snapshot(session, tid)
+                if sections:
+                    problems[tid] = sections
+                    if fix:
+                        await rebuild_snapshot(session, tid)
+                        await session.commit()
+        return problems
+
+    try:
+        problems = asyncio.run(_run())
+    except Exception as e:
+        typer.secho("Ошибка при проверке снимков:", fg=typer.colors.RED)
+        typer.echo("".join(traceback.format_exception(e)))
+        raise typer.Exit(1)
+    for tid, sections in problems.items():
+        typer.echo(f"team {tid}: {', '.join(sections)}")
+    if problems and not fix:
+        raise typer.Exit(1)
+    typer.secho(f"Расхождений: {len(problems)}" + (" (исправлено)" if problems else ""), fg=typer.colors.GREEN)
+
+
+@app.command("init-db")
+def init_db():
+    """Создать схему: на Postgres — alembic upgrade head, на SQLite — create_all и alembic stamp head.
+
+    Старые миграции написаны под Postgres (ENUM, gist, ALTER COLUMN), поэтому
+    новую SQLite-базу создаём по моделям и помечаем актуальной ревизией.
+    """
+    from pathlib import Path
+    from alembic import command
+    from alembic.config import Config
+    from src.database import db_helper
+    from src.models.base import Base
+    import src  # noqa: F401 — регистрирует все модели в Base.metadata
+
+    alembic_cfg = Config(str(Path(__file__).resolve().parents[1] / "alembic.ini"))
+    try:
+        if db_helper.engine.dialect.name != "sqlite":
+            command.upgrade(alembic_cfg, "head")
+        else:
+            async def _create() -> None:
+                async with db_helper.engine.begin() as conn:
+                    await conn.run_sync(Base.metadata.create_all)
+                await db_helper.dispose()
+
+            asyncio.run(_create())
+            command.stamp(alembic_cfg, "head")
+    except Exception as e:
+        typer.secho("Ошибка при создании схемы:", fg=typer.colors.RED)
+        typer.echo("".join(traceback.format_exception(e)))
+        raise typer.Exit(1)
+    typer.secho(f"Схема готова ({db_helper.engine.dialect.name})", fg=typer.colors.GREEN)
+
+
+@app.command("worker")
+def worker(
+    concurrency: int | None = typer.Option(None, "--concurrency", "-c", help="Сколько заданий выполнять одновременно"),
+):
+    """Разбирать очередь фоновых заданий (удаление и выгрузка команд) до Ctrl+C."""
+    from src.config import settings
+    from src.core.invalidation import InvalidationBus
+    from src.database import db_helper
+    from src.jobs.worker import JobWorker
+
+    config = settings.jobs
+    if concurrency is not None:
+        config = config.model_copy(update={"concurrency": concurrency})
+
+    async def _run() -> None:
+        # задания меняют данные — кэши воркеров приложения должны об этом узнать
+        bus = InvalidationBus.from_config(settings.invalidation, db_helper.engine)
+        if bus is not None:
+            await bus.start()
+        jobs = JobWorker(db_helper.session_factory, config)
+        jobs.start()
+        try:
+            await asyncio.Event().wait()
+        finally:
+            await jobs.stop()
+            if bus is not None:
+                await bus.stop()
+
+    typer.secho(f"Воркер заданий запущен (concurrency={config.concurrency})", fg=typer.colors.GREEN)
+    try:
+        asyncio.run(_run())
+    except KeyboardInterrupt:
+        typer.echo("Остановлено")
+
+
 def main():
     app()
 
@@ -1,4 +1,6 @@
-from pydantic import BaseModel, PostgresDsn
+from typing import Annotated, Literal
+
+from pydantic import AnyUrl, BaseModel, PostgresDsn, UrlConstraints
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
@@ -7,8 +9,23 @@ class RunConfig(BaseModel):
     port: int = 8000
 
 
+SqliteDsn = Annotated[AnyUrl, UrlConstraints(allowed_schemes=["sqlite+aiosqlite"], host_required=False)]
+
+
+class SqliteConfig(BaseModel):
+    # Используется только при url вида sqlite+aiosqlite:///path/to/app.db.
+    journal_mode: Literal["wal", "delete"] = "wal"
+    synchronous: Literal["off", "normal", "full"] = "normal"
+    mmap_size: int = 256 * 2**20
+    cache_size_kib: int = 64 * 1024
+    busy_timeout_ms: int = 5000
+    # Записи процесса идут по одной через очередь, чтения — параллельно.
+    serialize_writes: bool = True
+
+
 class DatabaseConfig(BaseModel):
-    url: PostgresDsn
+    url: PostgresDsn | SqliteDsn
+    sqlite: SqliteConfig = SqliteConfig()
     naming_conventions: dict[str, str] = {
         "ix": "ix_%(column_0_label)s",
         "uq": "uq_%(table_name)s_%(column_0_N_name)s",
@@ -18,6 +35,54 @@ class DatabaseConfig(BaseModel):
     }
 
 
+class RemindersConfig(BaseModel):
+    enabled: bool = True
+    sink: Literal["log", "smtp", "webhook"] = "log"
+    lookahead_minutes: int = 60
+    refresh_seconds: int = 60
+    meeting_lead_minutes: int = 15
+    task_lead_minutes: int = 24 * 60
+    smtp_host: str = "127.0.0.1"
+    smtp_port: int = 1025
+    smtp_from: str = "reminders@localhost"
+    webhook_url: str | None = None
+
+
+class OutboxConfig(BaseModel):
+    # Пустой список — outbox не пишется и диспетчер не запускается.
+    webhooks: list[str] = []
+    batch_size: int = 500
+    events_per_request: int = 50
+    concurrency_per_endpoint: int = 4
+    max_attempts: int = 10
+    backoff_base_seconds: float = 1.0
+    backoff_max_seconds: float = 600.0
+    lease_seconds: int = 60
+    poll_seconds: float = 5.0
+    request_timeout_seconds: float = 10.0
+
+
+class JobsConfig(BaseModel):
+    # Воркеры внутри процесса приложения; при False задания разбирает `cli.py worker`.
+    enabled: bool = True
+    concurrency: int = 2
+    poll_seconds: float = 2.0
+    lease_seconds: int = 300
+    max_attempts: int = 3
+    chunk_size: int = 500
+
+
+class InvalidationConfig(BaseModel):
+    # Шина инвалидаций кэшей и событий /events/stream между воркерами.
+    # auto — LISTEN/NOTIFY на Postgres, unix-сокеты в socket_dir на SQLite; off — только свой процесс.
+    transport: Literal["auto", "postgres", "unix", "off"] = "auto"
+    channel: str = "cache_invalidation"
+    socket_dir: str = "/tmp/my_busines-invalidation"
+    batch_seconds: float = 0.05
+    # Больше ключей одного кэша в пачке — проще очистить его целиком.
+    max_keys_per_cache: int = 1000
+
+
 class Settings(BaseSettings):
     model_config = SettingsConfigDict(
         env_file=".env",
@@ -28,6 +93,10 @@ class Settings(BaseSettings):
     )
     run: RunConfig = RunConfig()
     db: DatabaseConfig
+    reminders: RemindersConfig = RemindersConfig()
+    outbox: OutboxConfig = OutboxConfig()
+    jobs: JobsConfig = JobsConfig()
+    invalidation: InvalidationConfig = InvalidationConfig()
     secret: str
 
 
@@ -0,0 +1,226 @@
+import functools
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Hashable, Iterable
+
+from fastapi import Response
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.core.hooks import on_commit
+from src.core.singleflight import SingleFlight, json_renderer, request_key, user_scope
+
+
+caches: dict[str, "TTLCache | ResponseCache"] = {}
+
+# Получатели локальных инвалидаций (имя кэша, ключ) — шина рассылает их другим воркерам.
+invalidation_listeners: list[Callable[[str, tuple], None]] = []
+
+
+def _published(name: str, key: tuple) -> None:
+    for listener in invalidation_listeners:
+        listener(name, key)
+
+
+class TTLCache:
+    """In-process кэш с ограничением по размеру (LRU) и временем жизни записей.
+
+    Ключи — кортежи; первый элемент обычно идентификатор владельца
+    (команды, пользователя), что позволяет сбрасывать все его записи разом.
+    """
+
+    def __init__(self, name: str, ttl: float, maxsize: int = 1024):
+        self.name = name
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self._data: OrderedDict[tuple, tuple[float, Any]] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        caches[name] = self
+
+    def get(self, key: tuple, default: Any = None) -> Any:
+        item = self._data.get(key)
+        if item is None:
+            self.misses += 1
+            return default
+        expires_at, value = item
+        if expires_at < time.monotonic():
+            del self._data[key]
+            self.misses += 1
+            return default
+        self._data.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def set(self, key: tuple, value: Any) -> None:
+        self._data[key] = (time.monotonic() + self.ttl, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def invalidate(self, *prefix: Hashable) -> None:
+        self.invalidate_local(*prefix)
+        _published(self.name, prefix)
+
+    def invalidate_local(self, *prefix: Hashable) -> None:
+        size = len(prefix)
+        for key in [k for k in self._data if k[:size] == prefix]:
+            del self._data[key]
+
+    def clear(self) -> None:
+        self._data.clear()
+
+    def stats(self) -> dict[str, Any]:
+        return _stats(self.hits, self.misses, entries=len(self._data))
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+def _stats(hits: int, misses: int, **extra: Any) -> dict[str, Any]:
+    total = hits + misses
+    return {"hits": hits, "misses": misses, "hit_ratio": round(hits / total, 4) if total else None, **extra}
+
+
+def team_tag(team_id: int | None) -> str:
+    return f"team:{team_id}"
+
+
+def user_tag(user_id: int | None) -> str:
+    return f"user:{user_id}"
+
+
+TEAMS_TAG = "teams"
+
+
+class ResponseCache:
+    """LRU готовых тел ответов (bytes) с TTL, ограниченный суммарным размером.
+
+    Каждая запись помечена тегами вида team:{id} / user:{id}; invalidate(*tags)
+    удаляет все записи с любым из тегов. Ответ, посчитанный во время
+    инвалидации, не сохраняется (см. epoch), иначе в кэш мог бы попасть
+    результат, прочитанный до commit.
+    """
+
+    def __init__(self, name: str, ttl: float, max_bytes: int):
+        self.name = name
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.epoch = 0
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._data: OrderedDict[Hashable, tuple[float, bytes, tuple[str, ...]]] = OrderedDict()
+        self._by_tag: dict[str, set[Hashable]] = {}
+        caches[name] = self
+
+    def get(self, key: Hashable) -> bytes | None:
+        item = self._data.get(key)
+        if item is None or item[0] < time.monotonic():
+            if item is not None:
+                self._remove(key)
+            self.misses += 1
+            return None
+        self._data.move_to_end(key)
+        self.hits += 1
+        return item[1]
+
+    def set(self, key: Hashable, body: bytes, tags: Iterable[str], epoch: int | None = None) -> None:
+        if (epoch is not None and epoch != self.epoch) or len(body) > self.max_bytes:
+            return
+        if key in self._data:
+            self._remove(key)
+        tags = tuple(tags)
+        self._data[key] = (time.monotonic() + self.ttl, body, tags)
+        self.size += len(body)
+        for tag in tags:
+            self._by_tag.setdefault(tag, set()).add(key)
+        while self.size > self.max_bytes:
+            self._remove(next(iter(self._data)))
+            self.evictions += 1
+
+    def _remove(self, key: Hashable) -> None:
+        _, body, tags = self._data.pop(key)
+        self.size -= len(body)
+        for tag in tags:
+            keys = self._by_tag.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._by_tag[tag]
+
+    def invalidate(self, *tags: str) -> None:
+        self.invalidate_local(*tags)
+        _published(self.name, tags)
+
+    def invalidate_local(self, *tags: str) -> None:
+        self.epoch += 1
+        for tag in tags:
+            for key in self._by_tag.pop(tag, ()):
+                if key in self._data:
+                    self._remove(key)
+
+    def clear(self) -> None:
+        self.epoch += 1
+        self._data.clear()
+        self._by_tag.clear()
+        self.size = 0
+
+    def stats(self) -> dict[str, Any]:
+        return _stats(
+            self.hits, self.misses,
+            entries=len(self._data), bytes=self.size, max_bytes=self.max_bytes, evictions=self.evictions,
+        )
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+response_cache = ResponseCache("responses", ttl=60, max_bytes=64 * 1024 * 1024)
+
+
+def invalidate_tags(*tags: str) -> None:
+    response_cache.invalidate(*tags)
+
+
+def invalidate_after_commit(session: AsyncSession, *tags: str) -> None:
+    """Сбросить теги, когда текущая транзакция закоммитится."""
+    on_commit(session, lambda: invalidate_tags(*tags))
+
+
+def cached(
+    name: str,
+    response_model: Any,
+    tags: Callable[[dict[str, Any], Any], Iterable[str]],
+    scope: Callable[[dict[str, Any]], Hashable] = user_scope,
+    cache: ResponseCache | None = None,
+):
+    """Кэширует тело ответа GET-маршрута; одновременные промахи считаются один раз.
+
+    tags(kwargs, result) — теги записи. Ключ — request_key:
+    параметры маршрута плюс scope (по умолчанию id пользователя), зависимости
+    с проверками доступа выполняются на каждый запрос.
+    """
+    cache = cache or response_cache
+    flight = SingleFlight(name)
+    render = json_renderer(response_model)
+
+    def decorator(endpoint: Callable[..., Awaitable[Any]]):
+        async def compute(kwargs: dict[str, Any], key: Hashable) -> bytes:
+            epoch = cache.epoch
+            result = await endpoint(**kwargs)
+            body = render(result)
+            cache.set(key, body, tags(kwargs, result), epoch=epoch)
+            return body
+
+        @functools.wraps(endpoint)
+        async def wrapper(**kwargs: Any) -> Response:
+            key = (name, request_key(kwargs, scope))
+            body = cache.get(key)
+            if body is None:
+                body = await flight.do(key, lambda: compute(kwargs, key))
+            return Response(content=body, media_type="application/json")
+
+        return wrapper
+
+    return decorator
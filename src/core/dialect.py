@@ -0,0 +1,31 @@
+from sqlalchemy import Table, text
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+
+
+def dialect_name(session: AsyncSession) -> str:
+    return session.bind.dialect.name
+
+
+def is_postgres(session: AsyncSession) -> bool:
+    return dialect_name(session) == "postgresql"
+
+
+def insert_ignore(session: AsyncSession, table: Table):
+    """INSERT ... ON CONFLICT DO NOTHING для текущей СУБД."""
+    dialect = postgresql if is_postgres(session) else sqlite
+    return dialect.insert(table).on_conflict_do_nothing()
+
+
+async def lock_for_update(session: AsyncSession) -> None:
+    """Замена SELECT ... FOR UPDATE на SQLite.
+
+    Драйвер sqlite3 открывает транзакцию только перед первым INSERT/UPDATE,
+    поэтому чтение перед ним не защищено от соседнего процесса. BEGIN IMMEDIATE
+    сразу берёт блокировку записи, и «прочитать и пометить» становится атомарным.
+    """
+    if dialect_name(session) != "sqlite":
+        return
+    raw = await (await session.connection()).get_raw_connection()
+    if not raw.driver_connection.in_transaction:
+        await session.execute(text("BEGIN IMMEDIATE"))
@@ -0,0 +1,33 @@
+from typing import Any, Callable
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+
+_TX_KEY = "transaction"
+
+
+def transaction_info(session: AsyncSession | Session) -> dict[str, Any]:
+    """Состояние текущей транзакции сессии; сбрасывается при commit и rollback."""
+    return session.info.setdefault(_TX_KEY, {})
+
+
+def on_commit(session: AsyncSession | Session, callback: Callable[[], Any]) -> None:
+    """Выполнить callback после успешного commit; при rollback он отбрасывается.
+
+    Callback синхронный и не должен обращаться к сессии.
+    """
+    transaction_info(session).setdefault("on_commit", []).append(callback)
+
+
+@event.listens_for(Session, "after_commit")
+def _run_on_commit(session: Session) -> None:
+    state = session.info.pop(_TX_KEY, None) or {}
+    for callback in state.get("on_commit", ()):
+        callback()
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_on_rollback(session: Session) -> None:
+    session.info.pop(_TX_KEY, None)
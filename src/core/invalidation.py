@@ -0,0 +1,301 @@
+import asyncio
+import json
+import logging
+import os
+import socket
+import uuid
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Callable, Protocol
+
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine
+
+from src.config import InvalidationConfig
+from src.core.cache import caches, invalidation_listeners
+from src.events.hub import hub
+from src.sync.crud import change_listeners
+
+
+log = logging.getLogger(__name__)
+
+# NOTIFY ограничивает payload 8000 байтами; сообщение режется на части поменьше.
+MAX_PAYLOAD = 7500
+
+
+@dataclass
+class InvalidationMetrics:
+    published: int = 0
+    messages_sent: int = 0
+    messages_received: int = 0
+    batches_applied: int = 0
+    keys_applied: int = 0
+    caches_cleared: int = 0
+    events_forwarded: int = 0
+    events_received: int = 0
+
+    def as_dict(self) -> dict[str, int]:
+        return asdict(self)
+
+
+metrics = InvalidationMetrics()
+
+
+class Transport(Protocol):
+    async def start(self, on_message: Callable[[str], None]) -> None: ...
+    async def send(self, payload: str) -> None: ...
+    async def stop(self) -> None: ...
+
+
+class PostgresTransport:
+    """LISTEN/NOTIFY на отдельном соединении в режиме AUTOCOMMIT.
+
+    NOTIFY приходит и самому отправителю — такие сообщения шина отбрасывает
+    по идентификатору отправителя.
+    """
+
+    def __init__(self, engine: AsyncEngine, channel: str):
+        self.engine = engine
+        self.channel = channel
+        self._conn: AsyncConnection | None = None
+        self._driver = None
+        self._listener = None
+        self._lock = asyncio.Lock()
+
+    async def start(self, on_message: Callable[[str], None]) -> None:
+        conn = await self.engine.connect()
+        self._conn = await conn.execution_options(isolation_level="AUTOCOMMIT")
+        self._driver = (await self._conn.get_raw_connection()).driver_connection
+        self._listener = lambda _conn, _pid, _channel, payload: on_message(payload)
+        await self._driver.add_listener(self.channel, self._listener)
+
+    async def send(self, payload: str) -> None:
+        # asyncpg не допускает параллельных запросов на одном соединении
+        async with self._lock:
+            await self._driver.execute("SELECT pg_notify($1, $2)", self.channel, payload)
+
+    async def stop(self) -> None:
+        conn, self._conn = self._conn, None
+        if conn is None:
+            return
+        try:
+            await self._driver.remove_listener(self.channel, self._listener)
+        except Exception:
+            pass
+        await conn.close()
+
+
+class _DatagramProtocol(asyncio.DatagramProtocol):
+    def __init__(self, on_message: Callable[[str], None]):
+        self.on_message = on_message
+
+    def datagram_received(self, data: bytes, addr: Any) -> None:
+        self.on_message(data.decode())
+
+
+class UnixSocketTransport:
+    """Для одного хоста без Postgres: у каждого воркера свой датаграммный сокет в общем каталоге.
+
+    Отправка — по всем чужим сокетам каталога; сокеты завершившихся
+    процессов (ConnectionRefused) удаляются.
+    """
+
+    def __init__(self, directory: str):
+        self.directory = Path(directory)
+        self.path = self.directory / f"{os.getpid()}-{uuid.uuid4().hex[:8]}.sock"
+        self._transport: asyncio.DatagramTransport | None = None
+        self._sock: socket.socket | None = None
+
+    async def start(self, on_message: Callable[[str], None]) -> None:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._transport, _ = await asyncio.get_running_loop().create_datagram_endpoint(
+            lambda: _DatagramProtocol(on_message), local_addr=str(self.path), family=socket.AF_UNIX,
+        )
+        self._sock = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+        self._sock.setblocking(False)
+
+    async def send(self, payload: str) -> None:
+        data = payload.encode()
+        for peer in self.directory.glob("*.sock"):
+            if peer == self.path:
+                continue
+            try:
+                self._sock.sendto(data, str(peer))
+            except (ConnectionRefusedError, FileNotFoundError):
+                peer.unlink(missing_ok=True)
+            except BlockingIOError:
+                log.warning("invalidation socket %s is full, message dropped", peer.name)
+
+    async def stop(self) -> None:
+        if self._transport is not None:
+            self._transport.close()
+            self._transport = None
+        if self._sock is not None:
+            self._sock.close()
+            self._sock = None
+        self.path.unlink(missing_ok=True)
+
+
+def _fit_change(change: tuple[int, dict[str, Any]]) -> tuple[int, dict[str, Any]]:
+    """Событие, не влезающее в NOTIFY, уходит без payload: клиент заберёт его через /sync."""
+    team_id, event = change
+    if len(json.dumps(event, separators=(",", ":")).encode()) > MAX_PAYLOAD - 100:
+        event = {**event, "data": None, "truncated": True}
+    return team_id, event
+
+
+class InvalidationBus:
+    """Рассылает локальные инвалидации кэшей другим воркерам и применяет чужие.
+
+    Исходящие ключи копятся до конца текущей итерации цикла событий и уходят
+    одним сообщением; входящие применяются пачками раз в batch_seconds, с
+    дедупликацией, а при слишком большом числе ключей кэш очищается целиком.
+
+    Тем же сообщением уходят события изменений команд: EventHub живёт в
+    процессе, и без пересылки подписчики /events/stream другого воркера их
+    бы не увидели. Чужие события сразу и по порядку отдаются локальному hub.
+    """
+
+    def __init__(self, transport: Transport, batch_seconds: float = 0.05, max_keys_per_cache: int = 1000):
+        self.transport = transport
+        self.batch_seconds = batch_seconds
+        self.max_keys_per_cache = max_keys_per_cache
+        self.sender = uuid.uuid4().hex
+        self._outgoing: list[tuple[str, list]] = []
+        self._outgoing_changes: list[tuple[int, dict[str, Any]]] = []
+        self._incoming: asyncio.Queue[tuple[str, tuple]] = asyncio.Queue()
+        self._flush_task: asyncio.Task | None = None
+        self._apply_task: asyncio.Task | None = None
+
+    @classmethod
+    def from_config(cls, config: InvalidationConfig, engine: AsyncEngine) -> "InvalidationBus | None":
+        kind = config.transport
+        if kind == "auto":
+            kind = "postgres" if engine.dialect.name == "postgresql" else "unix"
+        if kind == "off":
+            return None
+        transport = PostgresTransport(engine, config.channel) if kind == "postgres" else UnixSocketTransport(config.socket_dir)
+        return cls(transport, config.batch_seconds, config.max_keys_per_cache)
+
+    def publish(self, name: str, key: tuple) -> None:
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        self._outgoing.append((name, list(key)))
+        metrics.published += 1
+        self._schedule_flush(loop)
+
+    def publish_changes(self, team_id: int, events: list[dict[str, Any]]) -> None:
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        self._outgoing_changes.extend((team_id, event) for event in events)
+        metrics.events_forwarded += len(events)
+        self._schedule_flush(loop)
+
+    def _schedule_flush(self, loop: asyncio.AbstractEventLoop) -> None:
+        if self._flush_task is None or self._flush_task.done():
+            self._flush_task = loop.create_task(self._flush())
+
+    def _encode(self, items: list[tuple[str, list]], changes: list[tuple[int, dict[str, Any]]] = ()) -> list[str]:
+        entries = [("i", item) for item in items] + [("e", _fit_change(change)) for change in changes]
+        payloads, chunk, size = [], {"i": []}, 0
+        for kind, entry in entries:
+            entry_size = len(json.dumps(entry, separators=(",", ":")).encode())
+            if size and size + entry_size > MAX_PAYLOAD:
+                payloads.append(chunk)
+                chunk, size = {"i": []}, 0
+            chunk.setdefault(kind, []).append(entry)
+            size += entry_size + 1
+        if size:
+            payloads.append(chunk)
+        return [json.dumps({"s": self.sender, **chunk}, separators=(",", ":")) for chunk in payloads]
+
+    async def _flush(self) -> None:
+        # publish не запускает новую отправку, пока эта задача жива, поэтому
+        # ключи, пришедшие во время send, уходят следующим кругом здесь же
+        while self._outgoing or self._outgoing_changes:
+            # уступаем циклу, чтобы собрать все инвалидации текущего запроса в одно сообщение
+            await asyncio.sleep(0)
+            items, self._outgoing = self._outgoing, []
+            changes, self._outgoing_changes = self._outgoing_changes, []
+            try:
+                for payload in self._encode(items, changes):
+                    await self.transport.send(payload)
+                    metrics.messages_sent += 1
+            except Exception:
+                log.exception("failed to publish %d cache invalidations and %d events", len(items), len(changes))
+
+    def _on_message(self, payload: str) -> None:
+        try:
+            message = json.loads(payload)
+        except ValueError:
+            log.warning("malformed invalidation message dropped")
+            return
+        if message.get("s") == self.sender:
+            return
+        metrics.messages_received += 1
+        for name, key in message.get("i", ()):
+            self._incoming.put_nowait((name, tuple(key)))
+        self._deliver(message.get("e", ()))
+
+    def _deliver(self, changes: list[list]) -> None:
+        # подряд идущие события одной команды — одной публикацией, порядок сохраняется
+        team_id, events = None, []
+        for change_team_id, event in changes:
+            if events and change_team_id != team_id:
+                hub.publish(team_id, events)
+                events = []
+            team_id = change_team_id
+            events.append(event)
+        if events:
+            hub.publish(team_id, events)
+        metrics.events_received += len(changes)
+
+    def apply(self, batch: list[tuple[str, tuple]]) -> None:
+        by_cache: dict[str, set[tuple]] = {}
+        for name, key in batch:
+            by_cache.setdefault(name, set()).add(key)
+        for name, keys in by_cache.items():
+            cache = caches.get(name)
+            if cache is None:
+                continue
+            if len(keys) > self.max_keys_per_cache:
+                cache.clear()
+                metrics.caches_cleared += 1
+                continue
+            for key in keys:
+                cache.invalidate_local(*key)
+            metrics.keys_applied += len(keys)
+        metrics.batches_applied += 1
+
+    async def _apply_loop(self) -> None:
+        while True:
+            batch = [await self._incoming.get()]
+            await asyncio.sleep(self.batch_seconds)
+            while not self._incoming.empty():
+                batch.append(self._incoming.get_nowait())
+            try:
+                self.apply(batch)
+            except Exception:
+                log.exception("failed to apply cache invalidations")
+
+    async def start(self) -> None:
+        await self.transport.start(self._on_message)
+        self._apply_task = asyncio.get_running_loop().create_task(self._apply_loop())
+        invalidation_listeners.append(self.publish)
+        change_listeners.append(self.publish_changes)
+
+    async def stop(self) -> None:
+        if self.publish in invalidation_listeners:
+            invalidation_listeners.remove(self.publish)
+        if self.publish_changes in change_listeners:
+            change_listeners.remove(self.publish_changes)
+        if self._flush_task is not None:
+            await asyncio.gather(self._flush_task, return_exceptions=True)
+        if self._apply_task is not None:
+            self._apply_task.cancel()
+            await asyncio.gather(self._apply_task, return_exceptions=True)
+            self._apply_task = None
+        await self.transport.stop()
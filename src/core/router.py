@@ -0,0 +1,37 @@
+from fastapi import APIRouter
+
+from src.core.cache import caches
+from src.core.dependencies import CurrentSuperUser
+from src.core.invalidation import metrics as invalidation_metrics
+from src.core.singleflight import flights
+from src.database import db_helper
+
+
+metrics_router = APIRouter(prefix="/metrics", tags=["metrics"])
+
+
+@metrics_router.get("/coalescing")
+async def get_coalescing_metrics(_: CurrentSuperUser):
+    """Сколько запросов посчитано и сколько получили уже идущий результат (saved)."""
+    return {name: flight.stats() for name, flight in flights.items()}
+
+
+@metrics_router.get("/cache")
+async def get_cache_metrics(_: CurrentSuperUser):
+    """Попадания, промахи, hit ratio и занятая память (bytes — для кэша ответов) по каждому кэшу."""
+    return {name: cache.stats() for name, cache in caches.items()}
+
+
+@metrics_router.get("/invalidation")
+async def get_invalidation_metrics(_: CurrentSuperUser):
+    """Счётчики шины инвалидации между воркерами этого процесса."""
+    return invalidation_metrics.as_dict()
+
+
+@metrics_router.get("/database")
+async def get_database_metrics(_: CurrentSuperUser):
+    """СУБД и, для SQLite, очередь писателей: сколько записей ждали и сколько."""
+    return {
+        "dialect": db_helper.engine.dialect.name,
+        "write_queue": db_helper.write_queue.stats() if db_helper.write_queue is not None else None,
+    }
@@ -0,0 +1,104 @@
+import asyncio
+from datetime import date
+from enum import Enum
+from typing import Any, Awaitable, Callable, Hashable, TypeVar
+
+from pydantic import TypeAdapter
+
+from src.users.models import User
+
+
+T = TypeVar("T")
+
+flights: dict[str, "SingleFlight"] = {}
+
+_KEY_TYPES = (int, float, str, bool, date, Enum)
+
+
+class SingleFlight:
+    """Склеивает одновременные одинаковые вычисления в одно.
+
+    Пока по ключу идёт вычисление, остальные вызовы с тем же ключом ждут его
+    результат (или исключение) вместо повторного запуска. Ничего не хранится
+    после завершения — это не кэш.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self.executions = 0
+        self.shared = 0
+        self._inflight: dict[Hashable, asyncio.Future] = {}
+        flights[name] = self
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[T]]) -> T:
+        future = self._inflight.get(key)
+        if future is not None:
+            self.shared += 1
+            try:
+                return await asyncio.shield(future)
+            except asyncio.CancelledError:
+                if asyncio.current_task().cancelling() or not future.cancelled():
+                    raise
+                # ведущий запрос отменён (клиент ушёл) — считаем сами
+                self.shared -= 1
+                return await self.do(key, fn)
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        self.executions += 1
+        try:
+            result = await fn()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as e:
+            future.set_exception(e)
+            # помечаем исключение полученным, даже если ждущих не было
+            future.exception()
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            del self._inflight[key]
+
+    def stats(self) -> dict[str, int]:
+        return {"executions": self.executions, "saved": self.shared, "in_flight": len(self._inflight)}
+
+
+def user_scope(kwargs: dict[str, Any]) -> Hashable:
+    """Ответ зависит от пользователя; без пользователя — только от параметров."""
+    users = [value.id for value in kwargs.values() if isinstance(value, User)]
+    return tuple(users)
+
+
+def team_scope(kwargs: dict[str, Any]) -> Hashable:
+    """Ответ одинаков для всех пользователей одной команды, прошедших проверку доступа."""
+    return tuple(value.team_id for value in kwargs.values() if isinstance(value, User))
+
+
+def _key_part(value: Any) -> Hashable | None:
+    if isinstance(value, _KEY_TYPES):
+        return value
+    if isinstance(value, (list, tuple)) and all(isinstance(item, _KEY_TYPES) for item in value):
+        return tuple(value)
+    return None
+
+
+def request_key(kwargs: dict[str, Any], scope: Callable[[dict[str, Any]], Hashable]) -> Hashable:
+    """Значения path/query-параметров маршрута плюс scope; зависимости (сессия, токен) не входят."""
+    params = tuple(sorted(
+        (param, part) for param, value in kwargs.items()
+        if (part := _key_part(value)) is not None
+    ))
+    return params, scope(kwargs)
+
+
+def json_renderer(response_model: Any) -> Callable[[Any], bytes]:
+    """Сериализация результата маршрута так же, как это сделал бы response_model FastAPI."""
+    adapter = TypeAdapter(response_model)
+
+    def render(result: Any) -> bytes:
+        return adapter.dump_json(adapter.validate_python(result, from_attributes=True), by_alias=True)
+
+    return render
@@ -0,0 +1,123 @@
+import asyncio
+import time
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.util import await_only
+
+from src.config import SqliteConfig
+
+
+# Первое слово запроса, с которого соединение начинает писать (BEGIN — это BEGIN IMMEDIATE из lock_for_update).
+WRITE_VERBS = frozenset({"INSERT", "UPDATE", "DELETE", "REPLACE", "BEGIN", "CREATE", "DROP", "ALTER"})
+# Флаг в info соединения пула: соединение стоит первым в очереди писателей.
+HOLDS_WRITE = "sqlite_write_queue"
+
+
+def is_sqlite_url(url: str) -> bool:
+    return url.startswith("sqlite")
+
+
+class WriteQueue:
+    """Очередь писателей SQLite внутри процесса.
+
+    SQLite пускает одного писателя; без очереди транзакции ждут друг друга
+    в потоках aiosqlite через busy_timeout и при всплеске получают
+    «database is locked». Здесь писатели ждут по очереди (FIFO) в event loop,
+    чтения идут мимо очереди и с WAL не блокируются записью.
+    """
+
+    def __init__(self):
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._lock: asyncio.Lock | None = None
+        self._owner: asyncio.Task | None = None
+        self._depth = 0
+        self.acquired = 0
+        self.waited = 0
+        self.wait_seconds = 0.0
+        self.max_wait_seconds = 0.0
+
+    def _get_lock(self) -> asyncio.Lock:
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._loop, self._lock, self._owner, self._depth = loop, asyncio.Lock(), None, 0
+        return self._lock
+
+    async def acquire(self) -> None:
+        lock = self._get_lock()
+        task = asyncio.current_task()
+        # Вторая сессия той же задачи иначе ждала бы сама себя; SQLite ответит ей по busy_timeout.
+        if task is not None and self._owner is task:
+            self._depth += 1
+            return
+        started = time.perf_counter()
+        if lock.locked():
+            self.waited += 1
+        await lock.acquire()
+        waited = time.perf_counter() - started
+        self.acquired += 1
+        self.wait_seconds += waited
+        self.max_wait_seconds = max(self.max_wait_seconds, waited)
+        self._owner, self._depth = task, 1
+
+    def release(self) -> None:
+        self._depth -= 1
+        if self._depth == 0:
+            self._owner = None
+            self._lock.release()
+
+    def stats(self) -> dict:
+        return {
+            "acquired": self.acquired,
+            "waited": self.waited,
+            "wait_seconds": round(self.wait_seconds, 6),
+            "max_wait_seconds": round(self.max_wait_seconds, 6),
+            "writing": self._owner is not None,
+        }
+
+
+def configure_sqlite(engine: AsyncEngine, config: SqliteConfig) -> WriteQueue | None:
+    """Прагмы на каждое новое соединение и, если включено, очередь писателей.
+
+    Место в очереди берётся перед первым пишущим запросом соединения и
+    отдаётся, когда соединение возвращается в пул, то есть после commit
+    или rollback. Так очередь видит и ORM, и Core, и session.scalar.
+    """
+    sync_engine = engine.sync_engine
+
+    @event.listens_for(sync_engine, "connect")
+    def _pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        for pragma in (
+            f"journal_mode={config.journal_mode}",
+            f"synchronous={config.synchronous}",
+            f"mmap_size={config.mmap_size}",
+            f"cache_size={-config.cache_size_kib}",
+            f"busy_timeout={config.busy_timeout_ms}",
+            # ondelete-правила моделей без этого не работают
+            "foreign_keys=ON",
+        ):
+            cursor.execute(f"PRAGMA {pragma}")
+        cursor.close()
+
+    if not config.serialize_writes:
+        return None
+    queue = WriteQueue()
+
+    @event.listens_for(sync_engine, "before_cursor_execute")
+    def _enter_queue(conn, cursor, statement, parameters, context, executemany):
+        if HOLDS_WRITE in conn.info:
+            return
+        verb = statement.lstrip()[:8].split(None, 1)
+        if not verb or verb[0].upper() not in WRITE_VERBS:
+            return
+        await_only(queue.acquire())
+        conn.info[HOLDS_WRITE] = True
+
+    def _leave_queue(dbapi_connection, connection_record, *args):
+        if connection_record is not None and connection_record.info.pop(HOLDS_WRITE, False):
+            queue.release()
+
+    event.listen(sync_engine, "checkin", _leave_queue)
+    event.listen(sync_engine, "invalidate", _leave_queue)
+    return queue
@@ -6,16 +6,20 @@ from sqlalchemy.ext.asyncio import (
     create_async_engine,
 )
 
-from .config import settings
+from .config import SqliteConfig, settings
+from src.core.sqlite import configure_sqlite, is_sqlite_url
 from src.users.models import User
 
 
 class DatabaseHelper:
-    def __init__(self, url):
+    def __init__(self, url, sqlite: SqliteConfig | None = None):
         self.engine = create_async_engine(
             url=url,
             echo=1,
         )
+        self.write_queue = None
+        if is_sqlite_url(url):
+            self.write_queue = configure_sqlite(self.engine, sqlite or SqliteConfig())
         self.session_factory = async_sessionmaker(
             bind=self.engine,
             autoflush=False,
@@ -33,6 +37,7 @@ class DatabaseHelper:
 
 db_helper = DatabaseHelper(
     url=str(settings.db.url),
+    sqlite=settings.db.sqlite,
 )
 
 
@@ -0,0 +1,137 @@
+import asyncio
+import statistics
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
+from itertools import groupby
+
+try:
+    import numpy as np
+except ImportError:  # NumPy — необязательная зависимость
+    np = None
+
+
+RATING_VALUES = range(1, 6)
+EWMA_ALPHA = 0.3
+OFFLOAD_THRESHOLD = 20_000
+
+_DAY = 86400
+_WEEK = 7 * _DAY
+# 1970-01-01 — четверг; сдвиг на 3 дня выравнивает недели по понедельникам.
+_MONDAY_SHIFT = 3 * _DAY
+
+_pool: ProcessPoolExecutor | None = None
+
+
+def to_epoch(value: datetime) -> float:
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.timestamp()
+
+
+def _week_start(week_index: int) -> str:
+    start = datetime.fromtimestamp(week_index * _WEEK - _MONDAY_SHIFT, tz=timezone.utc)
+    return start.date().isoformat()
+
+
+def _ewma(means: list[float], alpha: float) -> list[float]:
+    trend: list[float] = []
+    for value in means:
+        trend.append(value if not trend else alpha * value + (1 - alpha) * trend[-1])
+    return trend
+
+
+def _weekly(weeks: list[int], counts: list[int], means: list[float], alpha: float) -> list[dict]:
+    return [
+        {"week_start": _week_start(week), "count": count, "avg": round(mean, 3), "ewma": round(trend, 3)}
+        for week, count, mean, trend in zip(weeks, counts, means, _ewma(means, alpha))
+    ]
+
+
+def _stats_numpy(values: array, stamps: array, alpha: float) -> dict:
+    vals = np.frombuffer(values, dtype=np.int16)
+    ts = np.frombuffer(stamps, dtype=np.float64)
+
+    histogram = np.bincount(vals, minlength=RATING_VALUES.stop)[RATING_VALUES.start:]
+    p50, p90 = np.percentile(vals, [50, 90])
+
+    week_idx = ((ts + _MONDAY_SHIFT) // _WEEK).astype(np.int64)
+    weeks, inverse = np.unique(week_idx, return_inverse=True)
+    counts = np.bincount(inverse)
+    sums = np.bincount(inverse, weights=vals)
+
+    return {
+        "count": int(vals.size),
+        "avg": round(float(vals.mean()), 3),
+        "p50": float(p50),
+        "p90": float(p90),
+        "histogram": dict(zip(RATING_VALUES, histogram.tolist())),
+        "weekly": _weekly(weeks.tolist(), counts.tolist(), (sums / counts).tolist(), alpha),
+    }
+
+
+def _stats_fallback(values: array, stamps: array, alpha: float) -> dict:
+    if len(values) > 1:
+        cuts = statistics.quantiles(values, n=10, method="inclusive")
+        p50, p90 = statistics.median(values), cuts[8]
+    else:
+        p50 = p90 = values[0]
+
+    weeks: list[int] = []
+    counts: list[int] = []
+    means: list[float] = []
+    week_of = array("q", (int((t + _MONDAY_SHIFT) // _WEEK) for t in stamps))
+    offset = 0
+    for week, group in groupby(week_of):
+        size = sum(1 for _ in group)
+        weeks.append(week)
+        counts.append(size)
+        means.append(statistics.fmean(values[offset:offset + size]))
+        offset += size
+
+    return {
+        "count": len(values),
+        "avg": round(statistics.fmean(values), 3),
+        "p50": float(p50),
+        "p90": float(p90),
+        "histogram": {v: values.count(v) for v in RATING_VALUES},
+        "weekly": _weekly(weeks, counts, means, alpha),
+    }
+
+
+def compute_rating_stats(values: array, stamps: array, alpha: float = EWMA_ALPHA) -> dict:
+    """Считает распределение оценок по столбцам (values, stamps), отсортированным по времени."""
+    if not values:
+        return {
+            "count": 0,
+            "avg": None,
+            "p50": None,
+            "p90": None,
+            "histogram": dict.fromkeys(RATING_VALUES, 0),
+            "weekly": [],
+        }
+    if np is not None:
+        return _stats_numpy(values, stamps, alpha)
+    return _stats_fallback(values, stamps, alpha)
+
+
+def _get_pool() -> ProcessPoolExecutor:
+    global _pool
+    if _pool is None:
+        _pool = ProcessPoolExecutor(max_workers=2)
+    return _pool
+
+
+def shutdown_pool() -> None:
+    """Останавливает процессы пула; вызывается из lifespan приложения."""
+    global _pool
+    if _pool is not None:
+        _pool.shutdown(cancel_futures=True)
+        _pool = None
+
+
+async def compute_rating_stats_async(values: array, stamps: array) -> dict:
+    if len(values) < OFFLOAD_THRESHOLD:
+        return compute_rating_stats(values, stamps)
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_get_pool(), compute_rating_stats, values, stamps)
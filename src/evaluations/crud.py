@@ -1,14 +1,21 @@
 from __future__ import annotations
 
+from array import array
 from datetime import datetime, timezone
 
 from fastapi import status, HTTPException
-from sqlalchemy import select, func, join
+from sqlalchemy import Row, and_, extract, or_, select, func, join
+from sqlalchemy.dialects.postgresql import aggregate_order_by
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from .analytics import to_epoch
 from .models import Evaluation
+from src.core.cache import invalidate_after_commit, team_tag
+from src.core.dialect import is_postgres
+from src.sync.crud import evaluation_payload, record_change
 from src.tasks.models import Status, Task
+from src.users.models import User
 
 
 class TaskEvaluationCRUD:
@@ -37,6 +44,8 @@ class TaskEvaluationCRUD:
         try:
             session.add(rating_row)
             await session.flush()
+            await record_change(session, team_id, "evaluation", rating_row.id, evaluation_payload(rating_row))
+            invalidate_after_commit(session, team_tag(team_id))
             await session.commit()
             await session.refresh(rating_row)
             return rating_row
@@ -74,21 +83,130 @@ class TaskEvaluationCRUD:
         session: AsyncSession,
         team_id: int,
         assignee_id: int,
-    ) -> tuple[list[Task], list[Evaluation], float | None, int]:
+        limit: int = 50,
+        before: tuple[datetime, int] | None = None,
+    ) -> tuple[list[Row], float | None, int]:
+        filters = [
+            Task.team_id == team_id,
+            Task.assignee_id == assignee_id,
+            Task.status == Status.done,
+        ]
+        totals = (
+            select(func.avg(Evaluation.value), func.count(Evaluation.id))
+            .select_from(join(Task, Evaluation, Evaluation.task_id == Task.id))
+            .where(*filters)
+        )
+        avg_val, cnt = (await session.execute(totals)).one()
+
         stmt = (
-            select(Task, Evaluation)
-            .join(Task, Task.id == Evaluation.task_id)
+            select(
+                Task.id.label("task_id"),
+                Task.name,
+                Evaluation.value.label("rating"),
+                Evaluation.rated_at,
+            )
+            .select_from(join(Task, Evaluation, Evaluation.task_id == Task.id))
+            .where(*filters)
+            .order_by(Evaluation.rated_at.desc(), Task.id.desc())
+            .limit(limit)
+        )
+        if before is not None:
+            rated_at, task_id = before
+            stmt = stmt.where(
+                or_(
+                    Evaluation.rated_at < rated_at,
+                    and_(Evaluation.rated_at == rated_at, Task.id < task_id),
+                )
+            )
+        items = list((await session.execute(stmt)).all())
+        return items, (float(avg_val) if avg_val is not None else None), int(cnt or 0)
+
+    @staticmethod
+    async def get_leaderboard(
+        session: AsyncSession,
+        team_id: int,
+        date_from: datetime,
+        date_to: datetime,
+        top: int | None = None,
+        min_count: int = 1,
+    ) -> list[dict]:
+        avg_value = func.avg(Evaluation.value)
+        stats = (
+            select(
+                Task.assignee_id,
+                avg_value.label("avg_rating"),
+                func.count(Evaluation.id).label("count"),
+                func.rank().over(order_by=avg_value.desc()).label("rank"),
+            )
+            .select_from(join(Evaluation, Task, Evaluation.task_id == Task.id))
             .where(
                 Task.team_id == team_id,
-                Task.assignee_id == assignee_id,
                 Task.status == Status.done,
+                Task.assignee_id.is_not(None),
+                Evaluation.rated_at >= date_from,
+                Evaluation.rated_at <= date_to,
             )
-            .order_by(Evaluation.rated_at.desc().nullslast(), Task.id.desc())
+            .group_by(Task.assignee_id)
+            .having(func.count(Evaluation.id) >= min_count)
+            .subquery()
+        )
+        stmt = (
+            select(stats.c.rank, stats.c.assignee_id, User.email, stats.c.avg_rating, stats.c.count)
+            .join(User, User.id == stats.c.assignee_id)
+            .order_by(stats.c.rank, stats.c.assignee_id)
         )
+        if top is not None:
+            stmt = stmt.where(stats.c.rank <= top)
+
         rows = (await session.execute(stmt)).all()
-        tasks = [r[0] for r in rows]
-        ratings = [r[1] for r in rows]
+        return [
+            {
+                "rank": row.rank,
+                "assignee_id": row.assignee_id,
+                "email": row.email,
+                "avg_rating": round(float(row.avg_rating), 2),
+                "count": row.count,
+            }
+            for row in rows
+        ]
 
-        count = len(ratings)
-        avg = (sum(r.value for r in ratings) / count) if count else None
-        return tasks, ratings, avg, count
+    @staticmethod
+    async def get_rating_columns(
+        session: AsyncSession,
+        team_id: int,
+        date_from: datetime,
+        date_to: datetime,
+        assignee_id: int | None = None,
+    ) -> tuple[array, array]:
+        filters = [
+            Task.team_id == team_id,
+            Task.status == Status.done,
+            Evaluation.rated_at >= date_from,
+            Evaluation.rated_at <= date_to,
+        ]
+        if assignee_id is not None:
+            filters.append(Task.assignee_id == assignee_id)
+        source = join(Evaluation, Task, Evaluation.task_id == Task.id)
+
+        if is_postgres(session):
+            stmt = (
+                select(
+                    func.array_agg(aggregate_order_by(Evaluation.value, Evaluation.rated_at)),
+                    func.array_agg(
+                        aggregate_order_by(extract("epoch", Evaluation.rated_at), Evaluation.rated_at)
+                    ),
+                )
+                .select_from(source)
+                .where(*filters)
+            )
+            values, stamps = (await session.execute(stmt)).one()
+            return array("h", values or ()), array("d", map(float, stamps or ()))
+
+        stmt = (
+            select(Evaluation.value, Evaluation.rated_at)
+            .select_from(source)
+            .where(*filters)
+            .order_by(Evaluation.rated_at)
+        )
+        rows = (await session.execute(stmt)).all()
+        return array("h", (r.value for r in rows)), array("d", (to_epoch(r.rated_at) for r in rows))
@@ -1,13 +1,17 @@
 from __future__ import annotations
 from datetime import datetime
 
-from sqlalchemy import SmallInteger, ForeignKey, DateTime
+from sqlalchemy import SmallInteger, ForeignKey, DateTime, Index
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from src.models.base import Base
 
 
 class Evaluation(Base):
+    __table_args__ = (
+        Index("ix_evaluation_task_rated", "task_id", "rated_at", "value"),
+    )
+
     task_id: Mapped[int] = mapped_column(
         ForeignKey("task.id", ondelete="CASCADE"), nullable=False,
         comment="ID задачи, к которой относится оценка"
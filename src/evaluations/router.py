@@ -1,11 +1,14 @@
 from datetime import datetime
+from typing import Any
 
-from fastapi import APIRouter, Depends, status
+from fastapi import APIRouter, Depends, Query, status
 
+from src.core.cache import cached, team_tag
 from src.core.dependencies import CurrentUser, SessionDep
 from src.users.models import User
+from .analytics import compute_rating_stats_async
 from .crud import TaskEvaluationCRUD
-from .permissions import require_team_admin_or_superuser
+from .permissions import forbid_employee, require_team_admin_or_superuser
 from .schemas import EvaluationCreate, EvaluationRead
 
 
@@ -39,7 +42,12 @@ async def rate_task_endpoint(
     return EvaluationRead(task_id=row.task_id, value=row.value, rated_at=row.rated_at)
 
 
+def _team_tags(kwargs: dict[str, Any], _) -> list[str]:
+    return [team_tag(kwargs["team_id"])]
+
+
 @evaluation_router.get("/ratings/avg")
+@cached("ratings.avg", dict[str, Any], tags=_team_tags)
 async def ratings_avg_endpoint(
     team_id: int,
     date_from: datetime,
@@ -57,15 +65,81 @@ async def ratings_avg_endpoint(
     }
 
 
+@evaluation_router.get("/ratings/analytics")
+@cached("ratings.analytics", dict[str, Any], tags=_team_tags)
+async def ratings_analytics_endpoint(
+    team_id: int,
+    date_from: datetime,
+    date_to: datetime,
+    session: SessionDep,
+    user: CurrentUser,
+    assignee_id: int | None = Query(None, description="Только задачи этого исполнителя"),
+):
+    values, stamps = await crud.get_rating_columns(
+        session,
+        team_id=team_id,
+        date_from=date_from,
+        date_to=date_to,
+        assignee_id=assignee_id,
+    )
+    stats = await compute_rating_stats_async(values, stamps)
+    return {
+        "date_from": date_from,
+        "date_to": date_to,
+        "assignee_id": assignee_id,
+        **stats,
+    }
+
+
+@evaluation_router.get("/ratings/leaderboard")
+@cached("ratings.leaderboard", dict[str, Any], tags=_team_tags)
+async def ratings_leaderboard_endpoint(
+    team_id: int,
+    date_from: datetime,
+    date_to: datetime,
+    session: SessionDep,
+    user: User = Depends(forbid_employee),
+    top: int | None = Query(None, ge=1, description="Сколько мест вернуть (с учётом равных)"),
+    min_count: int = Query(1, ge=1, description="Минимум оценённых задач для участия"),
+):
+    board = await crud.get_leaderboard(
+        session,
+        team_id=team_id,
+        date_from=date_from,
+        date_to=date_to,
+        top=top,
+        min_count=min_count,
+    )
+    return {
+        "date_from": date_from,
+        "date_to": date_to,
+        "items": board,
+    }
+
+
 @evaluation_router.get("/ratings/user")
+@cached("ratings.user", dict[str, Any], tags=_team_tags)
 async def my_ratings_endpoint(
     team_id: int,
     session: SessionDep,
     actor: CurrentUser,
+    limit: int = Query(50, ge=1, le=200),
+    before_rated_at: datetime | None = Query(None, description="Курсор: rated_at последнего элемента"),
+    before_task_id: int | None = Query(None, description="Курсор: task_id последнего элемента"),
 ):
-    tasks, ratings, avg, count = await crud.list_user_ratings(session, team_id=team_id, assignee_id=actor.id)
-    items = [
-        {"task_id": t.id, "name": t.name, "rating": r.value, "rated_at": r.rated_at}
-        for t, r in zip(tasks, ratings)
-    ]
-    return {"avg_rating": (round(avg, 2) if avg is not None else None), "count": count, "items": items}
+    before = None
+    if before_rated_at is not None and before_task_id is not None:
+        before = (before_rated_at, before_task_id)
+    items, avg, count = await crud.list_user_ratings(
+        session, team_id=team_id, assignee_id=actor.id, limit=limit, before=before,
+    )
+    next_cursor = None
+    if len(items) == limit:
+        last = items[-1]
+        next_cursor = {"before_rated_at": last.rated_at, "before_task_id": last.task_id}
+    return {
+        "avg_rating": (round(avg, 2) if avg is not None else None),
+        "count": count,
+        "items": [item._asdict() for item in items],
+        "next_cursor": next_cursor,
+    }
@@ -0,0 +1,113 @@
+import asyncio
+import json
+from typing import Any, AsyncIterator, Iterable
+
+
+SUBSCRIBER_QUEUE_SIZE = 256
+KEEPALIVE_INTERVAL = 15.0
+
+KEEPALIVE = b": keepalive\n\n"
+# Подписчик не успевал читать и был отключён: пропущенное клиент забирает через /sync.
+RESYNC = b"event: resync\ndata: {}\n\n"
+
+
+class Subscriber:
+    __slots__ = ("team_id", "queue", "dropped")
+
+    def __init__(self, team_id: int, maxsize: int):
+        self.team_id = team_id
+        self.queue: asyncio.Queue[bytes] = asyncio.Queue(maxsize)
+        self.dropped = False
+
+
+class EventHub:
+    """Раздача событий команды подписчикам внутри одного процесса.
+
+    События других воркеров сюда приносит InvalidationBus; с транспортом off
+    поток видит только изменения своего процесса.
+
+    Каждое событие сериализуется один раз, в очереди кладутся готовые байты.
+    Очереди ограничены: подписчик с переполненной очередью отключается,
+    чтобы медленный клиент не копил память и не тормозил публикацию.
+    Keepalive рассылает один общий таймер, а не по таймеру на подписчика.
+    """
+
+    def __init__(self, queue_size: int = SUBSCRIBER_QUEUE_SIZE, keepalive: float = KEEPALIVE_INTERVAL):
+        self.queue_size = queue_size
+        self.keepalive = keepalive
+        self._subscribers: dict[int, set[Subscriber]] = {}
+        self._ticker: asyncio.Task | None = None
+        self.published = 0
+        self.dropped = 0
+
+    def subscribe(self, team_id: int) -> Subscriber:
+        subscriber = Subscriber(team_id, self.queue_size)
+        self._subscribers.setdefault(team_id, set()).add(subscriber)
+        if self._ticker is None or self._ticker.done():
+            self._ticker = asyncio.get_running_loop().create_task(self._tick())
+        return subscriber
+
+    def unsubscribe(self, subscriber: Subscriber) -> None:
+        team = self._subscribers.get(subscriber.team_id)
+        if team is None:
+            return
+        team.discard(subscriber)
+        if not team:
+            del self._subscribers[subscriber.team_id]
+        if not self._subscribers and self._ticker is not None:
+            self._ticker.cancel()
+            self._ticker = None
+
+    def subscriber_count(self, team_id: int | None = None) -> int:
+        if team_id is not None:
+            return len(self._subscribers.get(team_id, ()))
+        return sum(len(team) for team in self._subscribers.values())
+
+    def publish(self, team_id: int, events: Iterable[dict[str, Any]]) -> None:
+        team = self._subscribers.get(team_id)
+        if not team:
+            return
+        messages = [encode_event("change", event) for event in events]
+        self.published += len(messages)
+        for subscriber in list(team):
+            try:
+                for message in messages:
+                    subscriber.queue.put_nowait(message)
+            except asyncio.QueueFull:
+                self._drop(subscriber)
+
+    async def _tick(self) -> None:
+        while True:
+            await asyncio.sleep(self.keepalive)
+            for team in list(self._subscribers.values()):
+                for subscriber in team:
+                    if subscriber.queue.empty():
+                        subscriber.queue.put_nowait(KEEPALIVE)
+
+    def _drop(self, subscriber: Subscriber) -> None:
+        self.unsubscribe(subscriber)
+        self.dropped += 1
+        subscriber.dropped = True
+        queue = subscriber.queue
+        while not queue.empty():
+            queue.get_nowait()
+        queue.put_nowait(RESYNC)
+
+    async def stream(self, team_id: int) -> AsyncIterator[bytes]:
+        subscriber = self.subscribe(team_id)
+        try:
+            yield b"retry: 5000\n\n"
+            while True:
+                message = await subscriber.queue.get()
+                yield message
+                if message is RESYNC:
+                    return
+        finally:
+            self.unsubscribe(subscriber)
+
+
+def encode_event(name: str, data: dict[str, Any]) -> bytes:
+    return f"event: {name}\ndata: {json.dumps(data, separators=(',', ':'))}\n\n".encode()
+
+
+hub = EventHub()
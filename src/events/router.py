@@ -0,0 +1,23 @@
+from fastapi import APIRouter, HTTPException
+from fastapi.responses import StreamingResponse
+
+from src.core.dependencies import CurrentUser, SessionDep
+from src.events.hub import hub
+
+
+events_router = APIRouter(prefix="/events", tags=["events"])
+
+
+@events_router.get("/stream")
+async def stream_events(session: SessionDep, current_user: CurrentUser):
+    """SSE-поток изменений команды текущего пользователя (задачи, встречи, комментарии, состав)."""
+    if current_user.team_id is None:
+        raise HTTPException(status_code=400, detail="User is not in a team")
+    team_id = current_user.team_id
+    # Соединение с БД больше не нужно — не держим его из пула всё время подписки.
+    await session.close()
+    return StreamingResponse(
+        hub.stream(team_id),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
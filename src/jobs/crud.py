@@ -0,0 +1,135 @@
+from datetime import timedelta
+from typing import Any, Callable
+
+from fastapi import HTTPException, status
+from sqlalchemy import and_, func, or_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.core.dialect import is_postgres, lock_for_update
+from src.core.hooks import on_commit
+from src.jobs.models import Job, JobStatus
+from src.outbox.crud import utcnow
+from src.users.models import User
+
+
+ACTIVE_STATUSES = (JobStatus.queued, JobStatus.running)
+
+# Внутрипроцессные воркеры, которых будит закоммиченное задание.
+enqueue_listeners: list[Callable[[], None]] = []
+
+
+def _notify() -> None:
+    for listener in enqueue_listeners:
+        listener()
+
+
+class JobCRUD:
+    @staticmethod
+    async def enqueue(
+        session: AsyncSession,
+        kind: str,
+        payload: dict[str, Any],
+        *,
+        user_id: int | None = None,
+        team_id: int | None = None,
+        unique: bool = False,
+    ) -> Job:
+        """Ставит задание в очередь в текущей транзакции; commit — за вызывающим.
+
+        unique=True возвращает уже поставленное и не завершённое задание того же
+        типа для той же команды вместо нового.
+        """
+        if unique:
+            existing = await session.scalar(
+                select(Job)
+                .where(Job.kind == kind, Job.team_id == team_id, Job.status.in_(ACTIVE_STATUSES))
+                .order_by(Job.id)
+                .limit(1)
+            )
+            if existing is not None:
+                return existing
+        job = Job(kind=kind, payload=payload, user_id=user_id, team_id=team_id, status=JobStatus.queued)
+        session.add(job)
+        await session.flush()
+        on_commit(session, _notify)
+        return job
+
+    @staticmethod
+    async def claim(session: AsyncSession, lease: timedelta) -> Job | None:
+        """Выдаёт воркеру следующее задание и берёт его в аренду.
+
+        На Postgres строка берётся через FOR UPDATE SKIP LOCKED, на SQLite — под
+        BEGIN IMMEDIATE, поэтому воркеры в разных процессах не получают одно задание. Задание упавшего воркера
+        снова выдаётся после истечения аренды.
+        """
+        now = utcnow()
+        stmt = (
+            select(Job)
+            .where(or_(
+                Job.status == JobStatus.queued,
+                and_(Job.status == JobStatus.running, Job.locked_until < now),
+            ))
+            .order_by(Job.id)
+            .limit(1)
+        )
+        if is_postgres(session):
+            stmt = stmt.with_for_update(skip_locked=True)
+        else:
+            await lock_for_update(session)
+        job = await session.scalar(stmt)
+        if job is None:
+            await session.commit()
+            return None
+        job.status = JobStatus.running
+        job.attempts += 1
+        job.locked_until = now + lease
+        job.started_at = func.now()
+        await session.commit()
+        await session.refresh(job)
+        return job
+
+    @staticmethod
+    async def report_progress(
+        session: AsyncSession, job_id: int, done: int, total: int | None, lease: timedelta,
+    ) -> None:
+        """Сохраняет прогресс и продлевает аренду."""
+        values: dict[str, Any] = {"progress_done": done, "locked_until": utcnow() + lease}
+        if total is not None:
+            values["progress_total"] = total
+        await session.execute(update(Job).where(Job.id == job_id).values(**values))
+        await session.commit()
+
+    @staticmethod
+    async def finish(session: AsyncSession, job_id: int, result: dict[str, Any] | None) -> None:
+        await session.execute(
+            update(Job)
+            .where(Job.id == job_id)
+            .values(status=JobStatus.done, result=result, error=None, locked_until=None, finished_at=func.now())
+        )
+        await session.commit()
+
+    @staticmethod
+    async def fail(session: AsyncSession, job_id: int, error: str, max_attempts: int) -> JobStatus:
+        """Возвращает задание в очередь или, если попытки исчерпаны, помечает failed."""
+        attempts = await session.scalar(select(Job.attempts).where(Job.id == job_id))
+        exhausted = attempts is None or attempts >= max_attempts
+        new_status = JobStatus.failed if exhausted else JobStatus.queued
+        await session.execute(
+            update(Job)
+            .where(Job.id == job_id)
+            .values(
+                status=new_status,
+                error=error[:1000],
+                locked_until=None,
+                finished_at=func.now() if exhausted else None,
+            )
+        )
+        await session.commit()
+        return new_status
+
+    @staticmethod
+    async def get_job(session: AsyncSession, job_id: int, user: User) -> Job:
+        job = await session.get(Job, job_id)
+        if job is None or (job.user_id != user.id and not user.is_superuser):
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Job not found")
+        return job
@@ -0,0 +1,73 @@
+from datetime import datetime
+from enum import StrEnum
+
+from sqlalchemy import JSON, DateTime, Enum, ForeignKey, Index, Integer, String, Text
+from sqlalchemy.orm import Mapped, mapped_column
+
+from src.mixins.timestamp_mixin import TimestampMixin
+from src.models.base import Base
+
+
+class JobStatus(StrEnum):
+    queued = "queued"
+    running = "running"
+    done = "done"
+    failed = "failed"
+
+
+class Job(Base, TimestampMixin):
+    __table_args__ = (
+        Index("ix_job_status_id", "status", "id"),
+        Index("ix_job_kind_team_status", "kind", "team_id", "status"),
+    )
+
+    kind: Mapped[str] = mapped_column(
+        String(64), nullable=False,
+        comment="Тип задания, например team.delete",
+    )
+    status: Mapped[JobStatus] = mapped_column(
+        Enum(JobStatus), nullable=False, default=JobStatus.queued,
+        comment="queued — ждёт воркера, running — выполняется, done/failed — завершено",
+    )
+    payload: Mapped[dict] = mapped_column(
+        JSON, nullable=False, default=dict,
+        comment="Параметры задания",
+    )
+    result: Mapped[dict | None] = mapped_column(
+        JSON,
+        comment="Результат выполнения",
+    )
+    error: Mapped[str | None] = mapped_column(
+        Text,
+        comment="Последняя ошибка",
+    )
+    progress_done: Mapped[int] = mapped_column(
+        Integer, nullable=False, default=0,
+        comment="Сколько единиц работы выполнено",
+    )
+    progress_total: Mapped[int | None] = mapped_column(
+        Integer,
+        comment="Сколько единиц работы всего (если известно)",
+    )
+    attempts: Mapped[int] = mapped_column(
+        Integer, nullable=False, default=0,
+        comment="Сколько раз задание выдавалось воркеру",
+    )
+    user_id: Mapped[int | None] = mapped_column(
+        ForeignKey("user.id", ondelete="SET NULL"),
+        comment="ID пользователя, поставившего задание",
+    )
+    team_id: Mapped[int | None] = mapped_column(
+        Integer,
+        comment="ID команды, над которой работает задание (без FK: команда может быть уже удалена)",
+    )
+    locked_until: Mapped[datetime | None] = mapped_column(
+        DateTime,
+        comment="Аренда воркера (UTC); после истечения задание можно выдать снова",
+    )
+    started_at: Mapped[datetime | None] = mapped_column(
+        DateTime(timezone=True),
+    )
+    finished_at: Mapped[datetime | None] = mapped_column(
+        DateTime(timezone=True),
+    )
@@ -0,0 +1,24 @@
+from fastapi import APIRouter, HTTPException, status
+
+from src.core.dependencies import CurrentUser, SessionDep
+from src.jobs.crud import JobCRUD
+from src.jobs.models import JobStatus
+from src.jobs.schemas import JobRead
+
+
+crud = JobCRUD()
+jobs_router = APIRouter(prefix="/jobs", tags=["jobs"])
+
+
+@jobs_router.get("/{job_id}", response_model=JobRead)
+async def get_job(job_id: int, session: SessionDep, current_user: CurrentUser):
+    """Статус и прогресс задания; опрашивать, пока status не станет done или failed."""
+    return await crud.get_job(session, job_id, current_user)
+
+
+@jobs_router.get("/{job_id}/result")
+async def get_job_result(job_id: int, session: SessionDep, current_user: CurrentUser):
+    job = await crud.get_job(session, job_id, current_user)
+    if job.status != JobStatus.done:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=f"Job is {job.status}")
+    return job.result
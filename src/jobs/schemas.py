@@ -0,0 +1,25 @@
+from datetime import datetime
+
+from pydantic import BaseModel, ConfigDict
+
+from src.jobs.models import JobStatus
+
+
+class JobRead(BaseModel):
+    id: int
+    kind: str
+    status: JobStatus
+    progress_done: int
+    progress_total: int | None
+    attempts: int
+    error: str | None
+    created_at: datetime
+    started_at: datetime | None
+    finished_at: datetime | None
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class JobAccepted(BaseModel):
+    message: str
+    job_id: int
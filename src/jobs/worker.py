@@ -0,0 +1,130 @@
+import asyncio
+import logging
+from dataclasses import dataclass, field
+from datetime import timedelta
+from typing import Any, Awaitable, Callable
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from src.config import JobsConfig
+from src.jobs.crud import JobCRUD, enqueue_listeners
+
+
+log = logging.getLogger(__name__)
+
+
+@dataclass
+class JobContext:
+    """То, что видит обработчик: параметры задания и способ отчитаться о прогрессе.
+
+    Обработчик сам открывает сессии через session_factory и коммитит работу
+    порциями, чтобы не держать соединение и блокировки всё время выполнения.
+    """
+
+    job_id: int
+    payload: dict[str, Any]
+    session_factory: async_sessionmaker[AsyncSession]
+    lease: timedelta
+    chunk_size: int
+    done: int = field(default=0)
+    total: int | None = field(default=None)
+
+    async def progress(self, done: int, total: int | None = None) -> None:
+        self.done = done
+        if total is not None:
+            self.total = total
+        async with self.session_factory() as session:
+            await JobCRUD.report_progress(session, self.job_id, done, total, self.lease)
+
+
+JobHandler = Callable[[JobContext], Awaitable[dict[str, Any] | None]]
+
+handlers: dict[str, JobHandler] = {}
+
+
+def job_handler(kind: str) -> Callable[[JobHandler], JobHandler]:
+    def register(func: JobHandler) -> JobHandler:
+        handlers[kind] = func
+        return func
+    return register
+
+
+def _load_handlers() -> None:
+    # обработчики регистрируются при импорте модулей предметной области
+    import src.teams.jobs  # noqa: F401
+
+
+class JobWorker:
+    """Несколько корутин, по очереди забирающих задания из таблицы job."""
+
+    def __init__(self, session_factory: async_sessionmaker[AsyncSession], config: JobsConfig):
+        _load_handlers()
+        self.session_factory = session_factory
+        self.config = config
+        self.lease = timedelta(seconds=config.lease_seconds)
+        self._wakeup = asyncio.Event()
+        self._tasks: list[asyncio.Task] = []
+
+    def on_enqueue(self) -> None:
+        self._wakeup.set()
+
+    async def run_once(self) -> bool:
+        """Выполнить одно задание; False — очередь пуста."""
+        async with self.session_factory() as session:
+            job = await JobCRUD.claim(session, self.lease)
+        if job is None:
+            return False
+
+        ctx = JobContext(
+            job_id=job.id,
+            payload=job.payload,
+            session_factory=self.session_factory,
+            lease=self.lease,
+            chunk_size=self.config.chunk_size,
+        )
+        try:
+            handler = handlers.get(job.kind)
+            if handler is None:
+                raise LookupError(f"Unknown job kind: {job.kind}")
+            result = await handler(ctx)
+        except asyncio.CancelledError:
+            # аренда истечёт, и задание подхватит другой воркер
+            raise
+        except Exception as e:
+            log.exception("job %s (%s) failed", job.id, job.kind)
+            async with self.session_factory() as session:
+                await JobCRUD.fail(session, job.id, f"{type(e).__name__}: {e}", self.config.max_attempts)
+            return True
+
+        async with self.session_factory() as session:
+            await JobCRUD.finish(session, job.id, result)
+        return True
+
+    async def run(self) -> None:
+        while True:
+            try:
+                self._wakeup.clear()
+                if await self.run_once():
+                    continue
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), self.config.poll_seconds)
+                except asyncio.TimeoutError:
+                    pass
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                log.exception("job worker loop failed")
+                await asyncio.sleep(self.config.poll_seconds)
+
+    def start(self) -> None:
+        enqueue_listeners.append(self.on_enqueue)
+        loop = asyncio.get_running_loop()
+        self._tasks = [loop.create_task(self.run()) for _ in range(self.config.concurrency)]
+
+    async def stop(self) -> None:
+        if self.on_enqueue in enqueue_listeners:
+            enqueue_listeners.remove(self.on_enqueue)
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
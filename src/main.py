@@ -1,3 +1,5 @@
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI, Request
 from fastapi.responses import HTMLResponse
 from fastapi.templating import Jinja2Templates
@@ -6,6 +8,7 @@ import uvicorn
 from src.models.admin import UserAdmin
 from src.models.admin import EvaluationAdmin
 from src.models.admin import MeetingAdmin
+from src.models.admin import MeetingSeriesAdmin
 from src.models.admin import TaskAdmin
 from src.models.admin import TaskCommentAdmin
 from src.models.admin import TeamAdmin
@@ -15,18 +18,61 @@ from .const import API_PREFIX
 from src.auth.backend import auth_backend
 from src.auth.users import fastapi_users
 from src.auth.schemas import UserRead, UserUpdate, UserCreate
+from src.calendar_view.router import calendar_router
 from src.evaluations.router import evaluation_router
 from src.tasks.router import tasks_router
 from src.teams.router import teams_router
 from src.users.router import users_router
 from src.meetings.router import meetings_router
+from src.sync.router import sync_router
+from src.events.router import events_router
 from src.users.actions.route_superuser import superuser_router
+from src.reminders.scheduler import ReminderScheduler
+from src.outbox.dispatcher import OutboxDispatcher
+from src.outbox.router import outbox_router
+from src.jobs.router import jobs_router
+from src.core.router import metrics_router
+from src.core.invalidation import InvalidationBus
+from src.evaluations.analytics import shutdown_pool
+from src.jobs.worker import JobWorker
 
 from sqladmin import Admin
 from src.database import db_helper
 
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    bus = InvalidationBus.from_config(settings.invalidation, db_helper.engine)
+    if bus is not None:
+        await bus.start()
+    reminders = None
+    if settings.reminders.enabled:
+        reminders = ReminderScheduler.from_config(
+            settings.reminders, db_helper.engine, db_helper.session_factory,
+        )
+        reminders.start()
+    outbox = None
+    if settings.outbox.webhooks:
+        outbox = OutboxDispatcher(db_helper.session_factory, settings.outbox)
+        outbox.start()
+    jobs = None
+    if settings.jobs.enabled:
+        jobs = JobWorker(db_helper.session_factory, settings.jobs)
+        jobs.start()
+    yield
+    if jobs is not None:
+        await jobs.stop()
+    if outbox is not None:
+        await outbox.stop()
+    if reminders is not None:
+        await reminders.stop()
+    if bus is not None:
+        await bus.stop()
+    shutdown_pool()
+
+
 app = FastAPI(
+    lifespan=lifespan,
     openapi_url=f"{API_PREFIX}/openapi.json",
     docs_url=f"{API_PREFIX}/docs",
     redoc_url=f"{API_PREFIX}/redoc",
@@ -84,6 +130,30 @@ app.include_router(
     meetings_router,
     prefix=API_PREFIX,
 )
+app.include_router(
+    calendar_router,
+    prefix=API_PREFIX,
+)
+app.include_router(
+    sync_router,
+    prefix=API_PREFIX,
+)
+app.include_router(
+    events_router,
+    prefix=API_PREFIX,
+)
+app.include_router(
+    outbox_router,
+    prefix=API_PREFIX,
+)
+app.include_router(
+    jobs_router,
+    prefix=API_PREFIX,
+)
+app.include_router(
+    metrics_router,
+    prefix=API_PREFIX,
+)
 app.include_router(
     fastapi_users.get_auth_router(auth_backend),
     prefix=API_PREFIX + "/auth",
@@ -122,6 +192,7 @@ admin.add_view(EvaluationAdmin)
 admin.add_view(TaskAdmin)
 admin.add_view(TaskCommentAdmin)
 admin.add_view(MeetingAdmin)
+admin.add_view(MeetingSeriesAdmin)
 admin.add_view(TeamAdmin)
 
 
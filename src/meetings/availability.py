@@ -0,0 +1,321 @@
+from datetime import datetime, time, timedelta
+from itertools import groupby
+from typing import Iterable, Sequence
+
+from fastapi import HTTPException, status
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.core.cache import TTLCache
+from src.core.dialect import is_postgres
+from src.meetings.models import Meeting, MeetingStatus, meeting_participants
+from src.meetings.recurrence import get_virtual_occurrences
+from src.users.models import User
+
+
+Interval = tuple[datetime, datetime]
+
+freebusy_cache = TTLCache("freebusy", ttl=300, maxsize=4096)
+
+
+def merge_intervals(intervals: Iterable[Interval]) -> list[Interval]:
+    """Сливает пересекающиеся и смежные интервалы; вход сортируется по началу."""
+    merged: list[Interval] = []
+    for start, end in sorted(intervals):
+        if merged and start <= merged[-1][1]:
+            if end > merged[-1][1]:
+                merged[-1] = (merged[-1][0], end)
+        else:
+            merged.append((start, end))
+    return merged
+
+
+def invalidate_free_busy(user_ids: Iterable[int]) -> None:
+    for user_id in user_ids:
+        freebusy_cache.invalidate(user_id)
+
+
+async def get_participant_ids(session: AsyncSession, meeting_id: int) -> list[int]:
+    stmt = select(meeting_participants.c.user_id).where(
+        meeting_participants.c.meeting_id == meeting_id
+    )
+    return list((await session.scalars(stmt)).all())
+
+
+async def ensure_team_members(session: AsyncSession, team_id: int | None, user_ids: Iterable[int]) -> None:
+    wanted = set(user_ids)
+    found = set(
+        (await session.scalars(
+            select(User.id).where(User.id.in_(wanted), User.team_id == team_id)
+        )).all()
+    )
+    missing = sorted(wanted - found)
+    if missing:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail=f"Users not in your team: {missing}",
+        )
+
+
+async def find_busy_participants(
+    session: AsyncSession,
+    user_ids: Iterable[int],
+    starts_at: datetime,
+    ends_at: datetime,
+    exclude_meeting_id: int | None = None,
+) -> dict[int, list[int]]:
+    """Участники, занятые в [starts_at, ends_at) в любой команде: user_id -> id встреч.
+
+    Время встречи продублировано в meeting_participants, поэтому пересечение
+    ищется по индексу (user_id, период) — GiST в Postgres, (user_id, ends_at) в SQLite;
+    meeting подключается только для проверки статуса найденных строк.
+    """
+    mp = meeting_participants
+    if is_postgres(session):
+        overlaps = [func.tsrange(mp.c.starts_at, mp.c.ends_at).op("&&")(func.tsrange(starts_at, ends_at))]
+    else:
+        overlaps = [mp.c.ends_at > starts_at, mp.c.starts_at < ends_at]
+    stmt = (
+        select(mp.c.user_id, mp.c.meeting_id)
+        .join(Meeting, Meeting.id == mp.c.meeting_id)
+        .where(
+            mp.c.user_id.in_(set(user_ids)),
+            *overlaps,
+            Meeting.status == MeetingStatus.scheduled,
+        )
+        .order_by(mp.c.user_id, mp.c.meeting_id)
+    )
+    if exclude_meeting_id is not None:
+        stmt = stmt.where(mp.c.meeting_id != exclude_meeting_id)
+    rows = (await session.execute(stmt)).all()
+    return {
+        user_id: [row.meeting_id for row in group]
+        for user_id, group in groupby(rows, key=lambda row: row.user_id)
+    }
+
+
+async def get_free_busy(
+    session: AsyncSession,
+    user_ids: Sequence[int],
+    starts_at: datetime,
+    ends_at: datetime,
+) -> dict[int, list[Interval]]:
+    busy: dict[int, list[Interval]] = {}
+    missing: list[int] = []
+    for user_id in dict.fromkeys(user_ids):
+        cached = freebusy_cache.get((user_id, starts_at, ends_at))
+        if cached is None:
+            missing.append(user_id)
+        else:
+            busy[user_id] = cached
+
+    if missing:
+        mp = meeting_participants
+        stmt = (
+            select(mp.c.user_id, Meeting.starts_at, Meeting.ends_at)
+            .join(Meeting, Meeting.id == mp.c.meeting_id)
+            .where(
+                mp.c.user_id.in_(missing),
+                Meeting.status == MeetingStatus.scheduled,
+                Meeting.ends_at > starts_at,
+                Meeting.starts_at < ends_at,
+            )
+            .order_by(mp.c.user_id, Meeting.starts_at)
+        )
+        rows = (await session.execute(stmt)).all()
+        fetched = {
+            user_id: merge_intervals(
+                (max(row.starts_at, starts_at), min(row.ends_at, ends_at)) for row in group
+            )
+            for user_id, group in groupby(rows, key=lambda row: row.user_id)
+        }
+        for user_id in missing:
+            intervals = fetched.get(user_id, [])
+            freebusy_cache.set((user_id, starts_at, ends_at), intervals)
+            busy[user_id] = intervals
+
+    return {user_id: busy[user_id] for user_id in dict.fromkeys(user_ids)}
+
+
+def _align_up(moment: datetime, step: timedelta) -> datetime:
+    midnight = moment.replace(hour=0, minute=0, second=0, microsecond=0)
+    slots = -(-(moment - midnight) // step)
+    return midnight + slots * step
+
+
+def busy_mask(intervals: Iterable[Interval], origin: datetime, step: timedelta, size: int) -> int:
+    """Битовая карта занятости: бит i означает, что слот [origin + i*step, +step) занят."""
+    mask = 0
+    for start, end in intervals:
+        first = max(0, (start - origin) // step)
+        last = min(size, -(-(end - origin) // step))
+        if last > first:
+            mask |= ((1 << (last - first)) - 1) << first
+    return mask
+
+
+def working_mask(
+    origin: datetime,
+    step: timedelta,
+    size: int,
+    work_start: time,
+    work_end: time,
+    weekdays_only: bool = True,
+) -> int:
+    day = origin.replace(hour=0, minute=0, second=0, microsecond=0)
+    horizon = origin + size * step
+    hours: list[Interval] = []
+    while day < horizon:
+        if not weekdays_only or day.weekday() < 5:
+            hours.append((
+                datetime.combine(day.date(), work_start, tzinfo=origin.tzinfo),
+                datetime.combine(day.date(), work_end, tzinfo=origin.tzinfo),
+            ))
+        day += timedelta(days=1)
+    return busy_mask(hours, origin, step, size)
+
+
+def _runs(mask: int, length: int) -> int:
+    """Оставляет бит i, только если свободны все слоты i..i+length-1."""
+    span = 1
+    while span < length:
+        shift = min(span, length - span)
+        mask &= mask >> shift
+        span += shift
+    return mask
+
+
+def pick_slots(
+    busy: Iterable[Sequence[Interval]],
+    origin: datetime,
+    step: timedelta,
+    size: int,
+    duration: timedelta,
+    count: int,
+    allowed: int,
+) -> list[Interval]:
+    # Маски — целые произвольной длины: OR/AND/сдвиги выполняются
+    # машинными словами, без попарного сравнения интервалов.
+    taken = 0
+    for intervals in busy:
+        taken |= busy_mask(intervals, origin, step, size)
+    free = allowed & ~taken & ((1 << size) - 1)
+
+    length = -(-duration // step)
+    starts = _runs(free, length)
+    slots: list[Interval] = []
+    while starts and len(slots) < count:
+        index = (starts & -starts).bit_length() - 1
+        start = origin + index * step
+        slots.append((start, start + duration))
+        starts &= ~((1 << (index + length)) - 1)
+    return slots
+
+
+async def get_team_busy(
+    session: AsyncSession,
+    team_id: int,
+    starts_at: datetime,
+    ends_at: datetime,
+) -> list[Interval]:
+    stmt = (
+        select(Meeting.starts_at, Meeting.ends_at)
+        .where(
+            Meeting.team_id == team_id,
+            Meeting.status == MeetingStatus.scheduled,
+            Meeting.ends_at > starts_at,
+            Meeting.starts_at < ends_at,
+        )
+        .order_by(Meeting.starts_at)
+    )
+    return [(row.starts_at, row.ends_at) for row in (await session.execute(stmt)).all()]
+
+
+async def suggest_slots(
+    session: AsyncSession,
+    team_id: int,
+    user_ids: Sequence[int],
+    starts_at: datetime,
+    ends_at: datetime,
+    duration: timedelta,
+    count: int,
+    step: timedelta,
+    work_start: time,
+    work_end: time,
+    weekdays_only: bool = True,
+) -> list[Interval]:
+    origin = _align_up(starts_at, step)
+    size = max(0, (ends_at - origin) // step)
+    if size == 0:
+        return []
+
+    busy = await get_free_busy(session, user_ids, origin, ends_at)
+    team_busy = await get_team_busy(session, team_id, origin, ends_at)
+    allowed = working_mask(origin, step, size, work_start, work_end, weekdays_only)
+    return pick_slots(
+        [*busy.values(), team_busy],
+        origin, step, size, duration, count, allowed,
+    )
+
+
+def sweep_overlaps(candidates: Sequence[Interval], busy: Sequence[Interval]) -> list[list[int]]:
+    """Для каждого кандидата — индексы пересекающихся с ним занятых интервалов.
+
+    Один проход по отсортированным границам: O((N + M) log(N + M) + K),
+    где K — число найденных пересечений. Интервалы полуоткрытые, поэтому
+    при равном времени конец обрабатывается раньше начала.
+    """
+    events = []
+    for index, (start, end) in enumerate(candidates):
+        events += [(start, 1, 0, index), (end, 0, 0, index)]
+    for index, (start, end) in enumerate(busy):
+        events += [(start, 1, 1, index), (end, 0, 1, index)]
+    events.sort()
+
+    conflicts: list[list[int]] = [[] for _ in candidates]
+    active: tuple[set[int], set[int]] = (set(), set())
+    for _, is_start, kind, index in events:
+        if not is_start:
+            active[kind].discard(index)
+            continue
+        if kind == 0:
+            conflicts[index].extend(active[1])
+        else:
+            for candidate in active[0]:
+                conflicts[candidate].append(index)
+        active[kind].add(index)
+    return [sorted(found) for found in conflicts]
+
+
+async def check_overlaps(
+    session: AsyncSession,
+    team_id: int,
+    candidates: Sequence[Interval],
+) -> list[tuple[list[int], list[int]]]:
+    """Пересечения кандидатов со встречами команды: (id встреч, id серий) на каждого.
+
+    Встречи берутся одним запросом по диапазону всех кандидатов; вхождения
+    серий за горизонтом материализации id не имеют и отдаются id серии.
+    """
+    if not candidates:
+        return []
+    window_start = min(start for start, _ in candidates)
+    window_end = max(end for _, end in candidates)
+    rows = (await session.execute(
+        select(Meeting.id, Meeting.starts_at, Meeting.ends_at)
+        .where(
+            Meeting.team_id == team_id,
+            Meeting.status == MeetingStatus.scheduled,
+            Meeting.ends_at > window_start,
+            Meeting.starts_at < window_end,
+        )
+    )).all()
+    virtual = await get_virtual_occurrences(session, window_start, window_end, team_id=team_id)
+
+    busy = [(row.starts_at, row.ends_at) for row in rows] + [(m.starts_at, m.ends_at) for m in virtual]
+    result = []
+    for found in sweep_overlaps(candidates, busy):
+        meeting_ids = sorted(rows[i].id for i in found if i < len(rows))
+        series_ids = sorted({virtual[i - len(rows)].series_id for i in found if i >= len(rows)})
+        result.append((meeting_ids, series_ids))
+    return result
@@ -1,8 +1,27 @@
 from sqlalchemy import and_, cast, DateTime, literal
 from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
 from fastapi import HTTPException, status
 
-from src.meetings.models import Meeting, MeetingStatus
+from src.core.dialect import is_postgres
+from src.meetings.availability import find_busy_participants
+from src.meetings.models import Meeting, MeetingStatus, OVERLAP_CONSTRAINT
+from src.meetings.recurrence import get_virtual_occurrences
+
+
+OVERLAP_DETAIL = "Нельзя назначить встречу на пересекающиеся даты"
+PARTICIPANT_OVERLAP_DETAIL = "Участники уже заняты в это время"
+EXCLUSION_VIOLATION = "23P01"
+
+
+def is_overlap_violation(exc: IntegrityError) -> bool:
+    orig = exc.orig
+    code = getattr(orig, "sqlstate", None) or getattr(orig, "pgcode", None)
+    return code == EXCLUSION_VIOLATION or OVERLAP_CONSTRAINT in str(orig)
+
+
+def overlap_conflict() -> HTTPException:
+    return HTTPException(status.HTTP_409_CONFLICT, detail=OVERLAP_DETAIL)
 
 
 async def ensure_no_overlap(
@@ -13,6 +32,16 @@ async def ensure_no_overlap(
     ends_at,
     exclude_meeting_id: int | None = None,
 ) -> None:
+    # Вхождения серий за горизонтом материализации не лежат в meeting,
+    # поэтому проверяются отдельно на любой СУБД.
+    if await get_virtual_occurrences(session, starts_at, ends_at, team_id=team_id):
+        raise overlap_conflict()
+
+    # В Postgres пересечения отсекает ограничение ex_meeting_team_overlap
+    # при commit; SELECT-проверка остаётся только для SQLite.
+    if is_postgres(session):
+        return
+
     conds = [
         Meeting.ends_at > starts_at,
         Meeting.starts_at < ends_at,
@@ -25,4 +54,27 @@ async def ensure_no_overlap(
     q = select(literal(True)).where(and_(*conds)).limit(1)
     exists_ = await session.scalar(q)
     if exists_:
-        raise HTTPException(status.HTTP_409_CONFLICT, detail="Нельзя назначить встречу на пересекающиеся даты")
+        raise overlap_conflict()
+
+
+async def ensure_participants_free(
+    session,
+    *,
+    user_ids,
+    starts_at,
+    ends_at,
+    exclude_meeting_id: int | None = None,
+) -> None:
+    """409 со списком занятых участников, если кто-то из них уже на другой встрече."""
+    busy = await find_busy_participants(session, user_ids, starts_at, ends_at, exclude_meeting_id)
+    if busy:
+        raise HTTPException(
+            status.HTTP_409_CONFLICT,
+            detail={
+                "message": PARTICIPANT_OVERLAP_DETAIL,
+                "conflicts": [
+                    {"user_id": user_id, "meeting_ids": meeting_ids}
+                    for user_id, meeting_ids in busy.items()
+                ],
+            },
+        )
@@ -1,14 +1,81 @@
+from bisect import bisect_left
 from datetime import datetime
+from types import SimpleNamespace
 
 from fastapi import status, HTTPException
-from sqlalchemy import func, select, and_
+from sqlalchemy import delete, func, insert, select, and_, or_
 from sqlalchemy.orm import selectinload
 from sqlalchemy.exc import IntegrityError
 
 from src.users.models import User
-from src.meetings.models import Meeting, MeetingStatus
-from src.meetings.schemas import MeetingCreate, MeetingUpdate
+from src.core.dialect import insert_ignore
+from src.meetings.availability import (
+    ensure_team_members,
+    get_participant_ids,
+    get_team_busy,
+    invalidate_free_busy,
+    merge_intervals,
+)
+from src.meetings.checks.check_time import (
+    ensure_no_overlap,
+    ensure_participants_free,
+    is_overlap_violation,
+    overlap_conflict,
+)
+from src.meetings.models import (
+    Meeting,
+    MeetingSeries,
+    MeetingStatus,
+    meeting_participants,
+)
+from src.core.cache import invalidate_after_commit, team_tag, user_tag
+from src.core.hooks import on_commit
+from src.meetings.feed import invalidate_feeds
+from src.meetings.recurrence import (
+    MATERIALIZE_HORIZON,
+    get_user_series_ids,
+    get_virtual_occurrences,
+    iter_occurrences,
+)
+from src.meetings.schemas import MeetingCreate, MeetingSeriesCreate, MeetingUpdate
 from src.core.dependencies import AsyncSession
+from src.sync.crud import meeting_payload, record_change, record_changes
+
+
+MAX_USER_MEETINGS_LIMIT = 500
+
+
+def _invalidate_calendars(session: AsyncSession, team_id: int | None, user_ids: list[int]) -> None:
+    """Сбросить календари участников, когда текущая транзакция закоммитится."""
+    on_commit(session, lambda: invalidate_free_busy(user_ids))
+    on_commit(session, lambda: invalidate_feeds(user_ids))
+    invalidate_after_commit(session, team_tag(team_id), *map(user_tag, user_ids))
+
+
+async def _insert_participants(session: AsyncSession, meeting: Meeting, user_ids: list[int]) -> None:
+    """Один многострочный INSERT; уже добавленные участники пропускаются."""
+    if user_ids:
+        await session.execute(
+            insert_ignore(session, meeting_participants).values([
+                {
+                    "meeting_id": meeting.id,
+                    "user_id": user_id,
+                    "starts_at": meeting.starts_at,
+                    "ends_at": meeting.ends_at,
+                }
+                for user_id in user_ids
+            ])
+        )
+
+
+async def _series_participant_ids(session: AsyncSession, series_id: int) -> list[int]:
+    stmt = (
+        select(meeting_participants.c.user_id)
+        .join(Meeting, Meeting.id == meeting_participants.c.meeting_id)
+        .where(Meeting.series_id == series_id)
+        .distinct()
+    )
+    return list((await session.scalars(stmt)).all())
 
 
 class MeetingCRUD:
@@ -17,6 +84,7 @@ class MeetingCRUD:
         user: User,
         payload: MeetingCreate,
         session: AsyncSession,
+        check_participants: bool = False,
     ) -> Meeting:
         obj = Meeting(
             team_id=user.team_id,
@@ -36,7 +104,18 @@ class MeetingCRUD:
             )
             if conflict:
                 raise HTTPException(status_code=409, detail="Meeting title already exists for this team")
+            participant_ids = sorted(set(payload.participant_ids))
+            if participant_ids:
+                await ensure_team_members(session, user.team_id, participant_ids)
+            if check_participants and participant_ids:
+                await ensure_participants_free(
+                    session, user_ids=participant_ids, starts_at=obj.starts_at, ends_at=obj.ends_at,
+                )
             session.add(obj)
+            await session.flush()
+            await _insert_participants(session, obj, participant_ids)
+            await record_change(session, obj.team_id, "meeting", obj.id, meeting_payload(obj))
+            _invalidate_calendars(session, obj.team_id, participant_ids)
             await session.commit()
             await session.refresh(obj)
             return obj
@@ -44,6 +123,8 @@ class MeetingCRUD:
             raise
         except IntegrityError as e:
             await session.rollback()
+            if is_overlap_violation(e):
+                raise overlap_conflict() from e
             raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Integrity error") from e
         except Exception:
             await session.rollback()
@@ -77,43 +158,77 @@ class MeetingCRUD:
         starts_after: datetime | None = None,
         ends_before: datetime | None = None,
         limit: int | None = None,
+        after: tuple[datetime, int] | None = None,
     ) -> list[Meeting]:
+        """Встречи пользователя по (starts_at, id); after — курсор последнего элемента страницы."""
         if requester.team_id is None:
             return []
+        limit = min(limit or MAX_USER_MEETINGS_LIMIT, MAX_USER_MEETINGS_LIMIT)
 
-        filters = [
-            Meeting.participants.any(id=requester.id),
-        ]
+        filters = [meeting_participants.c.user_id == requester.id]
         if not include_canceled:
             filters.append(Meeting.status == MeetingStatus.scheduled)
         if starts_after is not None:
             filters.append(Meeting.ends_at >= starts_after)
         if ends_before is not None:
             filters.append(Meeting.starts_at <= ends_before)
+        if after is not None:
+            after_starts_at, after_id = after
+            filters.append(
+                or_(
+                    Meeting.starts_at > after_starts_at,
+                    and_(Meeting.starts_at == after_starts_at, Meeting.id > after_id),
+                )
+            )
 
         stmt = (
             select(Meeting)
-            .where(and_(*filters))
+            .select_from(meeting_participants)
+            .join(Meeting, Meeting.id == meeting_participants.c.meeting_id)
+            .where(*filters)
             .order_by(Meeting.starts_at.asc(), Meeting.id.asc())
+            .limit(limit)
         )
-        if limit is not None:
-            stmt = stmt.limit(limit)
+        meetings = list((await session.scalars(stmt)).all())
 
-        result = await session.scalars(stmt)
-        return result.unique().all()
+        if starts_after is not None and ends_before is not None:
+            series_ids = await get_user_series_ids(session, requester.id)
+            virtual = await get_virtual_occurrences(
+                session, starts_after, ends_before, series_ids=series_ids,
+            )
+            if after is not None:
+                # У виртуальных вхождений нет id, в порядке сортировки он считается нулём.
+                virtual = [m for m in virtual if (m.starts_at, 0) > after]
+            meetings += virtual
+            meetings.sort(key=lambda m: (m.starts_at, m.id or 0))
+            meetings = meetings[:limit]
+        return meetings
 
     @staticmethod
     async def get_team_meetings(
         session: AsyncSession,
         user: User,
+        starts_after: datetime | None = None,
+        ends_before: datetime | None = None,
     ) -> list[Meeting]:
         stmt = (
             select(Meeting)
             .where(Meeting.team_id == user.team_id)
             .order_by(Meeting.starts_at.desc())
         )
+        if starts_after is not None:
+            stmt = stmt.where(Meeting.ends_at >= starts_after)
+        if ends_before is not None:
+            stmt = stmt.where(Meeting.starts_at <= ends_before)
         result = await session.scalars(stmt)
-        return list(result.all())
+        meetings = list(result.all())
+
+        if starts_after is not None and ends_before is not None:
+            meetings += await get_virtual_occurrences(
+                session, starts_after, ends_before, team_id=user.team_id,
+            )
+            meetings.sort(key=lambda m: m.starts_at, reverse=True)
+        return meetings
 
     @staticmethod
     async def get_meeting(
@@ -130,6 +245,7 @@ class MeetingCRUD:
         meeting_id: int,
         payload: MeetingUpdate,
         session: AsyncSession,
+        check_participants: bool = False,
     ) -> Meeting:
         obj = await session.get(Meeting, meeting_id)
         if not obj:
@@ -154,7 +270,26 @@ class MeetingCRUD:
         if "ends_at" in data and data["ends_at"] is not None:
             obj.status = MeetingStatus.canceled
 
+        if obj.status == MeetingStatus.scheduled and ({"starts_at", "ends_at"} & data.keys()):
+            await ensure_no_overlap(
+                session,
+                team_id=obj.team_id,
+                starts_at=obj.starts_at,
+                ends_at=obj.ends_at,
+                exclude_meeting_id=obj.id,
+            )
+
+        participant_ids = await get_participant_ids(session, meeting_id)
+        # копию времени в meeting_participants обновляет after_update модели при flush
+        if {"starts_at", "ends_at"} & data.keys():
+            if check_participants and obj.status == MeetingStatus.scheduled and participant_ids:
+                await ensure_participants_free(
+                    session, user_ids=participant_ids, starts_at=obj.starts_at,
+                    ends_at=obj.ends_at, exclude_meeting_id=obj.id,
+                )
         try:
+            await record_change(session, obj.team_id, "meeting", obj.id, meeting_payload(obj))
+            _invalidate_calendars(session, obj.team_id, participant_ids)
             await session.commit()
             await session.refresh(obj)
             return obj
@@ -162,6 +297,8 @@ class MeetingCRUD:
             raise
         except IntegrityError as e:
             await session.rollback()
+            if is_overlap_violation(e):
+                raise overlap_conflict() from e
             raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Integrity error") from e
         except Exception:
             await session.rollback()
@@ -175,8 +312,11 @@ class MeetingCRUD:
         obj = await session.get(Meeting, meeting_id)
         if not obj:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Meeting not found")
+        participant_ids = await get_participant_ids(session, meeting_id)
         try:
+            await record_change(session, obj.team_id, "meeting", obj.id)
             await session.delete(obj)
+            _invalidate_calendars(session, obj.team_id, participant_ids)
             await session.commit()
         except HTTPException:
             raise
@@ -186,3 +326,241 @@ class MeetingCRUD:
         except Exception:
             await session.rollback()
             raise
+
+    @staticmethod
+    async def _get_team_meeting(meeting_id: int, user: User, session: AsyncSession) -> Meeting:
+        obj = await session.get(Meeting, meeting_id)
+        if obj is None or obj.team_id != user.team_id:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Meeting not found")
+        return obj
+
+    @staticmethod
+    async def add_participants(
+        meeting_id: int,
+        user_ids: list[int],
+        user: User,
+        session: AsyncSession,
+        check_participants: bool = False,
+    ) -> list[int]:
+        obj = await MeetingCRUD._get_team_meeting(meeting_id, user, session)
+        user_ids = sorted(set(user_ids))
+        await ensure_team_members(session, obj.team_id, user_ids)
+        if check_participants and obj.status == MeetingStatus.scheduled:
+            await ensure_participants_free(
+                session, user_ids=user_ids, starts_at=obj.starts_at,
+                ends_at=obj.ends_at, exclude_meeting_id=obj.id,
+            )
+        await _insert_participants(session, obj, user_ids)
+        await record_change(session, obj.team_id, "meeting", obj.id, meeting_payload(obj))
+        _invalidate_calendars(session, obj.team_id, user_ids)
+        await session.commit()
+        return await get_participant_ids(session, obj.id)
+
+    @staticmethod
+    async def remove_participants(
+        meeting_id: int,
+        user_ids: list[int],
+        user: User,
+        session: AsyncSession,
+    ) -> list[int]:
+        obj = await MeetingCRUD._get_team_meeting(meeting_id, user, session)
+        user_ids = sorted(set(user_ids))
+        await session.execute(
+            delete(meeting_participants).where(
+                meeting_participants.c.meeting_id == obj.id,
+                meeting_participants.c.user_id.in_(user_ids),
+            )
+        )
+        await record_change(session, obj.team_id, "meeting", obj.id, meeting_payload(obj))
+        _invalidate_calendars(session, obj.team_id, user_ids)
+        await session.commit()
+        return await get_participant_ids(session, obj.id)
+
+async def _find_busy_occurrences(
+    session: AsyncSession,
+    team_id: int,
+    occurrences: list[tuple[datetime, datetime]],
+    exclude_series_id: int | None = None,
+) -> list[datetime]:
+    """Начала вхождений, пересекающихся со встречами команды (один запрос на диапазон)."""
+    if not occurrences:
+        return []
+    window_start, window_end = occurrences[0][0], occurrences[-1][1]
+    busy = await get_team_busy(session, team_id, window_start, window_end)
+    virtual = await get_virtual_occurrences(session, window_start, window_end, team_id=team_id)
+    busy = merge_intervals(
+        busy + [(m.starts_at, m.ends_at) for m in virtual if m.series_id != exclude_series_id]
+    )
+    busy_starts = [start for start, _ in busy]
+
+    conflicts = []
+    for start, end in occurrences:
+        i = bisect_left(busy_starts, end)
+        if i and busy[i - 1][1] > start:
+            conflicts.append(start)
+    return conflicts
+
+
+def _occurrence_rows(series: MeetingSeries, occurrences: list[tuple[datetime, datetime]]) -> list[dict]:
+    return [
+        {
+            "team_id": series.team_id,
+            "title": series.title,
+            "description": series.description,
+            "starts_at": start,
+            "ends_at": end,
+            "status": MeetingStatus.scheduled,
+            "series_id": series.id,
+        }
+        for start, end in occurrences
+    ]
+
+
+async def _insert_occurrences(
+    session: AsyncSession,
+    series: MeetingSeries,
+    occurrences: list[tuple[datetime, datetime]],
+    participant_ids: list[int] | None = None,
+) -> None:
+    """Вставляет вхождения серии; участники копируются в каждое новое вхождение."""
+    if not occurrences:
+        return
+    rows = _occurrence_rows(series, occurrences)
+    ids = list(await session.scalars(
+        insert(Meeting).returning(Meeting.id, sort_by_parameter_order=True), rows
+    ))
+    if participant_ids:
+        await session.execute(insert(meeting_participants), [
+            {"meeting_id": meeting_id, "user_id": user_id, "starts_at": row["starts_at"], "ends_at": row["ends_at"]}
+            for meeting_id, row in zip(ids, rows)
+            for user_id in participant_ids
+        ])
+    # payload прямо из строки INSERT — без временного ORM-объекта на каждое вхождение
+    await record_changes(session, series.team_id, "meeting", [
+        (meeting_id, meeting_payload(SimpleNamespace(id=meeting_id, **row)))
+        for meeting_id, row in zip(ids, rows)
+    ])
+
+
+class MeetingSeriesCRUD:
+    @staticmethod
+    async def create_series(
+        user: User,
+        payload: MeetingSeriesCreate,
+        session: AsyncSession,
+        now: datetime | None = None,
+    ) -> MeetingSeries:
+        series = MeetingSeries(
+            team_id=user.team_id,
+            title=payload.title,
+            description=payload.description,
+            starts_at=payload.starts_at,
+            ends_at=payload.ends_at,
+            freq=payload.freq,
+            interval=payload.interval,
+            until=payload.until,
+            exdates=[moment.isoformat() for moment in payload.exdates],
+            materialized_until=(now or datetime.now()) + MATERIALIZE_HORIZON,
+        )
+        occurrences = list(iter_occurrences(series, series.starts_at, series.materialized_until))
+        if await _find_busy_occurrences(session, user.team_id, occurrences):
+            raise overlap_conflict()
+        try:
+            session.add(series)
+            await session.flush()
+            await _insert_occurrences(session, series, occurrences)
+            invalidate_after_commit(session, team_tag(series.team_id))
+            await session.commit()
+            await session.refresh(series)
+            return series
+        except HTTPException:
+            raise
+        except IntegrityError as e:
+            await session.rollback()
+            if is_overlap_violation(e):
+                raise overlap_conflict() from e
+            raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Integrity error") from e
+        except Exception:
+            await session.rollback()
+            raise
+
+    @staticmethod
+    async def get_series(series_id: int, user: User, session: AsyncSession) -> MeetingSeries:
+        series = await session.get(MeetingSeries, series_id)
+        if series is None or series.team_id != user.team_id:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Meeting series not found")
+        return series
+
+    @staticmethod
+    async def add_exception(
+        series_id: int,
+        occurrence_start: datetime,
+        user: User,
+        session: AsyncSession,
+    ) -> MeetingSeries:
+        series = await MeetingSeriesCRUD.get_series(series_id, user, session)
+        window_end = occurrence_start + (series.ends_at - series.starts_at)
+        if occurrence_start not in {start for start, _ in iter_occurrences(series, occurrence_start, window_end)}:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Occurrence not found")
+
+        participant_ids = await _series_participant_ids(session, series.id)
+        series.exdates = [*series.exdates, occurrence_start.isoformat()]
+        deleted = await session.scalars(
+            delete(Meeting)
+            .where(
+                Meeting.series_id == series.id,
+                Meeting.starts_at == occurrence_start,
+            )
+            .returning(Meeting.id)
+        )
+        await record_changes(session, series.team_id, "meeting", [(meeting_id, None) for meeting_id in deleted])
+        _invalidate_calendars(session, series.team_id, participant_ids)
+        await session.commit()
+        await session.refresh(series)
+        return series
+
+    @staticmethod
+    async def delete_series(series_id: int, user: User, session: AsyncSession) -> None:
+        series = await MeetingSeriesCRUD.get_series(series_id, user, session)
+        participant_ids = await _series_participant_ids(session, series.id)
+        deleted = await session.scalars(
+            delete(Meeting).where(Meeting.series_id == series.id).returning(Meeting.id)
+        )
+        await record_changes(session, series.team_id, "meeting", [(meeting_id, None) for meeting_id in deleted])
+        await session.delete(series)
+        _invalidate_calendars(session, series.team_id, participant_ids)
+        await session.commit()
+
+    @staticmethod
+    async def extend_horizon(session: AsyncSession, now: datetime | None = None) -> int:
+        """Сдвигает горизонт материализации всех серий; возвращает число новых встреч."""
+        horizon = (now or datetime.now()) + MATERIALIZE_HORIZON
+        pending = (await session.scalars(
+            select(MeetingSeries).where(MeetingSeries.materialized_until < horizon)
+        )).all()
+
+        created = 0
+        for series in pending:
+            occurrences = [
+                (start, end)
+                for start, end in iter_occurrences(series, series.materialized_until, horizon)
+                if start >= series.materialized_until
+            ]
+            # Вхождение, занятое другой встречей, отменяется, а не ломает всю серию.
+            conflicts = set(await _find_busy_occurrences(
+                session, series.team_id, occurrences, exclude_series_id=series.id,
+            ))
+            if conflicts:
+                series.exdates = [*series.exdates, *(start.isoformat() for start in sorted(conflicts))]
+                occurrences = [o for o in occurrences if o[0] not in conflicts]
+            # своей модели участников у серии нет — состав берётся из уже сохранённых вхождений
+            participant_ids = await _series_participant_ids(session, series.id)
+            await _insert_occurrences(session, series, occurrences, participant_ids)
+            _invalidate_calendars(session, series.team_id, participant_ids)
+            series.materialized_until = horizon
+            await session.flush()
+            created += len(occurrences)
+
+        await session.commit()
+        return created
+
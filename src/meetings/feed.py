@@ -0,0 +1,187 @@
+import hashlib
+import hmac
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Iterable, Iterator
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.config import settings
+from src.core.cache import TTLCache
+from src.meetings.models import Meeting, MeetingStatus
+from src.sync.models import ChangeLog
+from src.tasks.models import Status, Task
+from src.users.models import User
+
+
+FEED_PAST = timedelta(days=30)
+FEED_FUTURE = timedelta(days=180)
+# Last-Modified пустого фида без единого изменения.
+EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+# Окно фида сдвигается со временем, поэтому запись всё же живёт ограниченно;
+# при неизменном содержимом ETag остаётся прежним и клиенты получают 304.
+feed_cache = TTLCache("ics_feed", ttl=3600, maxsize=4096)
+
+PRODID = "-//my_busines//calendar feed//RU"
+TODO_STATUS = {
+    Status.open: "NEEDS-ACTION",
+    Status.in_progress: "IN-PROCESS",
+    Status.done: "COMPLETED",
+}
+
+
+@dataclass(frozen=True)
+class FeedEntry:
+    body: bytes
+    etag: str
+    last_modified: datetime
+
+
+def _token_digest(user_id: int) -> str:
+    return hmac.new(settings.secret.encode(), f"ics:{user_id}".encode(), hashlib.sha256).hexdigest()[:32]
+
+
+def feed_token(user_id: int) -> str:
+    return f"{user_id}-{_token_digest(user_id)}"
+
+
+def user_id_from_token(token: str) -> int | None:
+    user_id, _, digest = token.partition("-")
+    if not user_id.isdigit() or not hmac.compare_digest(digest, _token_digest(int(user_id))):
+        return None
+    return int(user_id)
+
+
+def invalidate_feeds(user_ids: Iterable[int | None]) -> None:
+    for user_id in user_ids:
+        if user_id is not None:
+            feed_cache.invalidate(user_id)
+
+
+def _escape(value: str) -> str:
+    return (
+        value.replace("\\", "\\\\").replace(";", "\\;").replace(",", "\\,")
+        .replace("\r\n", "\\n").replace("\n", "\\n")
+    )
+
+
+def _fold(line: str) -> str:
+    """Перенос строк длиннее 75 октетов (RFC 5545, 3.1)."""
+    raw = line.encode()
+    if len(raw) <= 75:
+        return line
+    parts, start = [], 0
+    while start < len(raw):
+        end = min(start + (75 if not parts else 74), len(raw))
+        while end < len(raw) and (raw[end] & 0xC0) == 0x80:
+            end -= 1
+        parts.append(raw[start:end].decode())
+        start = end
+    return "\r\n ".join(parts)
+
+
+def _utc(moment: datetime) -> datetime:
+    """Наивное время в БД — это UTC (встречи, SQLite)."""
+    if moment.tzinfo is None:
+        return moment.replace(tzinfo=timezone.utc)
+    return moment.astimezone(timezone.utc)
+
+
+def _stamp(moment: datetime) -> str:
+    return _utc(moment).strftime("%Y%m%dT%H%M%SZ")
+
+
+def _component(kind: str, props: list[tuple[str, str | None]]) -> str:
+    lines = [f"BEGIN:{kind}"]
+    lines += [_fold(f"{name}:{value}") for name, value in props if value is not None]
+    lines.append(f"END:{kind}")
+    return "\r\n".join(lines) + "\r\n"
+
+
+def render_event(meeting: Meeting) -> str:
+    if meeting.id is not None:
+        uid = f"meeting-{meeting.id}@my-busines"
+    else:
+        uid = f"series-{meeting.series_id}-{_stamp(meeting.starts_at)}@my-busines"
+    return _component("VEVENT", [
+        ("UID", uid),
+        ("DTSTAMP", _stamp(meeting.updated_at or meeting.starts_at)),
+        ("DTSTART", _stamp(meeting.starts_at)),
+        ("DTEND", _stamp(meeting.ends_at)),
+        ("SUMMARY", _escape(meeting.title)),
+        ("DESCRIPTION", _escape(meeting.description) if meeting.description else None),
+        ("STATUS", "CANCELLED" if meeting.status == MeetingStatus.canceled else "CONFIRMED"),
+    ])
+
+
+def render_todo(task) -> str:
+    return _component("VTODO", [
+        ("UID", f"task-{task.id}@my-busines"),
+        ("DTSTAMP", _stamp(task.updated_at or task.deadline_at)),
+        ("DUE", _stamp(task.deadline_at)),
+        ("SUMMARY", _escape(task.name)),
+        ("DESCRIPTION", _escape(task.description) if task.description else None),
+        ("STATUS", TODO_STATUS.get(task.status, "NEEDS-ACTION")),
+    ])
+
+
+def iter_feed(meetings: Iterable[Meeting], tasks: Iterable) -> Iterator[str]:
+    yield f"BEGIN:VCALENDAR\r\nVERSION:2.0\r\nPRODID:{PRODID}\r\nCALSCALE:GREGORIAN\r\n"
+    for meeting in meetings:
+        yield render_event(meeting)
+    for task in tasks:
+        yield render_todo(task)
+    yield "END:VCALENDAR\r\n"
+
+
+async def get_feed(session: AsyncSession, user_id: int, now: datetime | None = None) -> FeedEntry | None:
+    """Фид пользователя из кэша; перестраивается только после invalidate_feeds или истечения TTL."""
+    entry = feed_cache.get((user_id,))
+    if entry is not None:
+        return entry
+
+    user = await session.get(User, user_id)
+    if user is None or not user.is_active:
+        return None
+
+    # crud сам импортирует invalidate_feeds из этого модуля
+    from src.meetings.crud import MAX_USER_MEETINGS_LIMIT, MeetingCRUD
+
+    now = now or datetime.now(timezone.utc).replace(tzinfo=None)
+    # get_user_meetings отдаёт не больше MAX_USER_MEETINGS_LIMIT — листаем курсором
+    meetings, after = [], None
+    while True:
+        page = await MeetingCRUD.get_user_meetings(
+            session, user,
+            include_canceled=True,
+            starts_after=now - FEED_PAST,
+            ends_before=now + FEED_FUTURE,
+            after=after,
+        )
+        meetings += page
+        if len(page) < MAX_USER_MEETINGS_LIMIT:
+            break
+        after = (page[-1].starts_at, page[-1].id or 0)
+    tasks = (await session.execute(
+        select(Task.id, Task.name, Task.description, Task.deadline_at, Task.status, Task.updated_at)
+        .where(Task.assignee_id == user.id, Task.deadline_at.is_not(None))
+        .order_by(Task.deadline_at, Task.id)
+    )).all()
+
+    # удалённое в фиде не видно, но оставляет запись в журнале изменений команды
+    team_ids = {user.team_id, *(meeting.team_id for meeting in meetings)} - {None}
+    logged_at = await session.scalar(
+        select(func.max(ChangeLog.created_at))
+        .where(ChangeLog.team_id.in_(team_ids), ChangeLog.entity.in_(("meeting", "task")))
+    )
+    stamps = [logged_at, *(m.updated_at for m in meetings), *(t.updated_at for t in tasks)]
+
+    body = "".join(iter_feed(meetings, tasks)).encode()
+    entry = FeedEntry(
+        body=body,
+        etag=f'"{hashlib.sha256(body).hexdigest()[:32]}"',
+        last_modified=max((_utc(s) for s in stamps if s is not None), default=EPOCH).replace(microsecond=0),
+    )
+    feed_cache.set((user.id,), entry)
+    return entry
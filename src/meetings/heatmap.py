@@ -0,0 +1,104 @@
+from datetime import date, datetime, time, timedelta
+from typing import Literal
+
+from sqlalchemy import func, literal_column, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.core.dialect import is_postgres
+from src.meetings.models import Meeting, MeetingStatus, meeting_participants
+from src.meetings.recurrence import get_user_series_ids, get_virtual_occurrences
+from src.users.models import User
+
+
+Bucket = Literal["day", "week"]
+Scope = Literal["my", "team"]
+
+BUCKET_STEP = {"day": timedelta(days=1), "week": timedelta(weeks=1)}
+
+
+def bucket_start(day: date, bucket: Bucket) -> date:
+    return day - timedelta(days=day.weekday()) if bucket == "week" else day
+
+
+def _bucket_expr(session: AsyncSession, bucket: Bucket):
+    if is_postgres(session):
+        # Литерал, а не параметр: иначе выражения в SELECT и GROUP BY для Postgres различаются.
+        return func.date_trunc(literal_column(f"'{bucket}'"), Meeting.starts_at)
+    if bucket == "week":
+        # Ближайшее воскресенье не раньше даты минус 6 дней — понедельник, как у date_trunc('week').
+        return func.date(Meeting.starts_at, "weekday 0", "-6 days")
+    return func.strftime("%Y-%m-%d", Meeting.starts_at)
+
+
+def _minutes_expr(session: AsyncSession):
+    if is_postgres(session):
+        return func.extract("epoch", Meeting.ends_at - Meeting.starts_at) / 60
+    return (func.julianday(Meeting.ends_at) - func.julianday(Meeting.starts_at)) * 1440
+
+
+def _as_date(value: date | str) -> date:
+    if isinstance(value, str):
+        return date.fromisoformat(value)
+    if isinstance(value, datetime):
+        return value.date()
+    return value
+
+
+async def get_heatmap(
+    session: AsyncSession,
+    user: User,
+    date_from: date,
+    date_to: date,
+    bucket: Bucket = "day",
+    scope: Scope = "my",
+) -> tuple[date, list[int], list[int]]:
+    """Число встреч и занятые минуты по корзинам [date_from, date_to].
+
+    Встреча относится к корзине своего начала. Возвращает начало первой корзины
+    и плотные списки значений — по элементу на каждую корзину подряд.
+    """
+    first = bucket_start(date_from, bucket)
+    step = BUCKET_STEP[bucket]
+    size = (bucket_start(date_to, bucket) - first) // step + 1
+    counts, minutes = [0] * size, [0] * size
+    if user.team_id is None:
+        return first, counts, minutes
+
+    window_start = datetime.combine(first, time.min)
+    window_end = datetime.combine(first + size * step, time.min)
+    key = _bucket_expr(session, bucket).label("bucket")
+    stmt = (
+        select(key, func.count(), func.coalesce(func.sum(_minutes_expr(session)), 0))
+        .where(
+            Meeting.starts_at >= window_start,
+            Meeting.starts_at < window_end,
+            Meeting.status == MeetingStatus.scheduled,
+        )
+        .group_by(key)
+    )
+    if scope == "team":
+        stmt = stmt.where(Meeting.team_id == user.team_id)
+    else:
+        stmt = (
+            stmt.select_from(meeting_participants)
+            .join(Meeting, Meeting.id == meeting_participants.c.meeting_id)
+            .where(meeting_participants.c.user_id == user.id)
+        )
+
+    for value, count, busy in (await session.execute(stmt)).all():
+        index = (_as_date(value) - first) // step
+        counts[index] += count
+        minutes[index] += round(busy)
+
+    if scope == "team":
+        virtual = await get_virtual_occurrences(session, window_start, window_end, team_id=user.team_id)
+    else:
+        series_ids = await get_user_series_ids(session, user.id)
+        virtual = await get_virtual_occurrences(session, window_start, window_end, series_ids=series_ids)
+    for occurrence in virtual:
+        if window_start <= occurrence.starts_at < window_end:
+            index = (occurrence.starts_at.date() - first) // step
+            counts[index] += 1
+            minutes[index] += round((occurrence.ends_at - occurrence.starts_at).total_seconds() / 60)
+
+    return first, counts, minutes
@@ -3,9 +3,9 @@ from datetime import datetime
 from enum import StrEnum
 
 from sqlalchemy import (
-    ForeignKey, String, Text, Integer, DateTime, Enum, Index,
+    ForeignKey, String, Text, Integer, DateTime, Enum, Index, JSON,
     Table, Column,
-    func,
+    event, func, inspect, literal_column, select, text, update,
 )
 from sqlalchemy.dialects.postgresql import ExcludeConstraint
 from sqlalchemy.orm import (
@@ -19,28 +19,118 @@ from src.teams.models import Team
 from src.users.models import User
 
 
+def _meeting_time(column: str):
+    """Default для копии времени: строки, добавленные через Meeting.participants
+    (админка, ORM), берут его из самой встречи. CRUD передаёт значения явно."""
+    def default(context):
+        meeting = Base.metadata.tables["meeting"]
+        return context.connection.scalar(
+            select(meeting.c[column]).where(meeting.c.id == context.get_current_parameters()["meeting_id"])
+        )
+    return default
+
+
 meeting_participants = Table(
     "meeting_participants",
     Base.metadata,
     Column("meeting_id", ForeignKey("meeting.id", ondelete="CASCADE"), primary_key=True),
     Column("user_id", ForeignKey("user.id", ondelete="CASCADE"), primary_key=True),
-    Index("ix_mp_user", "user_id"),
+    # Копия времени встречи: проверка занятости участника идёт по индексу без join.
+    Column(
+        "starts_at", DateTime, nullable=False, default=_meeting_time("starts_at"),
+        comment="Начало встречи (денормализовано из meeting)",
+    ),
+    Column(
+        "ends_at", DateTime, nullable=False, default=_meeting_time("ends_at"),
+        comment="Окончание встречи (денормализовано из meeting)",
+    ),
+    Index("ix_mp_user_meeting", "user_id", "meeting_id"),
+    Index(
+        "ix_mp_user_period",
+        "user_id",
+        func.tsrange(literal_column("starts_at"), literal_column("ends_at")),
+        postgresql_using="gist",
+    ).ddl_if(dialect="postgresql"),
+    Index("ix_mp_user_ends_at", "user_id", "ends_at").ddl_if(dialect="sqlite"),
 )
 
 
+OVERLAP_CONSTRAINT = "ex_meeting_team_overlap"
+
+
 class MeetingStatus(StrEnum):
     scheduled = "scheduled"
     canceled  = "canceled"
 
 
+class RecurrenceFreq(StrEnum):
+    daily = "daily"
+    weekly = "weekly"
+    monthly = "monthly"
+
+
+class MeetingSeries(Base, TimestampMixin):
+    team_id: Mapped[int] = mapped_column(
+        ForeignKey("team.id", ondelete="CASCADE"), index=True,
+        comment="ID команды — владельца серии встреч",
+    )
+    title: Mapped[str] = mapped_column(
+        String(255),
+        comment="Заголовок встреч серии",
+    )
+    description: Mapped[str | None] = mapped_column(
+        Text(),
+        comment="Описание/повестка встреч серии (опционально)",
+    )
+    starts_at: Mapped[datetime] = mapped_column(
+        DateTime,
+        comment="Начало первого вхождения",
+    )
+    ends_at: Mapped[datetime] = mapped_column(
+        DateTime,
+        comment="Окончание первого вхождения",
+    )
+    freq: Mapped[RecurrenceFreq] = mapped_column(
+        Enum(RecurrenceFreq), nullable=False,
+        comment="Периодичность: daily / weekly / monthly",
+    )
+    interval: Mapped[int] = mapped_column(
+        Integer, default=1, nullable=False,
+        comment="Шаг повторения в единицах freq",
+    )
+    until: Mapped[datetime | None] = mapped_column(
+        DateTime,
+        comment="Последний допустимый момент начала вхождения (опционально)",
+    )
+    exdates: Mapped[list[str]] = mapped_column(
+        JSON, default=list, nullable=False,
+        comment="Отменённые вхождения (ISO-время начала)",
+    )
+    materialized_until: Mapped[datetime] = mapped_column(
+        DateTime,
+        comment="Вхождения, начинающиеся раньше этого момента, сохранены в meeting",
+    )
+
+
 class Meeting(Base, TimestampMixin):
+    __table_args__ = (
+        Index("ix_meeting_starts_at_id", "starts_at", "id"),
+        ExcludeConstraint(
+            ("team_id", "="),
+            (func.tsrange(literal_column("starts_at"), literal_column("ends_at")), "&&"),
+            name=OVERLAP_CONSTRAINT,
+            using="gist",
+            where=text("status = 'scheduled'"),
+        ).ddl_if(dialect="postgresql"),
+    )
+
     team_id: Mapped[int] = mapped_column(
         ForeignKey("team.id", ondelete="CASCADE"), index=True,
         comment="ID команды — владельца встречи",
     )
     team: Mapped[Team] = relationship(
         backref=backref(
-            "meetings", cascade="all, delete-orphan", lazy="selectin",
+            "meetings", cascade="all, delete-orphan",
             doc="Список встреч команды",
         ),
         doc="Команда, в рамках которой проводится встреча",
@@ -54,7 +144,7 @@ class Meeting(Base, TimestampMixin):
         comment="Описание/повестка встречи (опционально)",
     )
     starts_at: Mapped[datetime] = mapped_column(
-        DateTime, index=True,
+        DateTime,
         comment="Дата и время начала (с таймзоной)",
     )
     ends_at:   Mapped[datetime] = mapped_column(
@@ -65,14 +155,28 @@ class Meeting(Base, TimestampMixin):
         Enum(MeetingStatus), default=MeetingStatus.scheduled, nullable=False,
         comment="Текущий статус встречи",
     )
+    series_id: Mapped[int | None] = mapped_column(
+        ForeignKey("meetingseries.id", ondelete="CASCADE"), index=True,
+        comment="ID серии, если встреча — материализованное вхождение",
+    )
     participants: Mapped[list[User]] = relationship(
         "User",
         secondary=meeting_participants,
-        lazy="selectin",
         backref=backref(
-            "meetings", lazy="selectin",
-
+            "meetings",
             doc="Встречи, в которых участвует пользователь",
         ),
         doc="Участники встречи (многие-ко-многим)",
     )
+
+
+@event.listens_for(Meeting, "after_update")
+def _sync_participant_period(mapper, connection, target):
+    """Время, изменённое через ORM, сразу переносится в копию у участников."""
+    attrs = inspect(target).attrs
+    if attrs.starts_at.history.has_changes() or attrs.ends_at.history.has_changes():
+        connection.execute(
+            update(meeting_participants)
+            .where(meeting_participants.c.meeting_id == target.id)
+            .values(starts_at=target.starts_at, ends_at=target.ends_at)
+        )
@@ -0,0 +1,121 @@
+import calendar
+from datetime import datetime, timedelta
+from typing import Iterator
+
+from sqlalchemy import or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.meetings.models import Meeting, MeetingSeries, MeetingStatus, RecurrenceFreq, meeting_participants
+
+
+Interval = tuple[datetime, datetime]
+
+MATERIALIZE_HORIZON = timedelta(days=90)
+MAX_OCCURRENCE_DURATION = timedelta(days=1)
+
+
+def _add_months(moment: datetime, months: int) -> datetime:
+    index = moment.month - 1 + months
+    year, month = moment.year + index // 12, index % 12 + 1
+    day = min(moment.day, calendar.monthrange(year, month)[1])
+    return moment.replace(year=year, month=month, day=day)
+
+
+def _nth_start(series: MeetingSeries, n: int) -> datetime:
+    steps = n * series.interval
+    if series.freq == RecurrenceFreq.daily:
+        return series.starts_at + timedelta(days=steps)
+    if series.freq == RecurrenceFreq.weekly:
+        return series.starts_at + timedelta(weeks=steps)
+    return _add_months(series.starts_at, steps)
+
+
+def _first_index(series: MeetingSeries, moment: datetime) -> int:
+    """Номер вхождения, с которого имеет смысл начинать перебор до moment."""
+    if moment <= series.starts_at:
+        return 0
+    if series.freq == RecurrenceFreq.monthly:
+        months = (moment.year - series.starts_at.year) * 12 + moment.month - series.starts_at.month
+        return max(0, months // series.interval - 1)
+    period = timedelta(days=1 if series.freq == RecurrenceFreq.daily else 7) * series.interval
+    return max(0, (moment - series.starts_at) // period - 1)
+
+
+def iter_occurrences(
+    series: MeetingSeries,
+    window_start: datetime,
+    window_end: datetime,
+) -> Iterator[Interval]:
+    """Лениво перечисляет вхождения серии, пересекающие [window_start, window_end)."""
+    duration = series.ends_at - series.starts_at
+    skipped = {datetime.fromisoformat(value) for value in series.exdates or ()}
+    n = _first_index(series, window_start - duration)
+    while True:
+        start = _nth_start(series, n)
+        if start >= window_end or (series.until is not None and start > series.until):
+            return
+        if start + duration > window_start and start not in skipped:
+            yield start, start + duration
+        n += 1
+
+
+def occurrence_meeting(series: MeetingSeries, start: datetime, end: datetime) -> Meeting:
+    return Meeting(
+        team_id=series.team_id,
+        title=series.title,
+        description=series.description,
+        starts_at=start,
+        ends_at=end,
+        status=MeetingStatus.scheduled,
+        series_id=series.id,
+    )
+
+
+async def get_user_series_ids(session: AsyncSession, user_id: int) -> list[int]:
+    """Серии, в материализованных встречах которых участвует пользователь."""
+    stmt = (
+        select(Meeting.series_id)
+        .join(meeting_participants, meeting_participants.c.meeting_id == Meeting.id)
+        .where(
+            meeting_participants.c.user_id == user_id,
+            Meeting.series_id.is_not(None),
+        )
+        .distinct()
+    )
+    return list((await session.scalars(stmt)).all())
+
+
+async def get_virtual_occurrences(
+    session: AsyncSession,
+    window_start: datetime,
+    window_end: datetime,
+    team_id: int | None = None,
+    series_ids: list[int] | None = None,
+) -> list[Meeting]:
+    """Вхождения серий за горизонтом материализации, попадающие в окно.
+
+    Ближние вхождения уже лежат в meeting и попадают под ограничение
+    ex_meeting_team_overlap; здесь разворачивается только хвост серий.
+    """
+    stmt = select(MeetingSeries).where(
+        MeetingSeries.materialized_until < window_end,
+        MeetingSeries.starts_at < window_end,
+        or_(
+            MeetingSeries.until.is_(None),
+            MeetingSeries.until >= window_start - MAX_OCCURRENCE_DURATION,
+        ),
+    )
+    if team_id is not None:
+        stmt = stmt.where(MeetingSeries.team_id == team_id)
+    if series_ids is not None:
+        if not series_ids:
+            return []
+        stmt = stmt.where(MeetingSeries.id.in_(series_ids))
+
+    occurrences: list[Meeting] = []
+    for series in (await session.scalars(stmt)).all():
+        tail_start = max(window_start, series.materialized_until)
+        for start, end in iter_occurrences(series, tail_start, window_end):
+            if start >= series.materialized_until:
+                occurrences.append(occurrence_meeting(series, start, end))
+    return occurrences
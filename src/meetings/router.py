@@ -1,18 +1,44 @@
-from datetime import datetime
+from datetime import date, datetime, timedelta
+from email.utils import format_datetime, parsedate_to_datetime
 from typing import List
 
-from fastapi import APIRouter, Depends, Query, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
 
 from .validators import _validate_times
 from src.core.dependencies import CurrentUser, SessionDep
+from src.core.cache import cached, team_tag, user_tag
+from src.core.singleflight import team_scope
 from src.evaluations.permissions import forbid_employee
 from src.users.models import User
+from src.meetings.availability import check_overlaps, ensure_team_members, get_free_busy, suggest_slots
 from src.meetings.checks.check_time import ensure_no_overlap
-from src.meetings.crud import MeetingCRUD
-from src.meetings.schemas import MeetingCreate, MeetingUpdate, MeetingOut
+from src.meetings.crud import MAX_USER_MEETINGS_LIMIT, MeetingCRUD, MeetingSeriesCRUD
+from src.meetings.feed import feed_token, get_feed, user_id_from_token
+from src.meetings.heatmap import Bucket, Scope, get_heatmap
+from src.meetings.recurrence import MAX_OCCURRENCE_DURATION
+from src.meetings.schemas import (
+    FreeBusyRequest,
+    MeetingCreate,
+    MeetingHeatmap,
+    MeetingParticipantsIn,
+    MeetingParticipantsOut,
+    MeetingSeriesCreate,
+    MeetingSeriesOut,
+    MeetingUpdate,
+    MeetingOut,
+    OverlapCheckRequest,
+    OverlapCheckResult,
+    SeriesExceptionCreate,
+    SlotSuggestRequest,
+    TimeSlot,
+    UserFreeBusy,
+)
 
 
 crud = MeetingCRUD()
+series_crud = MeetingSeriesCRUD()
+MAX_AVAILABILITY_RANGE = timedelta(days=62)
+MAX_HEATMAP_RANGE = timedelta(days=366)
 meetings_router = APIRouter(prefix="/meetings", tags=["meetings"])
 
 
@@ -21,6 +47,9 @@ async def create_meeting(
     payload: MeetingCreate,
     session: SessionDep,
     current_user: User = Depends(forbid_employee),
+    check_participants: bool = Query(
+        False, description="Отклонить с 409, если кто-то из участников занят на другой встрече (в любой команде)"
+    ),
 ):
     await _validate_times(payload.starts_at, payload.ends_at)
 
@@ -35,10 +64,85 @@ async def create_meeting(
         user=current_user,
         payload=payload,
         session=session,
+        check_participants=check_participants,
     )
     return meeting
 
 
+@meetings_router.post("/freebusy", response_model=List[UserFreeBusy])
+async def get_free_busy_intervals(
+    payload: FreeBusyRequest,
+    session: SessionDep,
+    current_user: User = Depends(forbid_employee),
+):
+    await _validate_times(payload.starts_at, payload.ends_at)
+    if payload.ends_at - payload.starts_at > MAX_AVAILABILITY_RANGE:
+        raise HTTPException(status_code=400, detail="Range is too long")
+    await ensure_team_members(session, current_user.team_id, payload.user_ids)
+
+    busy = await get_free_busy(session, payload.user_ids, payload.starts_at, payload.ends_at)
+    return [
+        UserFreeBusy(
+            user_id=user_id,
+            busy=[{"starts_at": start, "ends_at": end} for start, end in intervals],
+        )
+        for user_id, intervals in busy.items()
+    ]
+
+
+@meetings_router.post("/check-overlaps", response_model=List[OverlapCheckResult])
+async def check_meeting_overlaps(
+    payload: OverlapCheckRequest,
+    session: SessionDep,
+    current_user: User = Depends(forbid_employee),
+):
+    for slot in payload.slots:
+        await _validate_times(slot.starts_at, slot.ends_at)
+    candidates = [(slot.starts_at, slot.ends_at) for slot in payload.slots]
+    if max(end for _, end in candidates) - min(start for start, _ in candidates) > MAX_AVAILABILITY_RANGE:
+        raise HTTPException(status_code=400, detail="Range is too long")
+
+    results = await check_overlaps(session, current_user.team_id, candidates)
+    return [
+        OverlapCheckResult(
+            starts_at=start, ends_at=end,
+            conflict=bool(meeting_ids or series_ids),
+            meeting_ids=meeting_ids, series_ids=series_ids,
+        )
+        for (start, end), (meeting_ids, series_ids) in zip(candidates, results)
+    ]
+
+
+@meetings_router.post("/suggest-slots", response_model=List[TimeSlot])
+async def suggest_meeting_slots(
+    payload: SlotSuggestRequest,
+    session: SessionDep,
+    current_user: User = Depends(forbid_employee),
+):
+    await _validate_times(payload.starts_at, payload.ends_at)
+    if payload.ends_at - payload.starts_at > MAX_AVAILABILITY_RANGE:
+        raise HTTPException(status_code=400, detail="Range is too long")
+    if payload.work_end <= payload.work_start:
+        raise HTTPException(status_code=400, detail="work_end must be after work_start")
+    await ensure_team_members(session, current_user.team_id, payload.user_ids)
+
+    slots = await suggest_slots(
+        session,
+        team_id=current_user.team_id,
+        user_ids=payload.user_ids,
+        starts_at=payload.starts_at,
+        ends_at=payload.ends_at,
+        duration=timedelta(minutes=payload.duration_minutes),
+        count=payload.count,
+        step=timedelta(minutes=payload.granularity_minutes),
+        work_start=payload.work_start,
+        work_end=payload.work_end,
+        weekdays_only=payload.weekdays_only,
+    )
+    return [TimeSlot(starts_at=start, ends_at=end) for start, end in slots]
+
+
+# Не кэшируется: верхняя граница выборки — текущий момент.
 @meetings_router.get("/by-date", response_model=List[MeetingOut])
 async def get_meetings_by_date(
     session: SessionDep,
@@ -55,6 +159,7 @@ async def get_meetings_by_date(
 
 
 @meetings_router.get("/my", response_model=List[MeetingOut])
+@cached("meetings.my", List[MeetingOut], tags=lambda kw, _: [user_tag(kw["current_user"].id)])
 async def get_user_meetings(
     session: SessionDep,
     current_user: CurrentUser,
@@ -65,12 +170,23 @@ async def get_user_meetings(
         None, description="Filter meetings starting after this time"
     ),
     ends_before: datetime | None = Query(
-        None, description="Filter meetings ending before this time"
+        None, description="Filter meetings ending before this time; "
+        "with starts_after also expands recurring series in the window"
+    ),
+    limit: int = Query(
+        MAX_USER_MEETINGS_LIMIT, ge=1, le=MAX_USER_MEETINGS_LIMIT,
+        description="Limit the number of results",
+    ),
+    after_starts_at: datetime | None = Query(
+        None, description="Cursor: starts_at of the last meeting on the previous page"
     ),
-    limit: int | None = Query(
-        None, description="Limit the number of results"
+    after_id: int | None = Query(
+        None, description="Cursor: id of the last meeting on the previous page (0 for a recurring occurrence)"
     ),
 ):
+    after = None
+    if after_starts_at is not None and after_id is not None:
+        after = (after_starts_at, after_id)
     list_meetings = await crud.get_user_meetings(
         session=session,
         requester=current_user,
@@ -78,25 +194,147 @@ async def get_user_meetings(
         starts_after=starts_after,
         ends_before=ends_before,
         limit=limit,
+        after=after,
     )
 
     return list_meetings
 
 
 @meetings_router.get("/team", response_model=List[MeetingOut])
+@cached(
+    "meetings.team", List[MeetingOut], scope=team_scope,
+    tags=lambda kw, _: [team_tag(kw["current_user"].team_id)],
+)
 async def get_team_meetings(
     session: SessionDep,
     current_user: User = Depends(forbid_employee),
+    starts_after: datetime | None = Query(
+        None, description="Filter meetings ending after this time"
+    ),
+    ends_before: datetime | None = Query(
+        None, description="Filter meetings starting before this time; "
+        "with starts_after also expands recurring series in the window"
+    ),
 ):
     meetings = await crud.get_team_meetings(
         session=session,
         user=current_user,
+        starts_after=starts_after,
+        ends_before=ends_before,
     )
 
     return meetings
 
 
+@meetings_router.get("/heatmap", response_model=MeetingHeatmap)
+@cached(
+    "meetings.heatmap", MeetingHeatmap,
+    tags=lambda kw, _: [user_tag(kw["current_user"].id), team_tag(kw["current_user"].team_id)],
+)
+async def get_meetings_heatmap(
+    session: SessionDep,
+    current_user: CurrentUser,
+    date_from: date = Query(..., alias="from", description="Первый день, ГГГГ-ММ-ДД"),
+    date_to: date = Query(..., alias="to", description="Последний день включительно"),
+    bucket: Bucket = Query("day", description="Размер корзины: day или week (с понедельника)"),
+    scope: Scope = Query("my", description="my — встречи пользователя, team — вся команда"),
+):
+    if date_to < date_from:
+        raise HTTPException(status_code=400, detail="to must not be before from")
+    if date_to - date_from > MAX_HEATMAP_RANGE:
+        raise HTTPException(status_code=400, detail="Range is too long")
+    if scope == "team":
+        await forbid_employee(current_user)
+
+    starts, counts, busy_minutes = await get_heatmap(
+        session, current_user, date_from, date_to, bucket=bucket, scope=scope,
+    )
+    return {"bucket": bucket, "starts": starts, "counts": counts, "busy_minutes": busy_minutes}
+
+
+@meetings_router.post("/series", response_model=MeetingSeriesOut, status_code=status.HTTP_201_CREATED)
+async def create_meeting_series(
+    payload: MeetingSeriesCreate,
+    session: SessionDep,
+    current_user: User = Depends(forbid_employee),
+):
+    await _validate_times(payload.starts_at, payload.ends_at)
+    if payload.ends_at - payload.starts_at > MAX_OCCURRENCE_DURATION:
+        raise HTTPException(status_code=400, detail="Occurrence must not be longer than a day")
+
+    return await series_crud.create_series(
+        user=current_user,
+        payload=payload,
+        session=session,
+    )
+
+
+@meetings_router.post("/series/{series_id}/exceptions", response_model=MeetingSeriesOut)
+async def add_meeting_series_exception(
+    series_id: int,
+    payload: SeriesExceptionCreate,
+    session: SessionDep,
+    current_user: User = Depends(forbid_employee),
+):
+    return await series_crud.add_exception(
+        series_id=series_id,
+        occurrence_start=payload.starts_at,
+        user=current_user,
+        session=session,
+    )
+
+
+@meetings_router.delete("/series/{series_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def delete_meeting_series(
+    series_id: int,
+    session: SessionDep,
+    current_user: User = Depends(forbid_employee),
+):
+    await series_crud.delete_series(
+        series_id=series_id,
+        user=current_user,
+        session=session,
+    )
+
+
+@meetings_router.get("/feed")
+async def get_feed_url(request: Request, current_user: CurrentUser):
+    """Адрес персонального .ics-фида для подписки в календаре."""
+    return {"url": str(request.url_for("get_calendar_feed", token=feed_token(current_user.id)))}
+
+
+def _not_modified(request: Request, etag: str, last_modified: datetime) -> bool:
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        return etag in {tag.strip() for tag in if_none_match.split(",")} or if_none_match.strip() == "*"
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since:
+        try:
+            return last_modified <= parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+    return False
+
+
+@meetings_router.get("/feed/{token}.ics", name="get_calendar_feed")
+async def get_calendar_feed(token: str, request: Request, session: SessionDep):
+    user_id = user_id_from_token(token)
+    entry = await get_feed(session, user_id) if user_id is not None else None
+    if entry is None:
+        raise HTTPException(status_code=404, detail="Feed not found")
+
+    headers = {
+        "ETag": entry.etag,
+        "Last-Modified": format_datetime(entry.last_modified, usegmt=True),
+        "Cache-Control": "private, no-cache",
+    }
+    if _not_modified(request, entry.etag, entry.last_modified):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return Response(content=entry.body, media_type="text/calendar; charset=utf-8", headers=headers)
+
+
 @meetings_router.get("/{meeting_id}", response_model=MeetingOut)
+@cached("meetings.get", MeetingOut, tags=lambda _, meeting: [team_tag(meeting.team_id)])
 async def get_meeting(
     meeting_id: int,
     session: SessionDep,
@@ -113,6 +351,9 @@ async def update_meeting(
     payload: MeetingUpdate,
     session: SessionDep,
     current_user: User = Depends(forbid_employee),
+    check_participants: bool = Query(
+        False, description="Отклонить с 409, если кто-то из участников занят на другой встрече (в любой команде)"
+    ),
 ):
     await _validate_times(payload.starts_at, payload.ends_at)
 
@@ -120,6 +361,7 @@ async def update_meeting(
         meeting_id=meeting_id,
         payload=payload,
         session=session,
+        check_participants=check_participants,
     )
     return obj
 
@@ -134,3 +376,39 @@ async def delete_meeting(
         meeting_id=meeting_id,
         session=session,
     )
+
+
+@meetings_router.put("/{meeting_id}/participants", response_model=MeetingParticipantsOut)
+async def add_meeting_participants(
+    meeting_id: int,
+    payload: MeetingParticipantsIn,
+    session: SessionDep,
+    current_user: User = Depends(forbid_employee),
+    check_participants: bool = Query(
+        False, description="Отклонить с 409, если кто-то из участников занят на другой встрече (в любой команде)"
+    ),
+):
+    participant_ids = await crud.add_participants(
+        meeting_id=meeting_id,
+        user_ids=payload.user_ids,
+        user=current_user,
+        session=session,
+        check_participants=check_participants,
+    )
+    return MeetingParticipantsOut(meeting_id=meeting_id, participant_ids=participant_ids)
+
+
+@meetings_router.delete("/{meeting_id}/participants", response_model=MeetingParticipantsOut)
+async def remove_meeting_participants(
+    meeting_id: int,
+    payload: MeetingParticipantsIn,
+    session: SessionDep,
+    current_user: User = Depends(forbid_employee),
+):
+    participant_ids = await crud.remove_participants(
+        meeting_id=meeting_id,
+        user_ids=payload.user_ids,
+        user=current_user,
+        session=session,
+    )
+    return MeetingParticipantsOut(meeting_id=meeting_id, participant_ids=participant_ids)
@@ -1,6 +1,23 @@
-from datetime import datetime, date
-from typing import Optional
-from pydantic import BaseModel, ConfigDict
+from datetime import datetime, date, time, timezone
+from typing import Annotated, Literal, Optional
+from pydantic import AfterValidator, BaseModel, ConfigDict, Field
+
+from src.meetings.models import RecurrenceFreq
+
+
+# Строк на один многострочный INSERT: 2 параметра на строку, с запасом до лимита драйверов.
+MAX_PARTICIPANTS = 5000
+
+
+def _naive_utc(value: datetime) -> datetime:
+    """Время встреч хранится без таймзоны; "...Z" и смещения приводим к нему через UTC."""
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+
+# Для запросов, которые сравнивают время с meeting.starts_at/ends_at.
+NaiveDatetime = Annotated[datetime, AfterValidator(_naive_utc)]
 
 
 class MeetingCreate(BaseModel):
@@ -8,6 +25,7 @@ class MeetingCreate(BaseModel):
     description: str | None
     starts_at: datetime
     ends_at: datetime | None
+    participant_ids: list[int] = Field(default_factory=list, max_length=MAX_PARTICIPANTS)
 
 
 class MeetingUpdate(BaseModel):
@@ -20,6 +38,7 @@ class MeetingUpdate(BaseModel):
 class MeetingOut(BaseModel):
     model_config = ConfigDict(from_attributes=True)
 
+    id: int | None = None
     team_id: int
     title: str
     description: Optional[str] = None
@@ -28,5 +47,99 @@ class MeetingOut(BaseModel):
     status: str
 
 
+class MeetingParticipantsIn(BaseModel):
+    user_ids: list[int] = Field(..., min_length=1, max_length=MAX_PARTICIPANTS)
+
+
+class MeetingParticipantsOut(BaseModel):
+    meeting_id: int
+    participant_ids: list[int]
+
+
+class MeetingSeriesCreate(BaseModel):
+    title: str
+    description: str | None = None
+    starts_at: datetime
+    ends_at: datetime
+    freq: RecurrenceFreq
+    interval: int = Field(1, ge=1, le=52)
+    until: datetime | None = None
+    exdates: list[datetime] = Field(default_factory=list)
+
+
+class MeetingSeriesOut(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    id: int
+    team_id: int
+    title: str
+    description: Optional[str] = None
+    starts_at: datetime
+    ends_at: datetime
+    freq: RecurrenceFreq
+    interval: int
+    until: Optional[datetime] = None
+    exdates: list[str]
+    materialized_until: datetime
+
+
+class SeriesExceptionCreate(BaseModel):
+    starts_at: datetime
+
+
 class DateQuery(BaseModel):
     date: date
+
+
+class FreeBusyRequest(BaseModel):
+    user_ids: list[int] = Field(..., min_length=1, max_length=200)
+    starts_at: NaiveDatetime
+    ends_at: NaiveDatetime
+
+
+class BusyInterval(BaseModel):
+    starts_at: datetime
+    ends_at: datetime
+
+
+class TimeSlot(BaseModel):
+    starts_at: NaiveDatetime
+    ends_at: NaiveDatetime
+
+
+class OverlapCheckRequest(BaseModel):
+    slots: list[TimeSlot] = Field(..., min_length=1, max_length=200)
+
+
+class OverlapCheckResult(BaseModel):
+    starts_at: datetime
+    ends_at: datetime
+    conflict: bool
+    meeting_ids: list[int]
+    series_ids: list[int] = Field(default_factory=list, description="Серии, чьи вхождения за горизонтом пересекаются со слотом")
+
+
+class UserFreeBusy(BaseModel):
+    user_id: int
+    busy: list[BusyInterval]
+
+
+class MeetingHeatmap(BaseModel):
+    """Колоночный ответ: i-й элемент списков относится к корзине starts + i * bucket."""
+    bucket: Literal["day", "week"]
+    starts: date
+    counts: list[int]
+    busy_minutes: list[int]
+
+
+class SlotSuggestRequest(BaseModel):
+    user_ids: list[int] = Field(..., min_length=1, max_length=200)
+    starts_at: NaiveDatetime
+    ends_at: NaiveDatetime
+    duration_minutes: int = Field(..., ge=5, le=8 * 60)
+    count: int = Field(5, ge=1, le=50)
+    granularity_minutes: Literal[5, 15] = 15
+    work_start: time = time(9, 0)
+    work_end: time = time(18, 0)
+    weekdays_only: bool = True
+
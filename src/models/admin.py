@@ -2,7 +2,7 @@ from sqladmin import ModelView
 
 from src.users.models import User
 from src.evaluations.models import Evaluation
-from src.meetings.models import Meeting
+from src.meetings.models import Meeting, MeetingSeries
 from src.tasks.models import Task, TaskComment
 from src.teams.models import Team
 
@@ -16,6 +16,9 @@ class EvaluationAdmin(ModelView, model=Evaluation):
 class MeetingAdmin(ModelView, model=Meeting):
     column_list = [Meeting.id]
 
+class MeetingSeriesAdmin(ModelView, model=MeetingSeries):
+    column_list = [MeetingSeries.id]
+
 class TaskAdmin(ModelView, model=Task):
     column_list = [Task.id]
 
@@ -0,0 +1,109 @@
+import random
+from datetime import datetime, timedelta, timezone
+from typing import Any, Sequence
+
+from sqlalchemy import delete, func, insert, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.config import settings
+from src.core.dialect import is_postgres, lock_for_update
+from src.outbox.models import OutboxMessage, OutboxStatus
+
+
+def utcnow() -> datetime:
+    """Время outbox хранится в UTC без таймзоны — одинаково на Postgres и SQLite."""
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+def backoff(attempts: int, base: float, cap: float) -> timedelta:
+    """Экспоненциальная задержка с полным джиттером."""
+    return timedelta(seconds=random.uniform(0, min(cap, base * 2 ** attempts)))
+
+
+async def enqueue(
+    session: AsyncSession,
+    team_id: int,
+    events: Sequence[dict[str, Any]],
+    endpoints: Sequence[str] | None = None,
+) -> None:
+    """Кладёт события в outbox в текущей транзакции — по строке на событие и получателя."""
+    endpoints = settings.outbox.webhooks if endpoints is None else endpoints
+    if not endpoints or not events:
+        return
+    now = utcnow()
+    await session.execute(insert(OutboxMessage), [
+        {
+            "endpoint": endpoint,
+            "team_id": team_id,
+            "event": {"team_id": team_id, **event},
+            "status": OutboxStatus.pending,
+            "attempts": 0,
+            "next_attempt_at": now,
+        }
+        for endpoint in endpoints
+        for event in events
+    ])
+
+
+class OutboxCRUD:
+    @staticmethod
+    async def claim(session: AsyncSession, limit: int, lease: timedelta, now: datetime | None = None) -> list:
+        """Выдаёт пачку готовых к отправке сообщений и сдвигает их на время аренды.
+
+        На Postgres строки берутся через FOR UPDATE SKIP LOCKED, на SQLite — под
+        BEGIN IMMEDIATE, поэтому несколько диспетчеров делят очередь без пересечений. Если диспетчер
+        упадёт, сообщения снова станут видны по истечении аренды.
+        """
+        now = now or utcnow()
+        stmt = (
+            select(OutboxMessage.id, OutboxMessage.endpoint, OutboxMessage.event, OutboxMessage.attempts)
+            .where(OutboxMessage.status == OutboxStatus.pending, OutboxMessage.next_attempt_at <= now)
+            .order_by(OutboxMessage.id)
+            .limit(limit)
+        )
+        if is_postgres(session):
+            stmt = stmt.with_for_update(skip_locked=True)
+        else:
+            await lock_for_update(session)
+        rows = (await session.execute(stmt)).all()
+        if rows:
+            await session.execute(
+                update(OutboxMessage)
+                .where(OutboxMessage.id.in_([row.id for row in rows]))
+                .values(next_attempt_at=now + lease)
+            )
+        await session.commit()
+        return rows
+
+    @staticmethod
+    async def complete(session: AsyncSession, delivered: list[int], failed: list[tuple[int, int, str]],
+                       max_attempts: int, base: float, cap: float) -> int:
+        """Удаляет доставленные сообщения и переносит неудачные; возвращает число «мёртвых»."""
+        if delivered:
+            await session.execute(delete(OutboxMessage).where(OutboxMessage.id.in_(delivered)))
+        now, dead = utcnow(), 0
+        rows = []
+        for message_id, attempts, error in failed:
+            attempts += 1
+            exhausted = attempts >= max_attempts
+            dead += exhausted
+            rows.append({
+                "id": message_id,
+                "attempts": attempts,
+                "status": OutboxStatus.dead if exhausted else OutboxStatus.pending,
+                "next_attempt_at": now + backoff(attempts, base, cap),
+                "last_error": error[:1000],
+            })
+        if rows:
+            await session.execute(update(OutboxMessage), rows)
+        await session.commit()
+        return dead
+
+    @staticmethod
+    async def stats(session: AsyncSession) -> dict[str, int]:
+        rows = (await session.execute(
+            select(OutboxMessage.status, func.count()).group_by(OutboxMessage.status)
+        )).all()
+        counts = {str(status): 0 for status in OutboxStatus}
+        counts.update({str(status): count for status, count in rows})
+        return counts
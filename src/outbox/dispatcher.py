@@ -0,0 +1,153 @@
+import asyncio
+import logging
+import time
+from collections import defaultdict
+from dataclasses import asdict, dataclass, field
+from datetime import timedelta
+from typing import Any
+
+import httpx
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from src.config import OutboxConfig
+from src.outbox.crud import OutboxCRUD
+from src.sync.crud import change_listeners
+
+
+log = logging.getLogger(__name__)
+
+
+@dataclass
+class OutboxMetrics:
+    batches: int = 0
+    requests: int = 0
+    delivered: int = 0
+    failed: int = 0
+    dead: int = 0
+    request_seconds: float = 0.0
+    by_endpoint: dict[str, dict[str, int]] = field(default_factory=lambda: defaultdict(lambda: {"delivered": 0, "failed": 0}))
+
+    def as_dict(self) -> dict[str, Any]:
+        data = asdict(self)
+        data["by_endpoint"] = {url: dict(counts) for url, counts in self.by_endpoint.items()}
+        return data
+
+
+metrics = OutboxMetrics()
+
+
+class OutboxDispatcher:
+    """Разбирает outbox пачками и рассылает события по вебхукам.
+
+    Для каждого получателя пачка режется на запросы по events_per_request
+    событий; одновременно к одному получателю идёт не больше
+    concurrency_per_endpoint запросов через общий пул соединений httpx.
+    """
+
+    def __init__(
+        self,
+        session_factory: async_sessionmaker[AsyncSession],
+        config: OutboxConfig,
+        client: httpx.AsyncClient | None = None,
+    ):
+        self.session_factory = session_factory
+        self.config = config
+        self.client = client or httpx.AsyncClient(
+            timeout=config.request_timeout_seconds,
+            limits=httpx.Limits(
+                max_connections=config.concurrency_per_endpoint * max(1, len(config.webhooks)),
+                max_keepalive_connections=config.concurrency_per_endpoint * max(1, len(config.webhooks)),
+            ),
+        )
+        self._limits: dict[str, asyncio.Semaphore] = defaultdict(
+            lambda: asyncio.Semaphore(config.concurrency_per_endpoint)
+        )
+        self._wakeup = asyncio.Event()
+        self._task: asyncio.Task | None = None
+
+    def on_changes(self, team_id: int, events: list[dict[str, Any]]) -> None:
+        self._wakeup.set()
+
+    async def _post(self, endpoint: str, rows: list) -> tuple[list[int], list[tuple[int, int, str]]]:
+        body = {"events": [{"outbox_id": row.id, **row.event} for row in rows]}
+        async with self._limits[endpoint]:
+            started = time.perf_counter()
+            try:
+                response = await self.client.post(endpoint, json=body)
+                response.raise_for_status()
+                error = None
+            except httpx.HTTPError as e:
+                error = f"{type(e).__name__}: {e}"
+            finally:
+                metrics.requests += 1
+                metrics.request_seconds += time.perf_counter() - started
+        counts = metrics.by_endpoint[endpoint]
+        if error is None:
+            counts["delivered"] += len(rows)
+            return [row.id for row in rows], []
+        counts["failed"] += len(rows)
+        log.warning("outbox delivery to %s failed: %s", endpoint, error)
+        return [], [(row.id, row.attempts, error) for row in rows]
+
+    async def dispatch_once(self) -> int:
+        """Одна пачка: выдать, разослать, отметить результат. Возвращает размер пачки."""
+        config = self.config
+        async with self.session_factory() as session:
+            rows = await OutboxCRUD.claim(session, config.batch_size, timedelta(seconds=config.lease_seconds))
+        if not rows:
+            return 0
+
+        by_endpoint: dict[str, list] = defaultdict(list)
+        for row in rows:
+            by_endpoint[row.endpoint].append(row)
+        step = config.events_per_request
+        results = await asyncio.gather(*(
+            self._post(endpoint, chunk[i:i + step])
+            for endpoint, chunk in by_endpoint.items()
+            for i in range(0, len(chunk), step)
+        ))
+        delivered = [message_id for ok, _ in results for message_id in ok]
+        failed = [item for _, bad in results for item in bad]
+
+        async with self.session_factory() as session:
+            dead = await OutboxCRUD.complete(
+                session, delivered, failed,
+                config.max_attempts, config.backoff_base_seconds, config.backoff_max_seconds,
+            )
+        metrics.batches += 1
+        metrics.delivered += len(delivered)
+        metrics.failed += len(failed)
+        metrics.dead += dead
+        return len(rows)
+
+    async def run(self) -> None:
+        while True:
+            try:
+                self._wakeup.clear()
+                if await self.dispatch_once() == self.config.batch_size:
+                    continue
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), self.config.poll_seconds)
+                except asyncio.TimeoutError:
+                    pass
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                log.exception("outbox dispatch failed")
+                await asyncio.sleep(self.config.poll_seconds)
+
+    def start(self) -> None:
+        change_listeners.append(self.on_changes)
+        self._task = asyncio.get_running_loop().create_task(self.run())
+
+    async def stop(self) -> None:
+        if self.on_changes in change_listeners:
+            change_listeners.remove(self.on_changes)
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self.client.aclose()
@@ -0,0 +1,50 @@
+from datetime import datetime
+from enum import StrEnum
+
+from sqlalchemy import JSON, DateTime, Enum, Index, Integer, String, Text, func
+from sqlalchemy.orm import Mapped, mapped_column
+
+from src.models.base import Base
+
+
+class OutboxStatus(StrEnum):
+    pending = "pending"
+    dead = "dead"
+
+
+class OutboxMessage(Base):
+    __table_args__ = (
+        Index("ix_outboxmessage_status_next_attempt", "status", "next_attempt_at", "id"),
+    )
+
+    endpoint: Mapped[str] = mapped_column(
+        String(2048), nullable=False,
+        comment="URL вебхука-получателя",
+    )
+    team_id: Mapped[int] = mapped_column(
+        Integer, nullable=False,
+        comment="ID команды, к которой относится событие",
+    )
+    event: Mapped[dict] = mapped_column(
+        JSON, nullable=False,
+        comment="Тело события: entity, id, op, data",
+    )
+    status: Mapped[OutboxStatus] = mapped_column(
+        Enum(OutboxStatus), nullable=False, default=OutboxStatus.pending,
+        comment="pending — ждёт доставки, dead — попытки исчерпаны",
+    )
+    attempts: Mapped[int] = mapped_column(
+        Integer, nullable=False, default=0,
+        comment="Число неудачных попыток доставки",
+    )
+    next_attempt_at: Mapped[datetime] = mapped_column(
+        DateTime, nullable=False,
+        comment="Когда можно пробовать снова (UTC); при выдаче воркеру сдвигается на время аренды",
+    )
+    last_error: Mapped[str | None] = mapped_column(
+        Text,
+        comment="Последняя ошибка доставки",
+    )
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(),
+    )
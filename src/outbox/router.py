@@ -0,0 +1,14 @@
+from fastapi import APIRouter
+
+from src.core.dependencies import CurrentSuperUser, SessionDep
+from src.outbox.crud import OutboxCRUD
+from src.outbox.dispatcher import metrics
+
+
+outbox_router = APIRouter(prefix="/outbox", tags=["outbox"])
+
+
+@outbox_router.get("/metrics")
+async def get_outbox_metrics(session: SessionDep, _: CurrentSuperUser):
+    """Счётчики доставки этого процесса и размер очереди в БД."""
+    return {"queue": await OutboxCRUD.stats(session), "dispatcher": metrics.as_dict()}
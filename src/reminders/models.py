@@ -0,0 +1,31 @@
+from datetime import datetime
+
+from sqlalchemy import DateTime, Integer, String, UniqueConstraint, func
+from sqlalchemy.orm import Mapped, mapped_column
+
+from src.models.base import Base
+
+
+class ReminderLog(Base):
+    """Отправленные напоминания: строка вставляется до отправки, поэтому
+    перезапуск или смена лидера не шлют одно напоминание повторно."""
+
+    __table_args__ = (
+        UniqueConstraint("kind", "entity_id", "due_at"),
+    )
+
+    kind: Mapped[str] = mapped_column(
+        String(16), nullable=False,
+        comment="task или meeting",
+    )
+    entity_id: Mapped[int] = mapped_column(
+        Integer, nullable=False,
+        comment="ID задачи или встречи (без FK: запись переживает удаление)",
+    )
+    due_at: Mapped[datetime] = mapped_column(
+        DateTime, nullable=False, index=True,
+        comment="Срок, о котором напомнили; перенос срока даёт новое напоминание",
+    )
+    sent_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(),
+    )
@@ -0,0 +1,403 @@
+import asyncio
+import heapq
+import logging
+import os
+from dataclasses import replace
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Iterable
+
+from sqlalchemy import delete, func, select
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine, AsyncSession, async_sessionmaker
+
+from src.config import RemindersConfig
+from src.core.dialect import insert_ignore
+from src.meetings.models import Meeting, MeetingStatus, meeting_participants
+from src.reminders.models import ReminderLog
+from src.reminders.schemas import Reminder, ReminderKind
+from src.reminders.sinks import ReminderSink, make_sink
+from src.sync.crud import change_listeners
+from src.tasks.models import Status, Task
+from src.users.models import User
+
+try:
+    import fcntl
+except ImportError:  # Windows: SQLite-режим там считается однопроцессным
+    fcntl = None
+
+
+log = logging.getLogger(__name__)
+
+# Ключ сессионной advisory-блокировки лидера (pg_try_advisory_lock(bigint)).
+REMINDER_LEADER_LOCK = 3802
+# Сколько хранить записи reminderlog после срока.
+LOG_RETENTION = timedelta(days=2)
+# Запас при перечитывании изменённых строк: now() в Postgres — время начала
+# транзакции, и строка может стать видимой позже, чем прошла прошлая загрузка.
+CHANGE_OVERLAP = timedelta(seconds=30)
+
+
+def _naive_utc(moment: datetime) -> datetime:
+    """Дедлайны задач хранятся с таймзоной, встречи — наивным UTC; сравниваем в наивном UTC."""
+    return moment.astimezone(timezone.utc).replace(tzinfo=None) if moment.tzinfo else moment
+
+
+def utc_now() -> datetime:
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+class LeaderLock:
+    """Лидер — воркер, удерживающий advisory-блокировку на отдельном соединении.
+
+    Блокировка сессионная: при падении воркера соединение рвётся и лидерство
+    переходит к следующему. На SQLite то же даёт flock на файле рядом с базой:
+    его снимает ядро, когда процесс умирает.
+    """
+
+    def __init__(self, engine: AsyncEngine, key: int = REMINDER_LEADER_LOCK):
+        self.engine = engine
+        self.key = key
+        self._conn: AsyncConnection | None = None
+        self._fd: int | None = None
+
+    def _acquire_file(self) -> bool:
+        database = self.engine.url.database
+        if fcntl is None or not database or database == ":memory:":
+            return True
+        if self._fd is None:
+            self._fd = os.open(f"{database}.reminders.lock", os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            fcntl.flock(self._fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            return False
+        return True
+
+    async def acquire(self) -> bool:
+        if self.engine.dialect.name == "sqlite":
+            return self._acquire_file()
+        if self.engine.dialect.name != "postgresql":
+            return True
+        if self._conn is not None:
+            try:
+                await self._conn.execute(select(1))
+                return True
+            except Exception:
+                log.warning("reminder leader connection lost")
+                await self.release()
+        conn = await self.engine.connect()
+        conn = await conn.execution_options(isolation_level="AUTOCOMMIT")
+        if await conn.scalar(select(func.pg_try_advisory_lock(self.key))):
+            self._conn = conn
+            return True
+        await conn.close()
+        return False
+
+    async def release(self) -> None:
+        fd, self._fd = self._fd, None
+        if fd is not None:
+            os.close(fd)
+        conn, self._conn = self._conn, None
+        if conn is None:
+            return
+        try:
+            await conn.execute(select(func.pg_advisory_unlock(self.key)))
+        except Exception:
+            pass
+        await conn.close()
+
+
+class ReminderScheduler:
+    """Напоминания о дедлайнах задач и начале встреч.
+
+    В памяти лежит только скользящее окно ближайших срабатываний (min-heap).
+    Окно догружается по индексам task.deadline_at и meeting.starts_at
+    срезами [уже загружено, now + lookahead + lead); записи CRUD в этом
+    процессе правят кучу сразу через change_listeners, а изменённые другими
+    воркерами строки уже загруженной части окна перечитываются по updated_at
+    при каждой загрузке. Перед отправкой
+    напоминание перепроверяется по БД — на случай правок в других воркерах —
+    и записывается в reminderlog: после перезапуска или смены лидера окно
+    загружается заново, но отправленное не уходит второй раз.
+    """
+
+    def __init__(
+        self,
+        session_factory: async_sessionmaker[AsyncSession],
+        sink: ReminderSink,
+        *,
+        leads: dict[ReminderKind, timedelta],
+        lookahead: timedelta = timedelta(hours=1),
+        refresh: timedelta = timedelta(minutes=1),
+        leader: LeaderLock | None = None,
+        clock: Callable[[], datetime] = utc_now,
+    ):
+        self.session_factory = session_factory
+        self.sink = sink
+        self.leads = leads
+        self.lookahead = lookahead
+        self.refresh = refresh
+        self.leader = leader
+        self.clock = clock
+        self.is_leader = leader is None
+        self.sent = 0
+        self._heap: list[tuple[datetime, str, int]] = []
+        self._pending: dict[tuple[str, int], Reminder] = {}
+        self._scanned: dict[str, datetime] = {}
+        self._changed_since: datetime | None = None
+        self._next_load: datetime | None = None
+        self._wakeup = asyncio.Event()
+        self._task: asyncio.Task | None = None
+
+    @classmethod
+    def from_config(cls, config: RemindersConfig, engine: AsyncEngine,
+                    session_factory: async_sessionmaker[AsyncSession]) -> "ReminderScheduler":
+        return cls(
+            session_factory,
+            make_sink(config),
+            leads={
+                "meeting": timedelta(minutes=config.meeting_lead_minutes),
+                "task": timedelta(minutes=config.task_lead_minutes),
+            },
+            lookahead=timedelta(minutes=config.lookahead_minutes),
+            refresh=timedelta(seconds=config.refresh_seconds),
+            leader=LeaderLock(engine),
+        )
+
+    def __len__(self) -> int:
+        return len(self._pending)
+
+    def _push(self, reminder: Reminder) -> None:
+        self._pending[(reminder.kind, reminder.entity_id)] = reminder
+        heapq.heappush(self._heap, (reminder.fire_at, reminder.kind, reminder.entity_id))
+        self._wakeup.set()
+
+    def _reset(self) -> None:
+        self._heap.clear()
+        self._pending.clear()
+        self._scanned.clear()
+        self._changed_since = None
+        self._next_load = None
+
+    def _reminder(self, kind: ReminderKind, entity_id: int, team_id: int, title: str, due_at: datetime) -> Reminder:
+        due_at = _naive_utc(due_at)
+        return Reminder(kind, entity_id, team_id, title, due_at, due_at - self.leads[kind])
+
+    async def _fetch(
+        self,
+        session: AsyncSession,
+        kind: ReminderKind,
+        *,
+        due_from: datetime | None = None,
+        due_to: datetime | None = None,
+        ids: Iterable[int] | None = None,
+        changed_since: datetime | None = None,
+    ) -> list[Reminder]:
+        model = Meeting if kind == "meeting" else Task
+        if kind == "meeting":
+            due = Meeting.starts_at
+            stmt = select(Meeting.id, Meeting.team_id, Meeting.title, due).where(
+                Meeting.status == MeetingStatus.scheduled,
+            )
+        else:
+            due = Task.deadline_at
+            stmt = select(Task.id, Task.team_id, Task.name, due).where(
+                Task.status != Status.done, due.is_not(None),
+            )
+            # колонка с таймзоной: наивная граница для asyncpg была бы местным временем
+            due_from = due_from and due_from.replace(tzinfo=timezone.utc)
+            due_to = due_to and due_to.replace(tzinfo=timezone.utc)
+        entity_id = model.id
+        if changed_since is not None:
+            stmt = stmt.where(model.updated_at >= changed_since)
+        if ids is not None:
+            stmt = stmt.where(entity_id.in_(list(ids)))
+        else:
+            stmt = stmt.where(due >= due_from, due < due_to)
+        return [self._reminder(kind, *row) for row in (await session.execute(stmt)).all()]
+
+    async def _recipients(self, session: AsyncSession, kind: ReminderKind, ids: list[int]) -> dict[int, list[str]]:
+        if kind == "meeting":
+            mp = meeting_participants
+            stmt = (
+                select(mp.c.meeting_id, User.email)
+                .join(User, User.id == mp.c.user_id)
+                .where(mp.c.meeting_id.in_(ids))
+            )
+        else:
+            stmt = select(Task.id, User.email).join(User, User.id == Task.assignee_id).where(Task.id.in_(ids))
+        recipients: dict[int, list[str]] = {}
+        for entity_id, email in (await session.execute(stmt)).all():
+            recipients.setdefault(entity_id, []).append(email)
+        return recipients
+
+    async def load(self, now: datetime) -> int:
+        """Догружает в кучу срез окна, ещё не просмотренный для каждого вида напоминаний,
+        и перечитывает строки просмотренной части, изменённые с прошлой загрузки."""
+        loaded = 0
+        async with self.session_factory() as session:
+            # время БД, а не self.clock: updated_at ставит сервер
+            loaded_at = await session.scalar(select(func.now()))
+            for kind, lead in self.leads.items():
+                due_from = self._scanned.get(kind, now)
+                if self._changed_since is not None and due_from > now:
+                    for reminder in await self._fetch(
+                        session, kind, due_from=now, due_to=due_from, changed_since=self._changed_since,
+                    ):
+                        self._push(reminder)
+                        loaded += 1
+                due_to = now + self.lookahead + lead
+                if due_to <= due_from:
+                    continue
+                for reminder in await self._fetch(session, kind, due_from=due_from, due_to=due_to):
+                    self._push(reminder)
+                    loaded += 1
+                self._scanned[kind] = due_to
+            await session.execute(delete(ReminderLog).where(ReminderLog.due_at < now - LOG_RETENTION))
+            await session.commit()
+        self._changed_since = loaded_at - CHANGE_OVERLAP
+        return loaded
+
+    @staticmethod
+    async def _claim(session: AsyncSession, reminders: list[Reminder]) -> set[tuple[str, int]]:
+        """Записывает напоминания в журнал; возвращает те, что ещё не отправлялись."""
+        if not reminders:
+            return set()
+        table = ReminderLog.__table__
+        rows = await session.execute(
+            insert_ignore(session, table)
+            .values([{"kind": r.kind, "entity_id": r.entity_id, "due_at": r.due_at} for r in reminders])
+            .returning(table.c.kind, table.c.entity_id)
+        )
+        claimed = {(row.kind, row.entity_id) for row in rows}
+        await session.commit()
+        return claimed
+
+    @staticmethod
+    async def _unclaim(session: AsyncSession, reminder: Reminder) -> None:
+        """Отправка не удалась — пусть следующая загрузка окна попробует снова."""
+        await session.execute(delete(ReminderLog).where(
+            ReminderLog.kind == reminder.kind,
+            ReminderLog.entity_id == reminder.entity_id,
+            ReminderLog.due_at == reminder.due_at,
+        ))
+        await session.commit()
+
+    def on_changes(self, team_id: int, events: list[dict[str, Any]]) -> None:
+        """Слушатель закоммиченных изменений: правит кучу без обращения к БД."""
+        if not self.is_leader:
+            return
+        for event in events:
+            kind = event["entity"]
+            if kind not in self.leads:
+                continue
+            self._pending.pop((kind, event["id"]), None)
+            data = event["data"]
+            if data is None:
+                continue
+            if kind == "meeting":
+                if data["status"] != MeetingStatus.scheduled:
+                    continue
+                reminder = self._reminder(kind, data["id"], data["team_id"], data["title"],
+                                          datetime.fromisoformat(data["starts_at"]))
+            else:
+                if data["status"] == Status.done or not data["deadline_at"]:
+                    continue
+                reminder = self._reminder(kind, data["id"], data["team_id"], data["name"],
+                                          datetime.fromisoformat(data["deadline_at"]))
+            # За пределами загруженного окна напоминание подхватит очередной load.
+            scanned = self._scanned.get(kind)
+            if scanned is not None and reminder.due_at < scanned:
+                self._push(reminder)
+
+    async def fire_due(self, now: datetime) -> int:
+        due: list[Reminder] = []
+        while self._heap and self._heap[0][0] <= now:
+            fire_at, kind, entity_id = heapq.heappop(self._heap)
+            reminder = self._pending.get((kind, entity_id))
+            # Устаревшая запись кучи: напоминание удалено или перенесено.
+            if reminder is None or reminder.fire_at != fire_at:
+                continue
+            del self._pending[(kind, entity_id)]
+            due.append(reminder)
+        if not due:
+            return 0
+
+        sent = 0
+        async with self.session_factory() as session:
+            for kind in self.leads:
+                batch = {r.entity_id: r for r in due if r.kind == kind}
+                if not batch:
+                    continue
+                current = {r.entity_id: r for r in await self._fetch(session, kind, ids=batch)}
+                recipients = await self._recipients(session, kind, list(batch))
+                ready = []
+                for entity_id, reminder in batch.items():
+                    fresh = current.get(entity_id)
+                    if fresh is None:
+                        continue
+                    if fresh.due_at != reminder.due_at:
+                        if fresh.fire_at > now and fresh.due_at < self._scanned.get(kind, fresh.due_at):
+                            self._push(fresh)
+                        continue
+                    ready.append(fresh)
+                claimed = await self._claim(session, ready)
+                for fresh in ready:
+                    if (kind, fresh.entity_id) not in claimed:
+                        continue
+                    try:
+                        await self.sink.send(replace(fresh, recipients=tuple(recipients.get(fresh.entity_id, ()))))
+                        sent += 1
+                    except Exception:
+                        log.exception("reminder delivery failed: %s %s", kind, fresh.entity_id)
+                        await self._unclaim(session, fresh)
+        self.sent += sent
+        return sent
+
+    async def tick(self) -> datetime | None:
+        """Один шаг цикла; возвращает момент, когда нужен следующий, или None без лидерства."""
+        if self.leader is not None:
+            leader = await self.leader.acquire()
+            if leader and not self.is_leader:
+                self._reset()
+            self.is_leader = leader
+            if not leader:
+                return None
+        now = self.clock()
+        if self._next_load is None or now >= self._next_load:
+            await self.load(now)
+            self._next_load = now + self.refresh
+        await self.fire_due(now)
+        return min(self._next_load, self._heap[0][0]) if self._heap else self._next_load
+
+    async def run(self) -> None:
+        while True:
+            try:
+                self._wakeup.clear()
+                next_at = await self.tick()
+                delay = self.refresh if next_at is None else max(next_at - self.clock(), timedelta(0))
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), delay.total_seconds())
+                except asyncio.TimeoutError:
+                    pass
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                log.exception("reminder scheduler step failed")
+                await asyncio.sleep(self.refresh.total_seconds())
+
+    def start(self) -> None:
+        change_listeners.append(self.on_changes)
+        self._task = asyncio.get_running_loop().create_task(self.run())
+
+    async def stop(self) -> None:
+        if self.on_changes in change_listeners:
+            change_listeners.remove(self.on_changes)
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self.leader is not None:
+            await self.leader.release()
+        await self.sink.close()
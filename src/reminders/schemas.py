@@ -0,0 +1,27 @@
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Literal
+
+
+ReminderKind = Literal["task", "meeting"]
+
+
+@dataclass(frozen=True)
+class Reminder:
+    kind: ReminderKind
+    entity_id: int
+    team_id: int
+    title: str
+    due_at: datetime
+    fire_at: datetime
+    recipients: tuple[str, ...] = field(default=(), compare=False)
+
+    def as_json(self) -> dict[str, Any]:
+        return {
+            "kind": self.kind,
+            "id": self.entity_id,
+            "team_id": self.team_id,
+            "title": self.title,
+            "due_at": self.due_at.isoformat(),
+            "recipients": list(self.recipients),
+        }
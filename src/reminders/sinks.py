@@ -0,0 +1,79 @@
+import asyncio
+import logging
+import smtplib
+from email.message import EmailMessage
+from typing import Protocol
+
+import httpx
+
+from src.config import RemindersConfig
+from src.reminders.schemas import Reminder
+
+
+log = logging.getLogger(__name__)
+
+
+class ReminderSink(Protocol):
+    async def send(self, reminder: Reminder) -> None: ...
+
+    async def close(self) -> None: ...
+
+
+class LogSink:
+    async def send(self, reminder: Reminder) -> None:
+        log.info(
+            "reminder: %s %s %r due %s -> %s",
+            reminder.kind, reminder.entity_id, reminder.title,
+            reminder.due_at.isoformat(), ", ".join(reminder.recipients) or "-",
+        )
+
+    async def close(self) -> None:
+        pass
+
+
+class SmtpSink:
+    """Письмо через SMTP без авторизации — для локальной заглушки вроде `python -m aiosmtpd -n`."""
+
+    def __init__(self, host: str, port: int, sender: str):
+        self.host = host
+        self.port = port
+        self.sender = sender
+
+    def _send(self, reminder: Reminder) -> None:
+        message = EmailMessage()
+        message["From"] = self.sender
+        message["To"] = ", ".join(reminder.recipients)
+        message["Subject"] = f"Напоминание: {reminder.title}"
+        message.set_content(f"{reminder.title}\n{reminder.due_at:%d.%m.%Y %H:%M}")
+        with smtplib.SMTP(self.host, self.port, timeout=10) as smtp:
+            smtp.send_message(message)
+
+    async def send(self, reminder: Reminder) -> None:
+        if reminder.recipients:
+            await asyncio.to_thread(self._send, reminder)
+
+    async def close(self) -> None:
+        pass
+
+
+class WebhookSink:
+    def __init__(self, url: str, timeout: float = 10.0):
+        self.url = url
+        self._client = httpx.AsyncClient(timeout=timeout)
+
+    async def send(self, reminder: Reminder) -> None:
+        response = await self._client.post(self.url, json=reminder.as_json())
+        response.raise_for_status()
+
+    async def close(self) -> None:
+        await self._client.aclose()
+
+
+def make_sink(config: RemindersConfig) -> ReminderSink:
+    if config.sink == "smtp":
+        return SmtpSink(config.smtp_host, config.smtp_port, config.smtp_from)
+    if config.sink == "webhook":
+        if not config.webhook_url:
+            raise ValueError("reminders.webhook_url is required for the webhook sink")
+        return WebhookSink(config.webhook_url)
+    return LogSink()
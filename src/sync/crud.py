@@ -0,0 +1,210 @@
+from typing import Any, Callable, Iterable
+
+from fastapi import HTTPException, status
+from sqlalchemy import delete, func, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.core.dialect import is_postgres
+from src.core.hooks import on_commit, transaction_info
+from src.events.hub import hub
+from src.outbox.crud import enqueue
+from src.sync.models import ChangeLog, ChangeOp
+from src.teams.models import Team
+
+
+SYNC_PAGE_LIMIT = 1000
+# Пространство имён advisory-блокировок журнала (pg_advisory_xact_lock(int, int)).
+CHANGE_LOG_LOCK = 3801
+
+# Внутрипроцессные получатели закоммиченных изменений: (team_id, events).
+change_listeners: list[Callable[[int, list[dict[str, Any]]], None]] = [hub.publish]
+
+
+def task_payload(task) -> dict[str, Any]:
+    return {
+        "id": task.id,
+        "team_id": task.team_id,
+        "name": task.name,
+        "description": task.description,
+        "deadline_at": task.deadline_at.isoformat() if task.deadline_at else None,
+        "status": task.status.value if task.status else None,
+        "author_id": task.author_id,
+        "assignee_id": task.assignee_id,
+    }
+
+
+def meeting_payload(meeting) -> dict[str, Any]:
+    return {
+        "id": meeting.id,
+        "team_id": meeting.team_id,
+        "title": meeting.title,
+        "description": meeting.description,
+        "starts_at": meeting.starts_at.isoformat(),
+        "ends_at": meeting.ends_at.isoformat(),
+        "status": str(meeting.status),
+        "series_id": meeting.series_id,
+    }
+
+
+def evaluation_payload(evaluation) -> dict[str, Any]:
+    return {
+        "id": evaluation.id,
+        "task_id": evaluation.task_id,
+        "value": evaluation.value,
+        "rated_at": evaluation.rated_at.isoformat(),
+    }
+
+
+def comment_payload(comment) -> dict[str, Any]:
+    return {
+        "id": comment.id,
+        "task_id": comment.task_id,
+        "author_id": comment.author_id,
+        "body": comment.body,
+    }
+
+
+def team_payload(team) -> dict[str, Any]:
+    return {
+        "id": team.id,
+        "name": team.name,
+        "owner_id": team.owner_id,
+    }
+
+
+def membership_payload(user) -> dict[str, Any]:
+    return {
+        "user_id": user.id,
+        "team_id": user.team_id,
+        "role": user.role_in_team.value if user.role_in_team else None,
+    }
+
+
+async def _lock_team_log(session: AsyncSession, team_id: int) -> None:
+    """Сериализует запись журнала одной команды до конца транзакции.
+
+    Без этого на Postgres id из последовательности может стать видимым раньше
+    меньшего id соседней транзакции, и клиент проскочит изменение курсором.
+    """
+    if not is_postgres(session):
+        return
+    locked = transaction_info(session).setdefault("change_log_locks", set())
+    if team_id not in locked:
+        await session.execute(select(func.pg_advisory_xact_lock(CHANGE_LOG_LOCK, team_id)))
+        locked.add(team_id)
+
+
+async def record_changes(
+    session: AsyncSession,
+    team_id: int | None,
+    entity: str,
+    changes: Iterable[tuple[int, dict[str, Any] | None]],
+) -> None:
+    """Пишет изменения в журнал и outbox в текущей транзакции; payload None — удаление.
+
+    Снимок команды догоняет журнал сам при следующем чтении.
+    После commit те же изменения уходят подписчикам /events/stream.
+    """
+    rows = [
+        {
+            "team_id": team_id,
+            "entity": entity,
+            "entity_id": entity_id,
+            "op": ChangeOp.upsert if payload is not None else ChangeOp.delete,
+            "payload": payload,
+        }
+        for entity_id, payload in changes
+    ]
+    if team_id is None or not rows:
+        return
+    await _lock_team_log(session, team_id)
+    await session.execute(insert(ChangeLog), rows)
+    events = [
+        {"entity": entity, "id": row["entity_id"], "op": row["op"], "data": row["payload"]}
+        for row in rows
+    ]
+    await enqueue(session, team_id, events)
+    on_commit(session, lambda: _notify(team_id, events))
+
+
+def _notify(team_id: int, events: list[dict[str, Any]]) -> None:
+    for listener in change_listeners:
+        listener(team_id, events)
+
+
+async def record_change(
+    session: AsyncSession,
+    team_id: int | None,
+    entity: str,
+    entity_id: int,
+    payload: dict[str, Any] | None = None,
+) -> None:
+    await record_changes(session, team_id, entity, [(entity_id, payload)])
+
+
+def encode_cursor(team_id: int, change_id: int) -> str:
+    return f"{team_id}.{change_id}"
+
+
+def decode_cursor(cursor: str, team_id: int) -> int:
+    cursor_team, _, change_id = cursor.partition(".")
+    if not change_id.isdigit() or cursor_team != str(team_id):
+        # Курсор чужой команды или испорчен — клиенту нужна полная перезагрузка.
+        raise HTTPException(status_code=status.HTTP_410_GONE, detail="Cursor is not valid, resync required")
+    return int(change_id)
+
+
+class SyncCRUD:
+    @staticmethod
+    async def get_changes(
+        session: AsyncSession,
+        team_id: int,
+        since: str | None,
+        limit: int = SYNC_PAGE_LIMIT,
+    ) -> tuple[str, bool, list[dict[str, Any]]]:
+        if since is None:
+            head = await session.scalar(
+                select(func.max(ChangeLog.id)).where(ChangeLog.team_id == team_id)
+            )
+            return encode_cursor(team_id, head or 0), False, []
+
+        after = decode_cursor(since, team_id)
+        rows = (await session.execute(
+            select(ChangeLog.id, ChangeLog.entity, ChangeLog.entity_id, ChangeLog.op, ChangeLog.payload)
+            .where(ChangeLog.team_id == team_id, ChangeLog.id > after)
+            .order_by(ChangeLog.id)
+            .limit(limit + 1)
+        )).all()
+        has_more = len(rows) > limit
+        rows = rows[:limit]
+        if not rows:
+            return since, False, []
+
+        # Внутри страницы достаточно последнего состояния каждой сущности.
+        latest: dict[tuple[str, int], Any] = {}
+        for row in rows:
+            latest.pop((row.entity, row.entity_id), None)
+            latest[(row.entity, row.entity_id)] = row
+        changes = [
+            {"entity": row.entity, "id": row.entity_id, "op": row.op, "data": row.payload}
+            for row in latest.values()
+        ]
+        return encode_cursor(team_id, rows[-1].id), has_more, changes
+
+    @staticmethod
+    async def compact(session: AsyncSession) -> int:
+        """Удаляет перекрытые записи и журналы удалённых команд; возвращает число удалённых строк.
+
+        Для каждой сущности остаётся последняя запись (снимок или надгробие),
+        поэтому клиент с любым старым курсором по-прежнему получает итоговое состояние.
+        """
+        latest = (
+            select(func.max(ChangeLog.id))
+            .group_by(ChangeLog.team_id, ChangeLog.entity, ChangeLog.entity_id)
+        )
+        superseded = await session.execute(delete(ChangeLog).where(ChangeLog.id.not_in(latest)))
+        orphaned = await session.execute(
+            delete(ChangeLog).where(ChangeLog.team_id.not_in(select(Team.id)))
+        )
+        await session.commit()
+        return superseded.rowcount + orphaned.rowcount
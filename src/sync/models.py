@@ -0,0 +1,42 @@
+from datetime import datetime
+from enum import StrEnum
+
+from sqlalchemy import JSON, DateTime, Enum, Index, Integer, String, func
+from sqlalchemy.orm import Mapped, mapped_column
+
+from src.models.base import Base
+
+
+class ChangeOp(StrEnum):
+    upsert = "upsert"
+    delete = "delete"
+
+
+class ChangeLog(Base):
+    __table_args__ = (
+        Index("ix_changelog_team_id_id", "team_id", "id"),
+    )
+
+    team_id: Mapped[int] = mapped_column(
+        Integer, nullable=False,
+        comment="ID команды; без FK, чтобы надгробия переживали удаление сущностей",
+    )
+    entity: Mapped[str] = mapped_column(
+        String(32), nullable=False,
+        comment="Тип сущности: task / meeting / comment / membership",
+    )
+    entity_id: Mapped[int] = mapped_column(
+        Integer, nullable=False,
+        comment="ID сущности (для membership — ID пользователя)",
+    )
+    op: Mapped[ChangeOp] = mapped_column(
+        Enum(ChangeOp), nullable=False,
+        comment="upsert — актуальный снимок в payload, delete — надгробие",
+    )
+    payload: Mapped[dict | None] = mapped_column(
+        JSON,
+        comment="Снимок сущности на момент изменения",
+    )
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(),
+    )
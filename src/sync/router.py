@@ -0,0 +1,26 @@
+from fastapi import APIRouter, HTTPException, Query
+
+from src.core.dependencies import CurrentUser, SessionDep
+from src.sync.crud import SYNC_PAGE_LIMIT, SyncCRUD
+from src.sync.schemas import SyncOut
+
+
+crud = SyncCRUD()
+sync_router = APIRouter(prefix="/sync", tags=["sync"])
+
+
+@sync_router.get("", response_model=SyncOut)
+async def get_changes(
+    session: SessionDep,
+    current_user: CurrentUser,
+    since: str | None = Query(
+        None, description="Курсор из предыдущего ответа; без него возвращается только текущий курсор"
+    ),
+    limit: int = Query(SYNC_PAGE_LIMIT, ge=1, le=SYNC_PAGE_LIMIT),
+):
+    if current_user.team_id is None:
+        raise HTTPException(status_code=400, detail="User is not in a team")
+    cursor, has_more, changes = await crud.get_changes(
+        session, team_id=current_user.team_id, since=since, limit=limit,
+    )
+    return {"cursor": cursor, "has_more": has_more, "changes": changes}
@@ -0,0 +1,18 @@
+from typing import Any, Optional
+
+from pydantic import BaseModel
+
+from src.sync.models import ChangeOp
+
+
+class SyncChange(BaseModel):
+    entity: str
+    id: int
+    op: ChangeOp
+    data: Optional[dict[str, Any]] = None
+
+
+class SyncOut(BaseModel):
+    cursor: str
+    has_more: bool
+    changes: list[SyncChange]
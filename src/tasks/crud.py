@@ -10,6 +10,10 @@ from .helpers import (
     _get_user_or_404,
 )
 from .models import Status, Task, TaskComment
+from src.core.cache import invalidate_after_commit, team_tag
+from src.core.hooks import on_commit
+from src.meetings.feed import invalidate_feeds
+from src.sync.crud import comment_payload, record_change, task_payload
 from src.users.models import User
 
 
@@ -51,6 +55,10 @@ class TaskCRUD:
             raise HTTPException(status_code=409, detail="Task name already exists in this team")
         session.add(task)
         await session.flush()
+        await record_change(session, task.team_id, "task", task.id, task_payload(task))
+        assignee_ids = [task.assignee_id]
+        on_commit(session, lambda: invalidate_feeds(assignee_ids))
+        invalidate_after_commit(session, team_tag(task.team_id))
         await session.commit()
         return task
 
@@ -93,12 +101,17 @@ class TaskCRUD:
             if conflict:
                 raise HTTPException(status_code=409, detail="Task name already exists in this team")
             task.name = new_name
+        previous_assignee_id = task.assignee_id
         allowed = {"name", "description", "deadline_at", "assignee_id", "status"}
         for key, value in data.items():
             if key in allowed:
                 setattr(task, key, value)
 
         await session.flush()
+        await record_change(session, task.team_id, "task", task.id, task_payload(task))
+        assignee_ids = [previous_assignee_id, task.assignee_id]
+        on_commit(session, lambda: invalidate_feeds(assignee_ids))
+        invalidate_after_commit(session, team_tag(task.team_id))
         await session.commit()
         await session.refresh(task)
         return task
@@ -118,6 +131,10 @@ class TaskCRUD:
                 detail="Only the author can update this task",
             )
 
+        await record_change(session, task.team_id, "task", task.id)
+        assignee_ids = [task.assignee_id]
+        on_commit(session, lambda: invalidate_feeds(assignee_ids))
+        invalidate_after_commit(session, team_tag(task.team_id))
         await session.delete(task)
         await session.commit()
 
@@ -135,6 +152,8 @@ class TaskCRUD:
         session.add(comment)
 
         await session.flush()
+        await record_change(session, team_id, "comment", comment.id, comment_payload(comment))
+        invalidate_after_commit(session, team_tag(team_id))
         await session.commit()
         await session.refresh(comment)
         return comment
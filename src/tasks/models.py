@@ -5,6 +5,7 @@ from sqlalchemy import (
     DateTime,
     Enum,
     ForeignKey,
+    Index,
     String,
     Text,
 )
@@ -21,6 +22,12 @@ class Status(str, enum.Enum):
 
 
 class Task(Base, TimestampMixin):
+    __table_args__ = (
+        Index("ix_task_team_assignee_status", "team_id", "assignee_id", "status"),
+        Index("ix_task_team_deadline", "team_id", "deadline_at"),
+        Index("ix_task_deadline_at", "deadline_at"),
+    )
+
     name: Mapped[str] = mapped_column(
         String(255), nullable=False, comment="Название задачи"
     )
@@ -10,6 +10,7 @@ from .schemas import (
     TaskUpdate,
 )
 from src.core.dependencies import CurrentUser, SessionDep
+from src.core.cache import cached, team_tag
 from src.tasks.crud import TaskCRUD 
 from src.users.models import User
 
@@ -45,6 +46,7 @@ async def create_task(
 
 
 @tasks_router.get("/{task_id}", response_model=TaskRead)
+@cached("tasks.get", TaskRead, tags=lambda kw, _: [team_tag(kw["team_id"])])
 async def get_task(
     team_id: int,
     task_id: int,
@@ -57,6 +59,7 @@ async def get_task(
 
 
 @tasks_router.get("", response_model=list[TaskRead])
+@cached("tasks.list", list[TaskRead], tags=lambda kw, _: [team_tag(kw["team_id"])])
 async def list_tasks(
     team_id: int,
     session: SessionDep,
@@ -8,6 +8,9 @@ from sqlalchemy.orm import selectinload
 
 from .models import Team
 from .schemas import TeamCreate, TeamMemberIn, TeamMemberRead, TeamRead, UserShort, TeamMembersDelete
+from src.core.cache import TEAMS_TAG, invalidate_after_commit, team_tag, user_tag
+from src.sync.crud import membership_payload, record_change, record_changes, team_payload
+from src.teams.snapshot import delete_snapshot
 from src.users.models import User, TeamRole
 
 
@@ -42,6 +45,8 @@ class TeamCRUD:
             for u in db_users:
                 u.team_id = team.id
                 u.role_in_team = roles_by_user_id.get(u.id)
+            await record_changes(session, team.id, "membership", [(u.id, membership_payload(u)) for u in db_users])
+            invalidate_after_commit(session, TEAMS_TAG, team_tag(team.id), *(user_tag(u.id) for u in db_users))
 
             await session.commit()
 
@@ -188,8 +193,14 @@ class TeamCRUD:
                 for u in db_users:
                     u.team_id = team.id
                     u.role_in_team = roles_by_user_id.get(u.id, u.role_in_team)
+                await record_changes(session, team.id, "membership", [(u.id, membership_payload(u)) for u in db_users])
+                invalidate_after_commit(session, *(user_tag(u.id) for u in db_users))
 
+            invalidate_after_commit(session, TEAMS_TAG, team_tag(team.id))
             session.add(team)
+            if new_name is not None:
+                await session.flush()
+                await record_change(session, team.id, "team", team.id, team_payload(team))
             await session.commit()
             await session.refresh(team, attribute_names=["members"])
 
@@ -220,11 +231,17 @@ class TeamCRUD:
             exists = await session.scalar(select(Team.id).where(Team.id == team_id))
             if not exists:
                 return False
+            member_ids = (await session.scalars(select(User.id).where(User.team_id == team_id))).all()
+            invalidate_after_commit(session, TEAMS_TAG, team_tag(team_id), *map(user_tag, member_ids))
             await session.execute(
                 update(User)
                 .where(User.team_id == team_id)
                 .values(team_id=None, role_in_team=TeamRole.employee)
             )
+            # журнал и outbox без FK на team — надгробия переживут удаление команды
+            await record_changes(session, team_id, "membership", [(user_id, None) for user_id in member_ids])
+            await record_change(session, team_id, "team", team_id, None)
+            await delete_snapshot(session, team_id)
             await session.execute(delete(Team).where(Team.id == team_id))
 
             await session.commit()
@@ -303,6 +320,8 @@ class TeamCRUD:
             for u in db_users:
                 u.team_id = None
                 u.role_in_team = TeamRole.employee
+            await record_changes(session, team.id, "membership", [(u.id, None) for u in db_users])
+            invalidate_after_commit(session, TEAMS_TAG, team_tag(team.id), *(user_tag(u.id) for u in db_users))
 
             await session.commit()
 
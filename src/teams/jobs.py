@@ -0,0 +1,132 @@
+from datetime import datetime, timezone
+from typing import Any
+
+from sqlalchemy import delete, func, select
+
+from src.core.cache import invalidate_after_commit, team_tag, user_tag
+from src.core.hooks import on_commit
+from src.evaluations.models import Evaluation
+from src.jobs.worker import JobContext, job_handler
+from src.meetings.availability import invalidate_free_busy
+from src.meetings.feed import invalidate_feeds
+from src.meetings.models import Meeting, MeetingSeries, meeting_participants
+from src.sync.crud import meeting_payload, membership_payload, record_changes, task_payload
+from src.tasks.models import Task, TaskComment
+from src.teams.crud import TeamCRUD
+from src.teams.models import Team
+from src.users.models import User
+
+
+TEAM_DELETE = "team.delete"
+TEAM_EXPORT = "team.export"
+
+
+async def _count(ctx: JobContext, team_id: int) -> int:
+    async with ctx.session_factory() as session:
+        meetings = await session.scalar(select(func.count()).select_from(Meeting).where(Meeting.team_id == team_id))
+        tasks = await session.scalar(select(func.count()).select_from(Task).where(Task.team_id == team_id))
+    return meetings + tasks
+
+
+@job_handler(TEAM_DELETE)
+async def delete_team(ctx: JobContext) -> dict[str, Any]:
+    """Удаляет встречи и задачи команды порциями по chunk_size, каждая в своей транзакции.
+
+    Команда и привязка участников снимаются последним шагом через
+    TeamCRUD.delete_team, поэтому повтор после сбоя просто продолжает удаление.
+    Каждая порция пишет надгробия в журнал /sync и сбрасывает календари
+    затронутых пользователей, включая участников из других команд.
+    """
+    team_id = ctx.payload["team_id"]
+    total = await _count(ctx, team_id)
+    done = 0
+    await ctx.progress(done, total)
+
+    deleted = {"meetings": 0, "tasks": 0}
+    while True:
+        async with ctx.session_factory() as session:
+            ids = (await session.execute(
+                select(Meeting.id).where(Meeting.team_id == team_id).order_by(Meeting.id).limit(ctx.chunk_size)
+            )).scalars().all()
+            if not ids:
+                await session.execute(delete(MeetingSeries).where(MeetingSeries.team_id == team_id))
+                await session.commit()
+                break
+            user_ids = (await session.execute(
+                select(meeting_participants.c.user_id.distinct()).where(meeting_participants.c.meeting_id.in_(ids))
+            )).scalars().all()
+            await session.execute(delete(meeting_participants).where(meeting_participants.c.meeting_id.in_(ids)))
+            await session.execute(delete(Meeting).where(Meeting.id.in_(ids)))
+            await record_changes(session, team_id, "meeting", [(meeting_id, None) for meeting_id in ids])
+            on_commit(session, lambda: invalidate_free_busy(user_ids))
+            on_commit(session, lambda: invalidate_feeds(user_ids))
+            invalidate_after_commit(session, team_tag(team_id), *map(user_tag, user_ids))
+            await session.commit()
+        deleted["meetings"] += len(ids)
+        done += len(ids)
+        await ctx.progress(done)
+
+    while True:
+        async with ctx.session_factory() as session:
+            rows = (await session.execute(
+                select(Task.id, Task.assignee_id).where(Task.team_id == team_id).order_by(Task.id).limit(ctx.chunk_size)
+            )).all()
+            if not rows:
+                break
+            ids = [task_id for task_id, _ in rows]
+            await session.execute(delete(Evaluation).where(Evaluation.task_id.in_(ids)))
+            await session.execute(delete(TaskComment).where(TaskComment.task_id.in_(ids)))
+            await session.execute(delete(Task).where(Task.id.in_(ids)))
+            await record_changes(session, team_id, "task", [(task_id, None) for task_id in ids])
+            assignee_ids = [assignee_id for _, assignee_id in rows]
+            on_commit(session, lambda: invalidate_feeds(assignee_ids))
+            invalidate_after_commit(session, team_tag(team_id))
+            await session.commit()
+        deleted["tasks"] += len(ids)
+        done += len(ids)
+        await ctx.progress(done)
+
+    async with ctx.session_factory() as session:
+        team_deleted = await TeamCRUD.delete_team(session, team_id)
+    return {"team_id": team_id, "team_deleted": team_deleted, **deleted}
+
+
+async def _export_rows(ctx: JobContext, model, team_id: int, payload, done: int) -> tuple[list[dict[str, Any]], int]:
+    rows, last_id = [], 0
+    while True:
+        async with ctx.session_factory() as session:
+            chunk = (await session.execute(
+                select(model)
+                .where(model.team_id == team_id, model.id > last_id)
+                .order_by(model.id)
+                .limit(ctx.chunk_size)
+            )).scalars().all()
+        if not chunk:
+            return rows, done
+        rows.extend(payload(obj) for obj in chunk)
+        last_id = chunk[-1].id
+        done += len(chunk)
+        await ctx.progress(done)
+
+
+@job_handler(TEAM_EXPORT)
+async def export_team(ctx: JobContext) -> dict[str, Any]:
+    """Выгрузка команды: состав, задачи и встречи в формате событий /sync."""
+    team_id = ctx.payload["team_id"]
+    async with ctx.session_factory() as session:
+        team = await session.get(Team, team_id)
+        if team is None:
+            raise LookupError(f"Team {team_id} not found")
+        members = (await session.execute(
+            select(User).where(User.team_id == team_id).order_by(User.id)
+        )).scalars().all()
+        document: dict[str, Any] = {
+            "team": {"id": team.id, "name": team.name, "owner_id": team.owner_id},
+            "members": [membership_payload(user) for user in members],
+        }
+    await ctx.progress(0, await _count(ctx, team_id))
+
+    document["tasks"], done = await _export_rows(ctx, Task, team_id, task_payload, 0)
+    document["meetings"], done = await _export_rows(ctx, Meeting, team_id, meeting_payload, done)
+    document["exported_at"] = datetime.now(timezone.utc).isoformat()
+    return document
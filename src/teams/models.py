@@ -1,4 +1,6 @@
-from sqlalchemy import ForeignKey, Index, String, func
+from datetime import datetime
+
+from sqlalchemy import DateTime, ForeignKey, Index, Integer, LargeBinary, String, func
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from src.mixins.timestamp_mixin import TimestampMixin
@@ -25,4 +27,26 @@ class Team(Base, TimestampMixin):
     tasks: Mapped[list["Task"]] = relationship(
         back_populates="team",
         doc="Задачи, принадлежащие команде",
+    )
+
+
+class TeamSnapshot(Base):
+    team_id: Mapped[int] = mapped_column(
+        ForeignKey("team.id", ondelete="CASCADE"), unique=True, nullable=False,
+        comment="ID команды",
+    )
+    body: Mapped[bytes] = mapped_column(
+        LargeBinary, nullable=False,
+        comment="Готовый JSON-документ: команда, участники, открытые задачи, предстоящие встречи",
+    )
+    version: Mapped[int] = mapped_column(
+        Integer, nullable=False, default=1,
+        comment="Растёт при каждом изменении документа (ETag)",
+    )
+    log_id: Mapped[int] = mapped_column(
+        Integer, nullable=False, default=0, server_default="0",
+        comment="Последняя запись changelog, учтённая в документе",
+    )
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), onupdate=func.now(),
     )
\ No newline at end of file
@@ -1,10 +1,17 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 
 from .crud import TeamCRUD
 from .schemas import TeamCreate, TeamRead, TeamUpdate, TeamMemberRead, TeamMembersDelete
 from .permissions import require_team_admin_or_superuser
-from src.core.dependencies import SessionDep
+from .jobs import TEAM_DELETE, TEAM_EXPORT
+from .service import ensure_team_member
+from .snapshot import get_snapshot
+from src.core.dependencies import CurrentUser, SessionDep
+from src.core.cache import TEAMS_TAG, cached, team_tag
+from src.jobs.crud import JobCRUD
+from src.jobs.schemas import JobAccepted
+from src.teams.models import Team
 from src.users.models import User
 
 
@@ -28,6 +35,7 @@ async def create_team(
 
 
 @teams_router.get("/{team_id}", response_model=TeamRead)
+@cached("team.get", TeamRead, tags=lambda kw, _: [team_tag(kw["team_id"])])
 async def get_team(
     team_id: int,
     session: SessionDep,
@@ -37,7 +45,26 @@ async def get_team(
     return team
 
 
+@teams_router.get("/{team_id}/snapshot")
+async def get_team_snapshot(
+    team_id: int,
+    request: Request,
+    session: SessionDep,
+    user: CurrentUser,
+):
+    """Команда с участниками, открытыми задачами и предстоящими встречами одним готовым документом."""
+    ensure_team_member(user, team_id)
+    snapshot = await get_snapshot(session, team_id)
+    if snapshot is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Team not found")
+    headers = {"ETag": f'"{team_id}-{snapshot.version}"', "Cache-Control": "private, no-cache"}
+    if request.headers.get("if-none-match") == headers["ETag"]:
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return Response(content=snapshot.body, media_type="application/json", headers=headers)
+
+
 @teams_router.get("/", response_model=list[TeamRead])
+@cached("team.list", list[TeamRead], tags=lambda kw, _: [TEAMS_TAG])
 async def get_all_teams(
     session: SessionDep,
     credentials: HTTPAuthorizationCredentials = Depends(http_bearer),
@@ -57,17 +84,39 @@ async def update_team(
     return team
 
 
-@teams_router.delete("/{team_id}")
+async def _enqueue_team_job(session, kind: str, team_id: int, user: User) -> JobAccepted:
+    if await session.get(Team, team_id) is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Team not found")
+    job = await JobCRUD.enqueue(
+        session, kind, {"team_id": team_id}, user_id=user.id, team_id=team_id, unique=True,
+    )
+    job_id = job.id
+    await session.commit()
+    return JobAccepted(message=f"{kind} scheduled", job_id=job_id)
+
+
+@teams_router.delete("/{team_id}", response_model=JobAccepted, status_code=status.HTTP_202_ACCEPTED)
 async def delete_team(
     team_id: int,
     session: SessionDep,
     user: User = Depends(require_team_admin_or_superuser),
 ):
-    await crud.delete_team(session, team_id)
-    return {"message": "team was deleted"}
+    """Удаление выполняется фоновым заданием; прогресс — GET /jobs/{job_id}."""
+    return await _enqueue_team_job(session, TEAM_DELETE, team_id, user)
+
+
+@teams_router.post("/{team_id}/export", response_model=JobAccepted, status_code=status.HTTP_202_ACCEPTED)
+async def export_team(
+    team_id: int,
+    session: SessionDep,
+    user: User = Depends(require_team_admin_or_superuser),
+):
+    """Выгрузка команды фоновым заданием; результат — GET /jobs/{job_id}/result."""
+    return await _enqueue_team_job(session, TEAM_EXPORT, team_id, user)
 
 
 @teams_router.get("/{team_id}/users", response_model=list[TeamMemberRead])
+@cached("team.users", list[TeamMemberRead], tags=lambda kw, _: [team_tag(kw["team_id"])])
 async def list_team_users(
     team_id: int,
     session: SessionDep,
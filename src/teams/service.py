@@ -13,3 +13,15 @@ def ensure_can_create_team(user: User) -> None:
         status_code=status.HTTP_403_FORBIDDEN,
         detail="Создавать команды могут только администраторы команды или суперпользователи.",
     )
+
+
+def ensure_team_member(user: User, team_id: int) -> None:
+    """Данные команды видят только её участники и суперюзер."""
+    if getattr(user, "is_superuser", False):
+        return
+    if getattr(user, "team_id", None) == team_id:
+        return
+    raise HTTPException(
+        status_code=status.HTTP_403_FORBIDDEN,
+        detail="Данные команды доступны только её участникам.",
+    )
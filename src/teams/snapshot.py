@@ -0,0 +1,236 @@
+import json
+from datetime import datetime
+from typing import Any
+
+from sqlalchemy import delete, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.core.dialect import insert_ignore, is_postgres, lock_for_update
+from src.meetings.models import Meeting, MeetingStatus
+from src.sync.crud import meeting_payload, task_payload
+from src.sync.models import ChangeLog
+from src.tasks.models import Status, Task
+from src.teams.models import Team, TeamSnapshot
+from src.users.models import TeamRole, User
+
+
+# Разделы документа, которые сверяет check_snapshot.
+SECTIONS = ("team", "members", "open_tasks", "upcoming_meetings")
+# События журнала, из которых складывается документ.
+ENTITIES = ("task", "meeting", "membership", "team")
+
+
+def _encode(doc: dict[str, Any]) -> bytes:
+    return json.dumps(doc, ensure_ascii=False, separators=(",", ":")).encode()
+
+
+def _task_sort_key(task: dict[str, Any]) -> tuple:
+    return task["deadline_at"] is None, task["deadline_at"] or "", task["id"]
+
+
+def _meeting_sort_key(meeting: dict[str, Any]) -> tuple:
+    return meeting["starts_at"], meeting["id"]
+
+
+def _is_open(task: dict[str, Any]) -> bool:
+    return task["status"] != Status.done.value
+
+
+def _is_upcoming(meeting: dict[str, Any], since: str) -> bool:
+    return meeting["status"] == MeetingStatus.scheduled and meeting["ends_at"] >= since
+
+
+async def _team_section(session: AsyncSession, team_id: int) -> dict[str, Any] | None:
+    team = (await session.execute(
+        select(Team.id, Team.name, Team.owner_id).where(Team.id == team_id)
+    )).one_or_none()
+    return None if team is None else {"id": team.id, "name": team.name, "owner_id": team.owner_id}
+
+
+async def _members_section(session: AsyncSession, team_id: int) -> list[dict[str, Any]]:
+    rows = (await session.execute(
+        select(User.id, User.email, User.role_in_team).where(User.team_id == team_id).order_by(User.id)
+    )).all()
+    return [
+        {"user_id": row.id, "email": row.email, "role": (row.role_in_team or TeamRole.employee).value}
+        for row in rows
+    ]
+
+
+async def build_snapshot(session: AsyncSession, team_id: int, since: datetime | None = None) -> dict[str, Any] | None:
+    """Полная сборка документа из team, user, task и meeting."""
+    team = await _team_section(session, team_id)
+    if team is None:
+        return None
+    since_iso = (since or datetime.now()).replace(microsecond=0).isoformat()
+    tasks = (await session.scalars(
+        select(Task).where(Task.team_id == team_id, Task.status != Status.done)
+    )).all()
+    meetings = (await session.scalars(
+        select(Meeting).where(
+            Meeting.team_id == team_id,
+            Meeting.status == MeetingStatus.scheduled,
+            Meeting.ends_at >= datetime.fromisoformat(since_iso),
+        )
+    )).all()
+    return {
+        "team": team,
+        "members": await _members_section(session, team_id),
+        "open_tasks": sorted(map(task_payload, tasks), key=_task_sort_key),
+        "upcoming_meetings": sorted(map(meeting_payload, meetings), key=_meeting_sort_key),
+        "since": since_iso,
+    }
+
+
+async def _locked_row(session: AsyncSession, team_id: int) -> TeamSnapshot | None:
+    stmt = (
+        select(TeamSnapshot)
+        .where(TeamSnapshot.team_id == team_id)
+        .execution_options(populate_existing=True)
+    )
+    if is_postgres(session):
+        stmt = stmt.with_for_update()
+    else:
+        await lock_for_update(session)
+    return await session.scalar(stmt)
+
+
+async def _log_head(session: AsyncSession, team_id: int) -> int:
+    return await session.scalar(
+        select(func.max(ChangeLog.id)).where(ChangeLog.team_id == team_id)
+    ) or 0
+
+
+async def _insert(session: AsyncSession, team_id: int, doc: dict[str, Any], log_id: int) -> bool:
+    """Первый документ команды; False — его уже вставил соседний запрос."""
+    inserted = await session.scalar(
+        insert_ignore(session, TeamSnapshot.__table__)
+        .values(team_id=team_id, body=_encode(doc), version=1, log_id=log_id)
+        .returning(TeamSnapshot.team_id)
+    )
+    return inserted is not None
+
+
+async def _store(session: AsyncSession, row: TeamSnapshot, doc: dict[str, Any], log_id: int) -> None:
+    body = _encode(doc)
+    if row.body != body:
+        row.body = body
+        row.version += 1
+    row.log_id = log_id
+    await session.flush()
+
+
+async def rebuild_snapshot(session: AsyncSession, team_id: int, since: datetime | None = None) -> bool:
+    """Пересобирает документ целиком в текущей транзакции; False — команды нет."""
+    row = await _locked_row(session, team_id)
+    # голова журнала до сборки: события после неё накатятся повторно, а это идемпотентно
+    log_id = await _log_head(session, team_id)
+    doc = await build_snapshot(session, team_id, since)
+    if doc is None:
+        if row is not None:
+            await session.delete(row)
+        return False
+    if row is None:
+        if await _insert(session, team_id, doc, log_id):
+            return True
+        # промах у двух запросов сразу: строку вставил сосед, пересобираем поверх неё под блокировкой
+        return await rebuild_snapshot(session, team_id, since)
+    await _store(session, row, doc, log_id)
+    return True
+
+
+def _patch(items: list[dict[str, Any]], events: list[dict[str, Any]], keep, sort_key) -> list[dict[str, Any]]:
+    by_id = {item["id"]: item for item in items}
+    for event in events:
+        data = event["data"]
+        if data is not None and keep(data):
+            by_id[event["id"]] = data
+        else:
+            by_id.pop(event["id"], None)
+    return sorted(by_id.values(), key=sort_key)
+
+
+async def _apply_log(
+    session: AsyncSession, team_id: int, doc: dict[str, Any], after: int,
+) -> tuple[dict[str, Any] | None, int]:
+    """Накатывает на документ события журнала после after.
+
+    Задачи и встречи патчатся по payload событий без обращения к их таблицам;
+    состав команды перечитывается целиком — он маленький. Возвращает документ
+    (None — команды больше нет) и id последнего учтённого события.
+    """
+    rows = (await session.execute(
+        select(ChangeLog.id, ChangeLog.entity, ChangeLog.entity_id, ChangeLog.payload)
+        .where(ChangeLog.team_id == team_id, ChangeLog.id > after, ChangeLog.entity.in_(ENTITIES))
+        .order_by(ChangeLog.id)
+    )).all()
+    if not rows:
+        return doc, after
+    events: dict[str, list[dict[str, Any]]] = {}
+    for row in rows:
+        events.setdefault(row.entity, []).append({"id": row.entity_id, "data": row.payload})
+    if "task" in events:
+        doc["open_tasks"] = _patch(doc["open_tasks"], events["task"], _is_open, _task_sort_key)
+    if "meeting" in events:
+        since = doc["since"]
+        doc["upcoming_meetings"] = _patch(
+            doc["upcoming_meetings"], events["meeting"], lambda m: _is_upcoming(m, since), _meeting_sort_key,
+        )
+    if "membership" in events or "team" in events:
+        team = await _team_section(session, team_id)
+        if team is None:
+            return None, rows[-1].id
+        doc["team"] = team
+        doc["members"] = await _members_section(session, team_id)
+    return doc, rows[-1].id
+
+
+async def _catch_up(session: AsyncSession, team_id: int) -> bool:
+    """Догоняет журнал под блокировкой строки документа; False — команды нет."""
+    row = await _locked_row(session, team_id)
+    if row is None:
+        return await rebuild_snapshot(session, team_id)
+    doc, log_id = await _apply_log(session, team_id, json.loads(row.body), row.log_id)
+    if doc is None:
+        await session.delete(row)
+        return False
+    await _store(session, row, doc, log_id)
+    return True
+
+
+async def delete_snapshot(session: AsyncSession, team_id: int) -> None:
+    await session.execute(delete(TeamSnapshot).where(TeamSnapshot.team_id == team_id))
+
+
+async def get_snapshot(session: AsyncSession, team_id: int) -> TeamSnapshot | None:
+    """Готовый документ; отсутствующий собирается, отставший от журнала — догоняет его.
+
+    Писатели документ не трогают: изменения CRUD попадают только в журнал,
+    а первое чтение после них накатывает всё накопившееся одним обновлением
+    строки. Так записи одной команды не выстраиваются в очередь за документом.
+    """
+    stmt = select(TeamSnapshot).where(TeamSnapshot.team_id == team_id).execution_options(populate_existing=True)
+    row = await session.scalar(stmt)
+    if row is not None and row.log_id >= await _log_head(session, team_id):
+        return row
+    if not await _catch_up(session, team_id):
+        await session.commit()
+        return None
+    await session.commit()
+    return await session.scalar(stmt)
+
+
+async def check_snapshot(session: AsyncSession, team_id: int) -> list[str]:
+    """Разделы, в которых сохранённый документ расходится с данными; [] — всё сходится."""
+    row = await session.scalar(select(TeamSnapshot).where(TeamSnapshot.team_id == team_id))
+    if row is None:
+        return ["missing"]
+    stored, _ = await _apply_log(session, team_id, json.loads(row.body), row.log_id)
+    if stored is None:
+        return ["orphaned"]
+    fresh = await build_snapshot(session, team_id, datetime.fromisoformat(stored["since"]))
+    if fresh is None:
+        return ["orphaned"]
+    # сравниваем в том виде, в каком документ отдаётся клиентам
+    fresh = json.loads(_encode(fresh))
+    return [section for section in SECTIONS if stored.get(section) != fresh[section]]
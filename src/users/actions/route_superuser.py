@@ -2,7 +2,9 @@ from fastapi import APIRouter, HTTPException, Response, status
 from pydantic import BaseModel, EmailStr
 from sqlalchemy import select
 
+from src.core.cache import invalidate_after_commit, team_tag, user_tag
 from src.core.dependencies import SessionDep, CurrentSuperUser
+from src.sync.crud import membership_payload, record_change
 from src.users.models import User, TeamRole
 
 
@@ -26,6 +28,11 @@ async def make_user_admin(
 
     if user.role_in_team != TeamRole.admin:
         user.role_in_team = TeamRole.admin
+        invalidate_after_commit(session, user_tag(user.id))
+        if user.team_id is not None:
+            await session.flush()
+            await record_change(session, user.team_id, "membership", user.id, membership_payload(user))
+            invalidate_after_commit(session, team_tag(user.team_id))
         await session.commit()
 
     return Response(status_code=status.HTTP_204_NO_CONTENT)
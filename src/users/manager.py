@@ -1,4 +1,4 @@
-from typing import Optional
+from typing import Any, Optional
 import logging
 
 from fastapi import Depends, Request
@@ -6,7 +6,9 @@ from fastapi_users import BaseUserManager, IntegerIDMixin
 
 from src.users.models import User
 from src.config import settings
+from src.core.cache import invalidate_after_commit, team_tag, user_tag
 from src.database import get_user_db
+from src.sync.crud import membership_payload, record_change
 
 
 log = logging.getLogger(__name__)
@@ -31,6 +33,25 @@ class UserManager(IntegerIDMixin, BaseUserManager[User, int]):
     ):
         log.warning("Verification requested for user " + str(user.id) + ". Verification token: " + str(token))
 
+    async def on_after_update(
+        self, user: User, update_dict: dict[str, Any], request: Optional[Request] = None
+    ):
+        # fastapi-users уже закоммитил изменение; email участника виден в составе команды
+        session = self.user_db.session
+        invalidate_after_commit(session, user_tag(user.id))
+        if user.team_id is not None:
+            await record_change(session, user.team_id, "membership", user.id, membership_payload(user))
+            invalidate_after_commit(session, team_tag(user.team_id))
+        await session.commit()
+
+    async def on_before_delete(self, user: User, request: Optional[Request] = None):
+        # user_db.delete коммитит сессию — событие уходит в той же транзакции
+        session = self.user_db.session
+        invalidate_after_commit(session, user_tag(user.id))
+        if user.team_id is not None:
+            await record_change(session, user.team_id, "membership", user.id)
+            invalidate_after_commit(session, team_tag(user.team_id))
+
 
 async def get_user_manager(user_db=Depends(get_user_db)):
     yield UserManager(user_db)
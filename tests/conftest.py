@@ -7,6 +7,7 @@ from sqlalchemy.ext.asyncio import (
     async_sessionmaker,
 )
 
+from src.core.cache import caches
 from src.teams.models import Base
 
 
@@ -15,6 +16,12 @@ def anyio_backend():
     return "asyncio"
 
 
+@pytest.fixture(autouse=True)
+def clear_caches():
+    for cache in caches.values():
+        cache.clear()
+
+
 @pytest_asyncio.fixture
 async def engine():
     eng = create_async_engine(
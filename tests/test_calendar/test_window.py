@@ -0,0 +1,55 @@
+from datetime import date, datetime, timedelta
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from src.calendar_view.crud import CalendarCRUD
+from tests.helpers import _make_user, _make_team, _make_meeting, _make_task
+
+
+@pytest.mark.anyio
+async def test_window_groups_user_meetings_and_team_tasks_by_day(session: AsyncSession, engine):
+    team = await _make_team(session, "Alpha")
+    other_team = await _make_team(session, "Beta")
+    user = await _make_user(session, "ann@a.com", team_id=team.id)
+    stranger = await _make_user(session, "bob@b.com", team_id=other_team.id)
+
+    day = datetime(2025, 3, 10)
+    standup = await _make_meeting(
+        session, team_id=team.id, title="standup",
+        starts_at=day + timedelta(hours=9), ends_at=day + timedelta(hours=9, minutes=15),
+        participants=[user],
+    )
+    night = await _make_meeting(
+        session, team_id=team.id, title="release",
+        starts_at=day + timedelta(days=1, hours=22), ends_at=day + timedelta(days=2, hours=2),
+        participants=[user],
+    )
+    await _make_meeting(
+        session, team_id=team.id, title="not mine",
+        starts_at=day + timedelta(hours=11), ends_at=day + timedelta(hours=12),
+    )
+    await _make_meeting(
+        session, team_id=team.id, title="outside",
+        starts_at=day + timedelta(days=20), ends_at=day + timedelta(days=20, hours=1),
+        participants=[user],
+    )
+    report = await _make_task(session, team_id=team.id, author_id=user.id, name="report")
+    report.deadline_at = day + timedelta(hours=18)
+    late = await _make_task(session, team_id=team.id, author_id=user.id, name="late")
+    late.deadline_at = day + timedelta(days=30)
+    foreign = await _make_task(session, team_id=other_team.id, author_id=stranger.id, name="foreign")
+    foreign.deadline_at = day + timedelta(hours=10)
+    await session.commit()
+
+    Session = async_sessionmaker(engine, expire_on_commit=False, class_=AsyncSession)
+    async with Session() as meetings_session, Session() as tasks_session:
+        days = await CalendarCRUD().get_window(
+            meetings_session, tasks_session, user, date(2025, 3, 10), date(2025, 3, 16),
+        )
+
+    assert list(days) == [date(2025, 3, 10), date(2025, 3, 11), date(2025, 3, 12)]
+    assert [m.id for m in days[date(2025, 3, 10)]["meetings"]] == [standup.id]
+    assert [t.name for t in days[date(2025, 3, 10)]["tasks"]] == ["report"]
+    assert [m.id for m in days[date(2025, 3, 11)]["meetings"]] == [night.id]
+    assert [m.id for m in days[date(2025, 3, 12)]["meetings"]] == [night.id]
@@ -0,0 +1,145 @@
+import asyncio
+import json
+import shutil
+import tempfile
+from contextlib import asynccontextmanager
+
+import pytest
+
+from src.core.cache import TTLCache, response_cache
+from src.core.invalidation import MAX_PAYLOAD, InvalidationBus, UnixSocketTransport, metrics
+from src.events.hub import hub
+from src.sync.crud import change_listeners
+
+
+@asynccontextmanager
+async def _buses():
+    # путь к unix-сокету ограничен ~100 символами — короткий каталог в /tmp
+    directory = tempfile.mkdtemp(prefix="inval-", dir="/tmp")
+    a = InvalidationBus(UnixSocketTransport(directory), batch_seconds=0.01, max_keys_per_cache=3)
+    b = InvalidationBus(UnixSocketTransport(directory), batch_seconds=0.01, max_keys_per_cache=3)
+    await a.start()
+    await b.start()
+    try:
+        yield a, b
+    finally:
+        await a.stop()
+        await b.stop()
+        shutil.rmtree(directory, ignore_errors=True)
+
+
+async def _settle():
+    for _ in range(20):
+        await asyncio.sleep(0.01)
+
+
+@pytest.mark.anyio
+async def test_invalidation_reaches_other_worker_in_one_batch():
+    cache = TTLCache("test.bus", ttl=60)
+    cache.set((1, "x"), "one")
+    cache.set((2, "x"), "two")
+    response_cache.set("r", b"body", ["team:5"])
+    applied = metrics.batches_applied
+
+    async with _buses() as (a, b):
+        # как будто это сделал другой воркер: ключи только уходят в шину
+        a.publish("test.bus", (1,))
+        a.publish("responses", ("team:5",))
+        a.publish("unknown-cache", (1,))
+        await _settle()
+
+    assert cache.get((1, "x")) is None
+    assert cache.get((2, "x")) == "two"
+    assert response_cache.get("r") is None
+    # каждая шина получила сообщение от другой; свои сообщения не применяются
+    assert metrics.batches_applied - applied == 1
+
+
+@pytest.mark.anyio
+async def test_local_invalidate_is_published_and_large_batches_clear():
+    cache = TTLCache("test.bus.clear", ttl=60)
+    for key in range(10):
+        cache.set((key,), key)
+    sent = metrics.messages_sent
+
+    async with _buses() as (a, b):
+        b.apply([("test.bus.clear", (key,)) for key in range(5)])
+        assert len(cache) == 0
+
+        cache.set((1,), 1)
+        cache.invalidate(1)
+        await _settle()
+    # обе шины подписаны на локальные инвалидации процесса
+    assert metrics.messages_sent - sent == 2
+
+
+class _SlowTransport:
+    """Отправка уступает циклу, как NOTIFY через asyncpg."""
+
+    def __init__(self):
+        self.sent: list[tuple[str, list]] = []
+
+    async def start(self, on_message) -> None: ...
+
+    async def send(self, payload: str) -> None:
+        await asyncio.sleep(0.01)
+        self.sent.extend(tuple(item) for item in json.loads(payload)["i"])
+
+    async def stop(self) -> None: ...
+
+
+@pytest.mark.anyio
+async def test_keys_published_during_send_are_flushed():
+    transport = _SlowTransport()
+    bus = InvalidationBus(transport)
+    bus.publish("responses", ("team:1",))
+    await asyncio.sleep(0.005)
+    # первая отправка ещё идёт
+    bus.publish("responses", ("team:2",))
+    await _settle()
+
+    assert transport.sent == [("responses", ["team:1"]), ("responses", ["team:2"])]
+    assert bus._flush_task.done()
+
+
+def test_messages_are_split_under_notify_limit():
+    bus = InvalidationBus(UnixSocketTransport("/tmp/unused"))
+    items = [("responses", [f"user:{i}" * 10]) for i in range(500)]
+    payloads = bus._encode(items)
+    assert len(payloads) > 1
+    assert all(len(p.encode()) < 8000 for p in payloads)
+    assert MAX_PAYLOAD < 8000
+
+
+@pytest.mark.anyio
+async def test_change_events_reach_stream_subscribers_of_other_worker():
+    subscriber = hub.subscribe(7)
+    other_team = hub.subscribe(8)
+    events = [{"entity": "task", "id": i, "op": "upsert", "data": {"id": i}} for i in range(3)]
+    try:
+        async with _buses() as (a, b):
+            assert a.publish_changes in change_listeners and b.publish_changes in change_listeners
+            # как будто изменение закоммитил другой воркер
+            a.publish_changes(7, events[:2])
+            a.publish_changes(7, events[2:])
+            await _settle()
+        assert change_listeners.count(a.publish_changes) == 0
+
+        received = [subscriber.queue.get_nowait() for _ in range(subscriber.queue.qsize())]
+        # шина не возвращает событие отправителю: в очереди ровно одна копия каждого
+        assert [json.loads(m.split(b"data: ")[1])["id"] for m in received] == [0, 1, 2]
+        assert other_team.queue.empty()
+    finally:
+        hub.unsubscribe(subscriber)
+        hub.unsubscribe(other_team)
+
+
+def test_oversized_change_is_sent_without_payload():
+    bus = InvalidationBus(UnixSocketTransport("/tmp/unused"))
+    small = {"entity": "task", "id": 1, "op": "upsert", "data": {"name": "ok"}}
+    large = {"entity": "task", "id": 2, "op": "upsert", "data": {"description": "x" * 10000}}
+    payloads = bus._encode([("responses", ["team:1"])], [(1, small), (1, large)])
+    assert all(len(p.encode()) < 8000 for p in payloads)
+    changes = [change for p in payloads for change in json.loads(p).get("e", ())]
+    assert changes[0] == [1, small]
+    assert changes[1] == [1, {**large, "data": None, "truncated": True}]
@@ -0,0 +1,107 @@
+import json
+import time
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.core.cache import ResponseCache, response_cache
+from src.meetings.crud import MeetingCRUD
+from src.meetings.router import get_meetings_by_date, get_team_meetings
+from src.meetings.schemas import MeetingCreate
+from src.tasks.crud import TaskCRUD
+from src.tasks.router import list_tasks
+from src.users.models import TeamRole
+from tests.helpers import _make_meeting, _make_team, _make_user
+
+
+def test_lru_by_size_ttl_and_tags(monkeypatch):
+    cache = ResponseCache("test.responses", ttl=10, max_bytes=10)
+    cache.set("a", b"1234", ["team:1"])
+    cache.set("b", b"5678", ["team:2", "user:7"])
+    assert cache.get("a") == b"1234"
+    cache.set("c", b"90ab", ["team:1"])
+    # "b" дольше всех не читали — вытеснен по размеру
+    assert cache.get("b") is None
+    assert cache.stats()["bytes"] == 8
+
+    cache.invalidate("team:1")
+    assert cache.get("a") is None and cache.get("c") is None
+    assert len(cache) == 0 and cache.size == 0
+
+    epoch = cache.epoch
+    cache.invalidate("user:1")
+    cache.set("late", b"stale", ["team:1"], epoch=epoch)
+    assert cache.get("late") is None
+
+    cache.set("d", b"x", [])
+    now = time.monotonic()
+    monkeypatch.setattr(time, "monotonic", lambda: now + 11)
+    assert cache.get("d") is None
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"]) == (1, 5)
+
+
+@pytest.mark.anyio
+async def test_task_list_is_cached_until_team_tag_invalidated(session: AsyncSession):
+    team = await _make_team(session, "Cache")
+    author = await _make_user(session, "c@a.com", team_id=team.id)
+    await session.commit()
+
+    first = await list_tasks(team_id=team.id, session=session, credentials=None)
+    again = await list_tasks(team_id=team.id, session=session, credentials=None)
+    assert json.loads(first.body) == [] and again.body == first.body
+    hits = response_cache.hits
+
+    await TaskCRUD.create_task(
+        session, team_id=team.id, author_id=author.id, name="New",
+        description="-", deadline_at=datetime(2025, 1, 1),
+    )
+    fresh = await list_tasks(team_id=team.id, session=session, credentials=None)
+    assert [task["name"] for task in json.loads(fresh.body)] == ["New"]
+    assert response_cache.hits == hits
+
+
+@pytest.mark.anyio
+async def test_team_meetings_key_includes_team_scope(session: AsyncSession):
+    alpha, beta = await _make_team(session, "Alpha"), await _make_team(session, "Beta")
+    a1 = await _make_user(session, "a1@a.com", role=TeamRole.admin, team_id=alpha.id)
+    a2 = await _make_user(session, "a2@a.com", role=TeamRole.admin, team_id=alpha.id)
+    b1 = await _make_user(session, "b1@b.com", role=TeamRole.admin, team_id=beta.id)
+    await _make_meeting(
+        session, team_id=alpha.id, title="Alpha sync",
+        starts_at=datetime(2025, 1, 1, 9), ends_at=datetime(2025, 1, 1, 10),
+    )
+
+    async def titles(user):
+        response = await get_team_meetings(session=session, current_user=user, starts_after=None, ends_before=None)
+        return [m["title"] for m in json.loads(response.body)]
+
+    assert await titles(a1) == ["Alpha sync"]
+    hits = response_cache.hits
+    assert await titles(a2) == ["Alpha sync"]
+    assert response_cache.hits == hits + 1
+    assert await titles(b1) == []
+
+
+@pytest.mark.anyio
+async def test_meetings_by_date_is_not_cached(session: AsyncSession):
+    team = await _make_team(session, "ByDate")
+    admin = await _make_user(session, "bd-admin@a.com", role=TeamRole.admin, team_id=team.id)
+    organizer = await _make_user(session, "bd-org@a.com", role=TeamRole.admin, team_id=team.id)
+    now = datetime.now()
+
+    async def titles():
+        meetings = await get_meetings_by_date(session=session, current_user=admin, date=now - timedelta(hours=3))
+        return [m.title for m in meetings]
+
+    assert await titles() == []
+    await MeetingCRUD.create_meeting(
+        organizer,
+        MeetingCreate(
+            title="Standup", description=None,
+            starts_at=now - timedelta(hours=2), ends_at=now - timedelta(hours=1),
+        ),
+        session,
+    )
+    assert await titles() == ["Standup"]
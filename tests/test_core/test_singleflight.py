@@ -0,0 +1,75 @@
+import asyncio
+import json
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.core.singleflight import SingleFlight, flights
+from src.teams.router import get_team
+from tests.helpers import _make_team, _make_user
+
+
+@pytest.mark.anyio
+async def test_concurrent_calls_share_one_execution():
+    flight = SingleFlight("test.share")
+    calls = 0
+
+    async def compute():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return b"body"
+
+    results = await asyncio.gather(*(flight.do("k", compute) for _ in range(10)), flight.do("other", compute))
+    assert results == [b"body"] * 11
+    assert calls == 2
+    assert flight.stats() == {"executions": 2, "saved": 9, "in_flight": 0}
+
+    # после завершения ничего не кэшируется
+    await flight.do("k", compute)
+    assert calls == 3
+
+
+@pytest.mark.anyio
+async def test_errors_are_shared_and_leader_cancel_falls_back():
+    flight = SingleFlight("test.errors")
+
+    async def failing():
+        await asyncio.sleep(0.01)
+        raise HTTPException(status_code=404, detail="nope")
+
+    results = await asyncio.gather(*(flight.do("k", failing) for _ in range(3)), return_exceptions=True)
+    assert [r.status_code for r in results] == [404, 404, 404]
+    assert flight.stats()["executions"] == 1
+
+    async def slow():
+        await asyncio.sleep(0.05)
+        return "ok"
+
+    leader = asyncio.create_task(flight.do("c", slow))
+    await asyncio.sleep(0)
+    follower = asyncio.create_task(flight.do("c", slow))
+    await asyncio.sleep(0.01)
+    leader.cancel()
+    assert await follower == "ok"
+
+
+@pytest.mark.anyio
+async def test_get_team_route_is_coalesced(session: AsyncSession):
+    team = await _make_team(session, "Hot")
+    await _make_user(session, "hot@a.com", team_id=team.id)
+    await session.commit()
+    before = flights["team.get"].stats()
+
+    responses = await asyncio.gather(*(
+        get_team(team_id=team.id, session=session, credentials=None) for _ in range(20)
+    ))
+    assert len({r.body for r in responses}) == 1
+    assert json.loads(responses[0].body) == {
+        "name": "Hot",
+        "members": [{"user": {"id": 1, "email": "hot@a.com"}, "role": "employee"}],
+    }
+    after = flights["team.get"].stats()
+    assert after["executions"] - before["executions"] == 1
+    assert after["saved"] - before["saved"] == 19
@@ -0,0 +1,107 @@
+import asyncio
+from contextlib import asynccontextmanager
+from datetime import timedelta
+
+import pytest
+from sqlalchemy import select, text
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from src.config import DatabaseConfig, SqliteConfig
+from src.core.sqlite import configure_sqlite
+from src.jobs.crud import JobCRUD
+from src.teams.models import Base, Team
+
+
+@asynccontextmanager
+async def _sqlite(tmp_path, **options):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'app.db'}")
+    queue = configure_sqlite(engine, SqliteConfig(**options))
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    try:
+        yield engine, queue, async_sessionmaker(engine, expire_on_commit=False)
+    finally:
+        await engine.dispose()
+
+
+def test_database_url_accepts_sqlite_and_postgres():
+    assert str(DatabaseConfig(url="sqlite+aiosqlite:////var/lib/app.db").url) == "sqlite+aiosqlite:////var/lib/app.db"
+    assert DatabaseConfig(url="postgresql+asyncpg://u:p@db:5432/app").url.scheme == "postgresql+asyncpg"
+    with pytest.raises(ValueError):
+        DatabaseConfig(url="mysql://u:p@db/app")
+
+
+@pytest.mark.anyio
+async def test_pragmas_are_set_on_every_connection(tmp_path):
+    async with _sqlite(tmp_path, cache_size_kib=2048) as (engine, _, _):
+        async with engine.connect() as conn:
+            assert await conn.scalar(text("PRAGMA journal_mode")) == "wal"
+            assert await conn.scalar(text("PRAGMA synchronous")) == 1
+            assert await conn.scalar(text("PRAGMA cache_size")) == -2048
+            assert await conn.scalar(text("PRAGMA foreign_keys")) == 1
+
+
+@pytest.mark.anyio
+async def test_write_queue_serializes_writers_and_lets_reads_through(tmp_path):
+    # без ожидания в SQLite: параллельные писатели без очереди получили бы «database is locked»
+    async with _sqlite(tmp_path, busy_timeout_ms=0) as (_, queue, Session):
+        async with Session() as writer:
+            writer.add(Team(name="held"))
+            await writer.flush()
+            assert queue.stats()["writing"] is True
+
+            async def reader():
+                async with Session() as session:
+                    return (await session.scalars(select(Team.name))).all()
+
+            # чтение не ждёт незакоммиченную запись и не видит её
+            assert await asyncio.wait_for(asyncio.create_task(reader()), 1) == []
+            await writer.commit()
+        assert queue.stats()["writing"] is False
+
+        async def write(i: int):
+            async with Session() as session:
+                session.add(Team(name=f"team-{i}"))
+                await session.flush()
+                await asyncio.sleep(0)
+                await session.commit()
+
+        await asyncio.gather(*(asyncio.create_task(write(i)) for i in range(20)))
+        async with Session() as session:
+            assert len((await session.scalars(select(Team.id))).all()) == 21
+        assert queue.stats()["waited"] > 0
+
+
+@pytest.mark.anyio
+async def test_writers_without_queue_collide(tmp_path):
+    async with _sqlite(tmp_path, busy_timeout_ms=0, serialize_writes=False) as (_, queue, Session):
+        assert queue is None
+        async with Session() as first, Session() as second:
+            first.add(Team(name="a"))
+            await first.flush()
+            second.add(Team(name="b"))
+            with pytest.raises(OperationalError, match="locked"):
+                await second.flush()
+
+
+@pytest.mark.anyio
+async def test_concurrent_claims_on_sqlite_never_share_a_job(tmp_path):
+    async with _sqlite(tmp_path) as (_, _, Session):
+        async with Session() as session:
+            for i in range(12):
+                await JobCRUD.enqueue(session, "test.noop", {"i": i})
+            await session.commit()
+
+        async def claimer() -> list[int]:
+            claimed = []
+            while True:
+                async with Session() as session:
+                    job = await JobCRUD.claim(session, timedelta(minutes=5))
+                if job is None:
+                    return claimed
+                claimed.append(job.id)
+
+        results = await asyncio.gather(*(asyncio.create_task(claimer()) for _ in range(4)))
+        ids = [job_id for claimed in results for job_id in claimed]
+        assert sorted(ids) == list(range(1, 13))
@@ -0,0 +1,92 @@
+from array import array
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.evaluations import analytics
+from src.evaluations.analytics import compute_rating_stats, to_epoch
+from src.evaluations.crud import TaskEvaluationCRUD
+from src.evaluations.models import Evaluation
+from src.users.models import TeamRole
+from tests.helpers import _make_user, _make_task, _make_team
+
+
+MONDAY = datetime(2025, 3, 3, 12, 0, tzinfo=timezone.utc)
+
+
+def _columns(points):
+    return array("h", (v for v, _ in points)), array("d", (to_epoch(t) for _, t in points))
+
+
+POINTS = [
+    (2, MONDAY),
+    (4, MONDAY + timedelta(days=2)),
+    (5, MONDAY + timedelta(days=7)),
+    (5, MONDAY + timedelta(days=8)),
+    (3, MONDAY + timedelta(days=9)),
+]
+
+
+def test_compute_rating_stats_fallback(monkeypatch):
+    monkeypatch.setattr(analytics, "np", None)
+    stats = compute_rating_stats(*_columns(POINTS))
+
+    assert stats["count"] == 5
+    assert stats["avg"] == pytest.approx(3.8)
+    assert stats["p50"] == 4.0
+    assert stats["p90"] == pytest.approx(5.0)
+    assert stats["histogram"] == {1: 0, 2: 1, 3: 1, 4: 1, 5: 2}
+    assert [w["week_start"] for w in stats["weekly"]] == ["2025-03-03", "2025-03-10"]
+    assert [w["count"] for w in stats["weekly"]] == [2, 3]
+    assert stats["weekly"][0]["ewma"] == 3.0
+    assert stats["weekly"][1]["ewma"] == pytest.approx(0.3 * 13 / 3 + 0.7 * 3.0, abs=1e-3)
+
+
+def test_compute_rating_stats_numpy_matches_fallback(monkeypatch):
+    pytest.importorskip("numpy")
+    columns = _columns(POINTS)
+    vectorized = compute_rating_stats(*columns)
+    monkeypatch.setattr(analytics, "np", None)
+    assert compute_rating_stats(*columns) == vectorized
+
+
+def test_compute_rating_stats_empty():
+    stats = compute_rating_stats(array("h"), array("d"))
+    assert stats["count"] == 0 and stats["weekly"] == []
+
+
+@pytest.mark.anyio
+async def test_get_rating_columns_filters_and_orders_by_time(session: AsyncSession):
+    owner = await _make_user(session, "owner@example.com", role=TeamRole.admin)
+    team = await _make_team(session, "Team", owner_id=owner.id)
+    worker = await _make_user(session, "worker@example.com", team_id=team.id)
+
+    for i, (value, rated_at) in enumerate(reversed(POINTS)):
+        task = await _make_task(session, team_id=team.id, author_id=owner.id, name=f"T{i}")
+        task.assignee_id = worker.id if value != 3 else owner.id
+        session.add(Evaluation(task_id=task.id, value=value, rated_at=rated_at))
+    await session.flush()
+
+    values, stamps = await TaskEvaluationCRUD.get_rating_columns(
+        session,
+        team_id=team.id,
+        date_from=MONDAY - timedelta(days=1),
+        date_to=MONDAY + timedelta(days=30),
+        assignee_id=worker.id,
+    )
+
+    assert values.tolist() == [2, 4, 5, 5]
+    assert list(stamps) == sorted(stamps)
+
+
+@pytest.mark.anyio
+async def test_offloaded_stats_pool_is_shut_down(monkeypatch):
+    monkeypatch.setattr(analytics, "OFFLOAD_THRESHOLD", 1)
+    values, stamps = _columns(POINTS)
+    stats = await analytics.compute_rating_stats_async(values, stamps)
+    assert stats["count"] == len(POINTS) and analytics._pool is not None
+
+    analytics.shutdown_pool()
+    assert analytics._pool is None
+    analytics.shutdown_pool()
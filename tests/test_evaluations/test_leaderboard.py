@@ -0,0 +1,94 @@
+from datetime import datetime, timedelta, timezone
+
+import json
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.core.cache import response_cache
+from src.evaluations.crud import TaskEvaluationCRUD
+from src.evaluations.models import Evaluation
+from src.evaluations.router import ratings_leaderboard_endpoint
+from src.users.models import TeamRole
+from tests.helpers import _make_user, _make_task, _make_team
+
+
+async def _rate(session, task, assignee, value, rated_at):
+    task.assignee_id = assignee.id
+    session.add(Evaluation(task_id=task.id, value=value, rated_at=rated_at))
+    await session.flush()
+
+
+@pytest.mark.anyio
+async def test_leaderboard_ranks_with_ties_top_and_min_count(session: AsyncSession):
+    owner = await _make_user(session, "owner@example.com", role=TeamRole.admin)
+    team = await _make_team(session, "Team", owner_id=owner.id)
+    alice = await _make_user(session, "alice@example.com", team_id=team.id)
+    bob = await _make_user(session, "bob@example.com", team_id=team.id)
+    carol = await _make_user(session, "carol@example.com", team_id=team.id)
+
+    now = datetime.now(timezone.utc).replace(second=0, microsecond=0)
+    scores = [(alice, 5), (alice, 4), (bob, 5), (bob, 4), (carol, 3)]
+    for i, (user, value) in enumerate(scores):
+        task = await _make_task(session, team_id=team.id, author_id=owner.id, name=f"T{i}")
+        await _rate(session, task, user, value, now)
+    old = await _make_task(session, team_id=team.id, author_id=owner.id, name="Old")
+    await _rate(session, old, carol, 5, now - timedelta(days=30))
+
+    board = await TaskEvaluationCRUD.get_leaderboard(
+        session, team_id=team.id, date_from=now - timedelta(days=1), date_to=now,
+    )
+    assert [(row["rank"], row["email"]) for row in board] == [
+        (1, "alice@example.com"),
+        (1, "bob@example.com"),
+        (3, "carol@example.com"),
+    ]
+    assert board[0]["avg_rating"] == 4.5 and board[0]["count"] == 2
+
+    top = await TaskEvaluationCRUD.get_leaderboard(
+        session, team_id=team.id, date_from=now - timedelta(days=1), date_to=now, top=1,
+    )
+    assert [row["assignee_id"] for row in top] == [alice.id, bob.id]
+
+    regulars = await TaskEvaluationCRUD.get_leaderboard(
+        session, team_id=team.id, date_from=now - timedelta(days=1), date_to=now, min_count=2,
+    )
+    assert {row["assignee_id"] for row in regulars} == {alice.id, bob.id}
+
+
+@pytest.mark.anyio
+async def test_leaderboard_is_cached_until_rate_task(session: AsyncSession):
+    owner = await _make_user(session, "owner@example.com", role=TeamRole.admin)
+    team = await _make_team(session, "Team", owner_id=owner.id)
+    worker = await _make_user(session, "worker@example.com", team_id=team.id)
+    tasks = []
+    for name in ("First", "Second", "Third"):
+        task = await _make_task(session, team_id=team.id, author_id=owner.id, name=name)
+        task.assignee_id = worker.id
+        tasks.append(task)
+    await session.flush()
+
+    now = datetime.now(timezone.utc).replace(second=0, microsecond=0)
+    period = dict(date_from=now - timedelta(days=1), date_to=now + timedelta(days=1))
+
+    async def items():
+        response = await ratings_leaderboard_endpoint(
+            team_id=team.id, session=session, user=owner, top=None, min_count=1, **period,
+        )
+        return json.loads(response.body)["items"]
+
+    await TaskEvaluationCRUD.rate_task(session, team_id=team.id, task_id=tasks[0].id, rating=2)
+    board = await items()
+    assert board[0]["count"] == 1
+
+    session.add(Evaluation(task_id=tasks[1].id, value=3, rated_at=now))
+    await session.flush()
+    hits = response_cache.hits
+    cached = await items()
+    assert cached[0]["count"] == 1
+    assert response_cache.hits == hits + 1
+
+    await TaskEvaluationCRUD.rate_task(session, team_id=team.id, task_id=tasks[2].id, rating=4)
+    fresh = await items()
+    assert fresh[0]["count"] == 3
+    assert fresh[0]["avg_rating"] == 3.0
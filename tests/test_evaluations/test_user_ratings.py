@@ -0,0 +1,53 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.evaluations.crud import TaskEvaluationCRUD
+from src.evaluations.models import Evaluation
+from src.tasks.models import Status
+from src.users.models import TeamRole
+from tests.helpers import _make_user, _make_task, _make_team
+
+
+@pytest.mark.anyio
+async def test_list_user_ratings_aggregates_in_sql_and_pages_by_cursor(session: AsyncSession):
+    owner = await _make_user(session, "owner@example.com", role=TeamRole.admin)
+    team = await _make_team(session, "Team", owner_id=owner.id)
+    worker = await _make_user(session, "worker@example.com", team_id=team.id)
+    other = await _make_user(session, "other@example.com", team_id=team.id)
+
+    base = datetime.now(timezone.utc).replace(second=0, microsecond=0)
+    values = [5, 4, 3, 2]
+    tasks = []
+    for i, value in enumerate(values):
+        t = await _make_task(session, team_id=team.id, author_id=owner.id, name=f"T{i}")
+        t.assignee_id = worker.id
+        tasks.append(t)
+        session.add(Evaluation(task_id=t.id, value=value, rated_at=base - timedelta(days=i)))
+    foreign = await _make_task(session, team_id=team.id, author_id=owner.id, name="Other")
+    foreign.assignee_id = other.id
+    session.add(Evaluation(task_id=foreign.id, value=1, rated_at=base))
+    not_done = await _make_task(session, team_id=team.id, author_id=owner.id, name="Open", status=Status.open)
+    not_done.assignee_id = worker.id
+    session.add(Evaluation(task_id=not_done.id, value=1, rated_at=base))
+    await session.flush()
+
+    page, avg, count = await TaskEvaluationCRUD.list_user_ratings(
+        session, team_id=team.id, assignee_id=worker.id, limit=3,
+    )
+
+    assert count == 4
+    assert avg == pytest.approx(3.5)
+    assert [row.task_id for row in page] == [t.id for t in tasks[:3]]
+    assert [row.rating for row in page] == values[:3]
+    assert page[0].name == "T0"
+
+    last = page[-1]
+    rest, avg_again, count_again = await TaskEvaluationCRUD.list_user_ratings(
+        session, team_id=team.id, assignee_id=worker.id, limit=3,
+        before=(last.rated_at, last.task_id),
+    )
+
+    assert [row.task_id for row in rest] == [tasks[3].id]
+    assert (avg_again, count_again) == (avg, count)
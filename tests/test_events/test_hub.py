@@ -0,0 +1,87 @@
+import asyncio
+import json
+from datetime import datetime
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.events.hub import EventHub, KEEPALIVE, RESYNC, hub
+from src.sync.crud import record_change
+from src.tasks.crud import TaskCRUD
+from tests.helpers import _make_user, _make_team
+
+
+def _data(message: bytes) -> dict:
+    event, data = message.decode().strip().split("\n")
+    assert event == "event: change"
+    return json.loads(data.removeprefix("data: "))
+
+
+@pytest.mark.anyio
+async def test_task_changes_are_published_after_commit(session: AsyncSession):
+    team = await _make_team(session, "Alpha")
+    other = await _make_team(session, "Beta")
+    author = await _make_user(session, "author@a.com", team_id=team.id)
+    subscriber = hub.subscribe(team.id)
+    bystander = hub.subscribe(other.id)
+    try:
+        task = await TaskCRUD.create_task(
+            session, team_id=team.id, author_id=author.id, name="Ship",
+            description="-", deadline_at=datetime(2025, 1, 1),
+        )
+
+        change = _data(subscriber.queue.get_nowait())
+        assert (change["entity"], change["id"], change["op"]) == ("task", task.id, "upsert")
+        assert change["data"]["name"] == "Ship"
+        assert subscriber.queue.empty()
+        assert bystander.queue.empty()
+    finally:
+        hub.unsubscribe(subscriber)
+        hub.unsubscribe(bystander)
+
+
+@pytest.mark.anyio
+async def test_rolled_back_changes_are_not_published(session: AsyncSession):
+    team = await _make_team(session, "Alpha")
+    team_id = team.id
+    await session.commit()
+    subscriber = hub.subscribe(team_id)
+    try:
+        await record_change(session, team_id, "task", 1)
+        await session.rollback()
+        await record_change(session, team_id, "task", 2)
+        await session.commit()
+
+        assert _data(subscriber.queue.get_nowait())["id"] == 2
+        assert subscriber.queue.empty()
+    finally:
+        hub.unsubscribe(subscriber)
+
+
+@pytest.mark.anyio
+async def test_slow_subscriber_is_dropped_with_resync():
+    local = EventHub(queue_size=2)
+    slow = local.subscribe(1)
+    stream = local.stream(1)
+    assert await anext(stream) == b"retry: 5000\n\n"
+    fast = next(s for s in local._subscribers[1] if s is not slow)
+
+    local.publish(1, [{"n": 1}, {"n": 2}])
+    assert [_data(await anext(stream))["n"] for _ in range(2)] == [1, 2]
+    local.publish(1, [{"n": 3}])
+
+    assert slow.dropped and not fast.dropped
+    assert slow.queue.get_nowait() is RESYNC
+    assert local.subscriber_count(1) == 1
+    assert local.dropped == 1
+    await stream.aclose()
+    assert local.subscriber_count() == 0
+
+
+@pytest.mark.anyio
+async def test_idle_stream_sends_keepalive():
+    local = EventHub(keepalive=0.01)
+    stream = local.stream(1)
+    await anext(stream)
+    assert await asyncio.wait_for(anext(stream), 1) == KEEPALIVE
+    await stream.aclose()
@@ -0,0 +1,130 @@
+from datetime import datetime
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from src.config import JobsConfig
+from src.jobs.crud import JobCRUD
+from src.jobs.models import Job, JobStatus
+from src.jobs.worker import JobWorker
+from src.meetings.availability import freebusy_cache, get_free_busy
+from src.meetings.models import Meeting
+from src.sync.models import ChangeLog, ChangeOp
+from src.tasks.models import Task
+from src.teams.jobs import TEAM_DELETE, TEAM_EXPORT
+from src.teams.models import Team
+from src.users.models import TeamRole, User
+from tests.helpers import _make_meeting, _make_task, _make_team, _make_user
+
+
+async def _team_with_content(session: AsyncSession):
+    team = await _make_team(session, "Big")
+    admin = await _make_user(session, "admin@big.com", role=TeamRole.admin, team_id=team.id)
+    for i in range(5):
+        await _make_task(session, team_id=team.id, author_id=admin.id, name=f"T{i}")
+    for i in range(3):
+        await _make_meeting(
+            session, team_id=team.id, title=f"M{i}",
+            starts_at=datetime(2025, 1, 1, 9 + i), ends_at=datetime(2025, 1, 1, 9 + i, 30),
+            participants=[admin],
+        )
+    return team.id, admin.id
+
+
+@pytest.mark.anyio
+async def test_team_delete_job_runs_in_chunks_with_progress(session: AsyncSession, engine):
+    team_id, admin_id = await _team_with_content(session)
+    job = await JobCRUD.enqueue(session, TEAM_DELETE, {"team_id": team_id}, user_id=admin_id, team_id=team_id, unique=True)
+    job_id = job.id
+    await session.commit()
+    again = await JobCRUD.enqueue(session, TEAM_DELETE, {"team_id": team_id}, team_id=team_id, unique=True)
+    assert again.id == job_id
+
+    worker = JobWorker(async_sessionmaker(engine, expire_on_commit=False), JobsConfig(chunk_size=2))
+    assert await worker.run_once() is True
+    assert await worker.run_once() is False
+
+    session.expire_all()
+    job = await session.get(Job, job_id)
+    assert job.status == JobStatus.done
+    assert (job.progress_done, job.progress_total) == (8, 8)
+    assert job.result == {"team_id": team_id, "team_deleted": True, "meetings": 3, "tasks": 5}
+    assert await session.get(Team, team_id) is None
+    assert await session.scalar(select(func.count()).select_from(Task)) == 0
+    assert await session.scalar(select(func.count()).select_from(Meeting)) == 0
+    assert (await session.get(User, admin_id)).team_id is None
+
+
+@pytest.mark.anyio
+async def test_team_delete_job_records_tombstones_and_drops_guest_calendars(session: AsyncSession, engine):
+    team_id, admin_id = await _team_with_content(session)
+    other = await _make_team(session, "Other")
+    guest = await _make_user(session, "guest@other.com", team_id=other.id)
+    guest_id = guest.id
+    await _make_meeting(
+        session, team_id=team_id, title="Joint",
+        starts_at=datetime(2025, 1, 2, 9), ends_at=datetime(2025, 1, 2, 10),
+        participants=[guest],
+    )
+    day = (datetime(2025, 1, 2), datetime(2025, 1, 3))
+    assert await get_free_busy(session, [guest_id], *day) == {guest_id: [(datetime(2025, 1, 2, 9), datetime(2025, 1, 2, 10))]}
+    await JobCRUD.enqueue(session, TEAM_DELETE, {"team_id": team_id}, team_id=team_id)
+    await session.commit()
+
+    worker = JobWorker(async_sessionmaker(engine, expire_on_commit=False), JobsConfig(chunk_size=2))
+    assert await worker.run_once() is True
+
+    assert len(freebusy_cache) == 0
+    assert await get_free_busy(session, [guest_id], *day) == {guest_id: []}
+    rows = (await session.execute(
+        select(ChangeLog.entity, func.count())
+        .where(ChangeLog.team_id == team_id, ChangeLog.op == ChangeOp.delete)
+        .group_by(ChangeLog.entity)
+    )).all()
+    assert dict(rows) == {"meeting": 4, "task": 5, "membership": 1, "team": 1}
+
+
+@pytest.mark.anyio
+async def test_team_export_job_and_access(session: AsyncSession, engine):
+    team_id, admin_id = await _team_with_content(session)
+    stranger_id = (await _make_user(session, "stranger@x.com")).id
+    job = await JobCRUD.enqueue(session, TEAM_EXPORT, {"team_id": team_id}, user_id=admin_id, team_id=team_id)
+    job_id = job.id
+    await session.commit()
+
+    worker = JobWorker(async_sessionmaker(engine, expire_on_commit=False), JobsConfig(chunk_size=2))
+    await worker.run_once()
+
+    session.expire_all()
+    admin = await session.get(User, admin_id)
+    job = await JobCRUD.get_job(session, job_id, admin)
+    assert job.status == JobStatus.done
+    assert job.result["team"]["name"] == "Big"
+    assert [t["name"] for t in job.result["tasks"]] == [f"T{i}" for i in range(5)]
+    assert len(job.result["meetings"]) == 3
+    assert job.result["members"] == [{"user_id": admin_id, "team_id": team_id, "role": "admin"}]
+    with pytest.raises(HTTPException) as exc:
+        await JobCRUD.get_job(session, job_id, await session.get(User, stranger_id))
+    assert exc.value.status_code == 404
+
+
+@pytest.mark.anyio
+async def test_failing_job_is_retried_then_marked_failed(session: AsyncSession, engine):
+    job = await JobCRUD.enqueue(session, "no.such.kind", {})
+    job_id = job.id
+    await session.commit()
+
+    worker = JobWorker(async_sessionmaker(engine, expire_on_commit=False), JobsConfig(max_attempts=2))
+    assert await worker.run_once() is True
+    session.expire_all()
+    assert (await session.get(Job, job_id)).status == JobStatus.queued
+
+    assert await worker.run_once() is True
+    assert await worker.run_once() is False
+    session.expire_all()
+    job = await session.get(Job, job_id)
+    assert job.status == JobStatus.failed
+    assert job.attempts == 2
+    assert "Unknown job kind" in job.error
@@ -0,0 +1,51 @@
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.meetings.availability import check_overlaps, sweep_overlaps
+from src.meetings.models import MeetingSeries, RecurrenceFreq
+from tests.helpers import _make_team, _make_meeting
+
+
+START = datetime(2025, 6, 2, 10, 0, 0)
+
+
+def _at(hours: float) -> datetime:
+    return START + timedelta(hours=hours)
+
+
+def test_sweep_overlaps_half_open_and_nested():
+    busy = [(_at(0), _at(1)), (_at(2), _at(5)), (_at(3), _at(4))]
+    candidates = [
+        (_at(1), _at(2)),      # касается обеих соседних встреч
+        (_at(0.5), _at(2.5)),
+        (_at(3.5), _at(3.6)),
+        (_at(6), _at(7)),
+    ]
+    assert sweep_overlaps(candidates, busy) == [[], [0, 1], [1, 2], []]
+
+
+@pytest.mark.anyio
+async def test_check_overlaps_reports_meetings_and_series_tail(session: AsyncSession):
+    team = await _make_team(session, "Alpha")
+    other = await _make_team(session, "Beta")
+    first = await _make_meeting(session, team_id=team.id, starts_at=_at(0), ends_at=_at(1))
+    await _make_meeting(session, team_id=team.id, starts_at=_at(2), ends_at=_at(3), status="canceled")
+    await _make_meeting(session, team_id=other.id, starts_at=_at(2), ends_at=_at(3))
+    series = MeetingSeries(
+        team_id=team.id, title="standup",
+        starts_at=_at(24), ends_at=_at(24.5),
+        freq=RecurrenceFreq.daily, interval=1, until=None, exdates=[],
+        materialized_until=_at(0),
+    )
+    session.add(series)
+    await session.commit()
+
+    results = await check_overlaps(session, team.id, [
+        (_at(0.5), _at(1.5)),
+        (_at(2), _at(3)),
+        (_at(24), _at(25)),
+    ])
+
+    assert results == [([first.id], []), ([], []), ([], [series.id])]
@@ -3,10 +3,11 @@ from datetime import datetime, timedelta
 import pytest
 from fastapi import HTTPException
 from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.meetings.crud import MeetingCRUD
-from src.meetings.checks.check_time import ensure_no_overlap
+from src.meetings.checks.check_time import ensure_no_overlap, is_overlap_violation
 from src.meetings.models import Meeting
 from src.meetings.schemas import MeetingCreate, MeetingOut
 from src.users.models import TeamRole
@@ -115,3 +116,18 @@ async def test_back_to_back_meetings_are_allowed(session: AsyncSession):
     ).scalars().all()
     assert any(m.id == created2.id for m in rows)
     assert created2.starts_at == start2 and created2.ends_at == end2
+
+
+def test_is_overlap_violation_matches_exclusion_errors_only():
+    class PgError(Exception):
+        sqlstate = "23P01"
+
+    class UniqueError(Exception):
+        sqlstate = "23505"
+
+    assert is_overlap_violation(IntegrityError("INSERT", {}, PgError("conflicting key value")))
+    assert is_overlap_violation(
+        IntegrityError("INSERT", {}, Exception('violates exclusion constraint "ex_meeting_team_overlap"'))
+    )
+    assert not is_overlap_violation(IntegrityError("INSERT", {}, UniqueError("duplicate key")))
+
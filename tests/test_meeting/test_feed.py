@@ -0,0 +1,150 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import event, func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.requests import Request
+
+from src.meetings import crud as meetings_crud
+from src.meetings.feed import (
+    _fold,
+    feed_cache,
+    feed_token,
+    get_feed,
+    user_id_from_token,
+)
+from src.meetings.router import get_calendar_feed
+from src.sync.models import ChangeLog
+from src.tasks.crud import TaskCRUD
+from tests.helpers import _make_user, _make_team, _make_meeting, _make_task
+
+
+@pytest.fixture(autouse=True)
+def _clear_feed_caches():
+    feed_cache.clear()
+    yield
+    feed_cache.clear()
+
+
+def _request(**headers: str) -> Request:
+    return Request({
+        "type": "http",
+        "method": "GET",
+        "headers": [(k.replace("_", "-").encode(), v.encode()) for k, v in headers.items()],
+    })
+
+
+def test_feed_token_roundtrip_and_tampering():
+    token = feed_token(42)
+
+    assert user_id_from_token(token) == 42
+    assert user_id_from_token(token.replace("42-", "43-", 1)) is None
+    assert user_id_from_token("42-" + "0" * 32) is None
+    assert user_id_from_token("garbage") is None
+
+
+def test_fold_keeps_lines_within_75_octets():
+    line = "SUMMARY:" + "встреча " * 30
+
+    folded = _fold(line)
+
+    assert all(len(part.encode()) <= 75 for part in folded.split("\r\n"))
+    assert folded.replace("\r\n ", "") == line
+
+
+@pytest.mark.anyio
+async def test_feed_is_cached_until_users_task_changes(session: AsyncSession, engine):
+    team = await _make_team(session, "Alpha")
+    author = await _make_user(session, "boss@a.com", team_id=team.id)
+    user = await _make_user(session, "ann@a.com", team_id=team.id)
+    now = datetime.now().replace(microsecond=0)
+    await _make_meeting(
+        session, team_id=team.id, title="Sync; weekly",
+        starts_at=now + timedelta(days=1), ends_at=now + timedelta(days=1, hours=1),
+        participants=[user],
+    )
+    task = await _make_task(session, team_id=team.id, author_id=author.id, name="Report")
+    task.assignee_id = user.id
+    await session.commit()
+
+    entry = await get_feed(session, user.id)
+    body = entry.body.decode()
+    assert body.startswith("BEGIN:VCALENDAR\r\n") and body.endswith("END:VCALENDAR\r\n")
+    assert r"SUMMARY:Sync\; weekly" in body
+    assert "BEGIN:VTODO" in body and "SUMMARY:Report" in body
+
+    queries = []
+    listener = lambda *args: queries.append(args)
+    event.listen(engine.sync_engine, "before_cursor_execute", listener)
+    try:
+        assert await get_feed(session, user.id) is entry
+    finally:
+        event.remove(engine.sync_engine, "before_cursor_execute", listener)
+    assert queries == []
+
+    await TaskCRUD().update_task(session, team.id, task.id, {"name": "Quarterly report"}, author)
+
+    rebuilt = await get_feed(session, user.id)
+    assert rebuilt is not entry and rebuilt.etag != entry.etag
+    assert "SUMMARY:Quarterly report" in rebuilt.body.decode()
+
+
+@pytest.mark.anyio
+async def test_feed_endpoint_answers_304_for_matching_etag(session: AsyncSession):
+    team = await _make_team(session, "Beta")
+    user = await _make_user(session, "bob@b.com", team_id=team.id)
+    token = feed_token(user.id)
+
+    first = await get_calendar_feed(token, _request(), session)
+    assert first.status_code == 200
+    assert first.media_type.startswith("text/calendar")
+
+    etag = first.headers["etag"]
+    repeated = await get_calendar_feed(token, _request(if_none_match=etag), session)
+    assert repeated.status_code == 304
+    assert repeated.headers["etag"] == etag
+
+    since = await get_calendar_feed(token, _request(if_modified_since=first.headers["last-modified"]), session)
+    assert since.status_code == 304
+
+
+@pytest.mark.anyio
+async def test_feed_pages_past_meeting_limit_and_writes_utc_times(session: AsyncSession, monkeypatch):
+    monkeypatch.setattr(meetings_crud, "MAX_USER_MEETINGS_LIMIT", 2)
+    team = await _make_team(session, "Gamma")
+    user = await _make_user(session, "cat@g.com", team_id=team.id)
+    now = datetime(2025, 3, 3, 9, 0)
+    for day in range(5):
+        await _make_meeting(
+            session, team_id=team.id, title=f"M{day}",
+            starts_at=now + timedelta(days=day), ends_at=now + timedelta(days=day, hours=1),
+            participants=[user],
+        )
+
+    body = (await get_feed(session, user.id, now=now)).body.decode()
+
+    assert body.count("BEGIN:VEVENT") == 5
+    assert "DTSTART:20250303T090000Z\r\n" in body
+    assert "DTEND:20250307T100000Z\r\n" in body
+
+
+@pytest.mark.anyio
+async def test_feed_last_modified_comes_from_data(session: AsyncSession):
+    team = await _make_team(session, "Delta")
+    author = await _make_user(session, "boss@d.com", team_id=team.id)
+    user = await _make_user(session, "dan@d.com", team_id=team.id)
+    task = await TaskCRUD.create_task(
+        session, team_id=team.id, author_id=author.id, name="Plan",
+        description="-", deadline_at=datetime(2030, 1, 1),
+    )
+    await TaskCRUD().update_task(session, team.id, task.id, {"assignee_id": user.id}, author)
+
+    logged_at = datetime(2030, 1, 1, 12, 0, tzinfo=timezone.utc)
+    await session.execute(update(ChangeLog).where(ChangeLog.team_id == team.id).values(created_at=logged_at))
+    await session.commit()
+
+    first = await get_feed(session, user.id)
+    assert first.last_modified == logged_at
+    feed_cache.clear()
+    again = await get_feed(session, user.id)
+    assert again is not first and again.last_modified == first.last_modified
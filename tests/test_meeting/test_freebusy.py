@@ -0,0 +1,107 @@
+from datetime import datetime, timedelta
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.meetings.availability import (
+    ensure_team_members,
+    freebusy_cache,
+    get_free_busy,
+    merge_intervals,
+)
+from src.meetings.crud import MeetingCRUD
+from src.meetings.schemas import FreeBusyRequest, SlotSuggestRequest, TimeSlot
+from tests.helpers import _make_user, _make_team, _make_meeting
+
+
+DAY = datetime(2025, 4, 7, 0, 0, 0)
+
+
+def _at(hour: int, minute: int = 0) -> datetime:
+    return DAY + timedelta(hours=hour, minutes=minute)
+
+
+@pytest.fixture(autouse=True)
+def _clear_freebusy_cache():
+    freebusy_cache.clear()
+    yield
+    freebusy_cache.clear()
+
+
+def test_merge_intervals_joins_overlapping_and_adjacent():
+    merged = merge_intervals([
+        (_at(13), _at(14)),
+        (_at(9), _at(10)),
+        (_at(9, 30), _at(11)),
+        (_at(11), _at(11, 30)),
+        (_at(10), _at(10, 15)),
+    ])
+    assert merged == [(_at(9), _at(11, 30)), (_at(13), _at(14))]
+
+
+@pytest.mark.anyio
+async def test_get_free_busy_merges_per_user_and_clips_to_window(session: AsyncSession):
+    team = await _make_team(session, "Alpha")
+    ann = await _make_user(session, "ann@a.com", team_id=team.id)
+    bob = await _make_user(session, "bob@a.com", team_id=team.id)
+    other_team = await _make_team(session, "Beta")
+
+    await _make_meeting(session, team_id=team.id, title="m1", starts_at=_at(7), ends_at=_at(9), participants=[ann])
+    await _make_meeting(session, team_id=other_team.id, title="m2", starts_at=_at(8, 30), ends_at=_at(10), participants=[ann, bob])
+    await _make_meeting(session, team_id=team.id, title="m3", starts_at=_at(12), ends_at=_at(13), participants=[bob])
+    await _make_meeting(session, team_id=team.id, title="m4", status="canceled", starts_at=_at(15), ends_at=_at(16), participants=[bob])
+
+    busy = await get_free_busy(session, [bob.id, ann.id], _at(8), _at(18))
+
+    assert list(busy) == [bob.id, ann.id]
+    assert busy[ann.id] == [(_at(8), _at(10))]
+    assert busy[bob.id] == [(_at(8, 30), _at(10)), (_at(12), _at(13))]
+
+
+def test_request_times_with_timezone_become_naive_utc():
+    request = FreeBusyRequest(user_ids=[1], starts_at="2025-04-07T10:00:00+02:00", ends_at="2025-04-07T18:00:00Z")
+    assert (request.starts_at, request.ends_at) == (_at(8), _at(18))
+    slot = TimeSlot(starts_at="2025-04-07T08:00:00Z", ends_at="2025-04-07T09:00:00")
+    assert slot.starts_at.tzinfo is None and slot.starts_at < slot.ends_at
+    suggest = SlotSuggestRequest(user_ids=[1], starts_at="2025-04-07T08:00:00Z", ends_at=_at(18), duration_minutes=30)
+    assert suggest.starts_at == _at(8)
+
+
+@pytest.mark.anyio
+async def test_get_free_busy_accepts_timezone_aware_request(session: AsyncSession):
+    team = await _make_team(session, "Alpha")
+    ann = await _make_user(session, "ann@a.com", team_id=team.id)
+    await _make_meeting(session, team_id=team.id, starts_at=_at(9), ends_at=_at(10), participants=[ann])
+
+    request = FreeBusyRequest(user_ids=[ann.id], starts_at="2025-04-07T08:00:00Z", ends_at="2025-04-07T09:30:00Z")
+    busy = await get_free_busy(session, request.user_ids, request.starts_at, request.ends_at)
+    assert busy == {ann.id: [(_at(9), _at(9, 30))]}
+
+
+@pytest.mark.anyio
+async def test_get_free_busy_cache_is_invalidated_by_meeting_changes(session: AsyncSession):
+    team = await _make_team(session, "Gamma")
+    ann = await _make_user(session, "ann@g.com", team_id=team.id)
+    meeting = await _make_meeting(session, team_id=team.id, starts_at=_at(9), ends_at=_at(10), participants=[ann])
+
+    assert await get_free_busy(session, [ann.id], _at(0), _at(23)) == {ann.id: [(_at(9), _at(10))]}
+    assert len(freebusy_cache) == 1
+
+    await MeetingCRUD.delete_meeting(meeting.id, session)
+
+    assert len(freebusy_cache) == 0
+    assert await get_free_busy(session, [ann.id], _at(0), _at(23)) == {ann.id: []}
+
+
+@pytest.mark.anyio
+async def test_ensure_team_members_rejects_outsiders(session: AsyncSession):
+    team = await _make_team(session, "Delta")
+    member = await _make_user(session, "in@d.com", team_id=team.id)
+    outsider = await _make_user(session, "out@d.com")
+
+    await ensure_team_members(session, team.id, [member.id])
+    with pytest.raises(HTTPException) as exc:
+        await ensure_team_members(session, team.id, [member.id, outsider.id])
+    assert exc.value.status_code == 403
+    assert str(outsider.id) in exc.value.detail
@@ -68,6 +68,37 @@ async def test_get_user_meetings_respects_status_time_and_limit(session: AsyncSe
     assert len(result) == 1 and result[0].id == m_ok.id
 
 
+@pytest.mark.anyio
+async def test_get_user_meetings_keyset_pages_by_start_and_id(session: AsyncSession):
+    team = await _make_team(session, "Kappa")
+    req = await _make_user(session, "req@k.com", team_id=team.id)
+    other = await _make_user(session, "other@k.com", team_id=team.id)
+
+    start = datetime(2025, 5, 5, 9, 0)
+    mine = [
+        await _make_meeting(
+            session, team_id=team.id, title=f"m{i}",
+            starts_at=start + timedelta(hours=i // 2), ends_at=start + timedelta(hours=i // 2, minutes=30),
+            participants=[req, other],
+        )
+        for i in range(5)
+    ]
+    await _make_meeting(
+        session, team_id=team.id, title="foreign",
+        starts_at=start, ends_at=start + timedelta(minutes=30), participants=[other],
+    )
+
+    pages, after = [], None
+    while True:
+        page = await MeetingCRUD.get_user_meetings(session=session, requester=req, limit=2, after=after)
+        if not page:
+            break
+        pages.append([m.id for m in page])
+        after = (page[-1].starts_at, page[-1].id)
+
+    assert pages == [[mine[0].id, mine[1].id], [mine[2].id, mine[3].id], [mine[4].id]]
+
+
 @pytest.mark.anyio
 async def test_get_team_meetings_sorted_desc(session: AsyncSession):
     team = await _make_team(session, "Omega")
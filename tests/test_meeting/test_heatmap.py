@@ -0,0 +1,60 @@
+from datetime import date, datetime, timedelta
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.meetings.heatmap import get_heatmap
+from src.meetings.models import MeetingSeries, RecurrenceFreq
+from src.users.models import TeamRole
+from tests.helpers import _make_user, _make_team, _make_meeting
+
+
+MONDAY = datetime(2025, 6, 2, 10, 0, 0)
+
+
+@pytest.mark.anyio
+async def test_heatmap_my_scope_counts_day_buckets(session: AsyncSession):
+    team = await _make_team(session, "Alpha")
+    me = await _make_user(session, "me@a.com", team_id=team.id)
+    other = await _make_user(session, "other@a.com", team_id=team.id)
+    await _make_meeting(session, team_id=team.id, starts_at=MONDAY, ends_at=MONDAY + timedelta(minutes=30), participants=[me])
+    later = MONDAY + timedelta(hours=2)
+    await _make_meeting(session, team_id=team.id, starts_at=later, ends_at=later + timedelta(minutes=90), participants=[me])
+    wednesday = MONDAY + timedelta(days=2)
+    await _make_meeting(session, team_id=team.id, starts_at=wednesday, ends_at=wednesday + timedelta(hours=1), participants=[me])
+    await _make_meeting(
+        session, team_id=team.id, starts_at=wednesday + timedelta(hours=3),
+        ends_at=wednesday + timedelta(hours=4), participants=[me], status="canceled",
+    )
+    await _make_meeting(session, team_id=team.id, starts_at=MONDAY - timedelta(hours=5), ends_at=MONDAY - timedelta(hours=4), participants=[other])
+
+    starts, counts, minutes = await get_heatmap(session, me, date(2025, 6, 1), date(2025, 6, 4))
+
+    assert starts == date(2025, 6, 1)
+    assert counts == [0, 2, 0, 1]
+    assert minutes == [0, 120, 0, 60]
+
+
+@pytest.mark.anyio
+async def test_heatmap_team_scope_week_buckets_include_series_tail(session: AsyncSession):
+    team = await _make_team(session, "Alpha")
+    boss = await _make_user(session, "boss@a.com", role=TeamRole.manager, team_id=team.id)
+    await _make_meeting(session, team_id=team.id, starts_at=MONDAY, ends_at=MONDAY + timedelta(minutes=45))
+    sunday = MONDAY + timedelta(days=6)
+    await _make_meeting(session, team_id=team.id, starts_at=sunday, ends_at=sunday + timedelta(minutes=15))
+    # Серия без материализованных вхождений: всё окно — за горизонтом.
+    session.add(MeetingSeries(
+        team_id=team.id, title="standup",
+        starts_at=MONDAY + timedelta(days=7, hours=2), ends_at=MONDAY + timedelta(days=7, hours=2, minutes=10),
+        freq=RecurrenceFreq.daily, interval=1, until=None, exdates=[],
+        materialized_until=MONDAY,
+    ))
+    await session.commit()
+
+    starts, counts, minutes = await get_heatmap(
+        session, boss, date(2025, 6, 4), date(2025, 6, 10), bucket="week", scope="team",
+    )
+
+    assert starts == date(2025, 6, 2)
+    assert counts == [2, 7]
+    assert minutes == [60, 70]
@@ -0,0 +1,106 @@
+from datetime import datetime, timedelta
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import event, inspect
+from sqlalchemy.exc import InvalidRequestError
+from sqlalchemy.orm import raiseload
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from src.meetings.crud import MeetingCRUD
+from src.meetings.models import Meeting
+from src.teams.crud import TeamCRUD
+from src.teams.models import Team
+from src.users.models import TeamRole, User
+from tests.helpers import _make_user, _make_team, _make_meeting
+
+
+START = datetime(2025, 3, 3, 9, 0, 0)
+
+
+GUARDED = {Meeting: "participants", User: "meetings", Team: "meetings"}
+
+
+@pytest_asyncio.fixture
+async def guarded(engine):
+    """Сессия, в которой любое обращение к незагруженным связям встреч падает."""
+    Session = async_sessionmaker(engine, expire_on_commit=False, class_=AsyncSession)
+    async with Session() as s:
+        @event.listens_for(s.sync_session, "do_orm_execute")
+        def _guard(state):
+            if state.is_select:
+                entities = [
+                    col["entity"] for col in state.statement.column_descriptions
+                    if col["expr"] is col["entity"] and col["entity"] in GUARDED
+                ]
+                state.statement = state.statement.options(*(
+                    raiseload(getattr(entity, GUARDED[entity])) for entity in entities
+                ))
+        yield s
+
+
+@pytest.fixture
+def queries(engine):
+    executed: list[str] = []
+
+    def _count(conn, cursor, statement, *args):
+        executed.append(statement)
+
+    event.listen(engine.sync_engine, "before_cursor_execute", _count)
+    yield executed
+    event.remove(engine.sync_engine, "before_cursor_execute", _count)
+
+
+async def _populate(session: AsyncSession) -> tuple[int, int]:
+    team = await _make_team(session, "Alpha")
+    users = [
+        await _make_user(session, f"u{i}@a.com", role=TeamRole.manager, team_id=team.id)
+        for i in range(3)
+    ]
+    for i in range(5):
+        await _make_meeting(
+            session, team_id=team.id, title=f"m{i}",
+            starts_at=START + timedelta(hours=i), ends_at=START + timedelta(hours=i, minutes=30),
+            participants=users,
+        )
+    return team.id, users[0].id
+
+
+@pytest.mark.anyio
+async def test_loading_user_and_team_does_not_pull_meetings(session, guarded, queries):
+    team_id, user_id = await _populate(session)
+    queries.clear()
+
+    user = await guarded.get(User, user_id)
+    team = await guarded.get(Team, team_id)
+
+    assert len(queries) == 2
+    assert "meetings" in inspect(user).unloaded
+    assert "meetings" in inspect(team).unloaded
+    with pytest.raises(InvalidRequestError):
+        user.meetings
+
+
+@pytest.mark.anyio
+async def test_team_crud_runs_under_raiseload(session, guarded, queries):
+    team_id, _ = await _populate(session)
+    queries.clear()
+
+    team = await TeamCRUD.get_team(team_id, guarded)
+
+    assert len(team.members) == 3
+    assert len(queries) == 2
+
+
+@pytest.mark.anyio
+async def test_meeting_lists_run_under_raiseload(session, guarded, queries):
+    _, user_id = await _populate(session)
+    user = await guarded.get(User, user_id)
+    queries.clear()
+
+    mine = await MeetingCRUD.get_user_meetings(guarded, user)
+    team = await MeetingCRUD.get_team_meetings(guarded, user)
+
+    assert len(mine) == len(team) == 5
+    assert len(queries) == 2
+    assert all("participants" in inspect(m).unloaded for m in mine)
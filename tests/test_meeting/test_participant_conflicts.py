@@ -0,0 +1,113 @@
+from datetime import datetime, timedelta
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.meetings.availability import find_busy_participants
+from src.meetings.crud import MeetingCRUD
+from src.meetings.schemas import MeetingCreate, MeetingUpdate
+from src.users.models import TeamRole
+from tests.helpers import _make_meeting, _make_user, _make_team
+
+
+START = datetime(2025, 6, 2, 10, 0, 0)
+crud = MeetingCRUD()
+
+
+async def _create(session, manager, title, starts_at, participant_ids, check=False):
+    return await MeetingCRUD.create_meeting(
+        user=manager,
+        payload=MeetingCreate(
+            title=title, description=None,
+            starts_at=starts_at, ends_at=starts_at + timedelta(hours=1),
+            participant_ids=participant_ids,
+        ),
+        session=session,
+        check_participants=check,
+    )
+
+
+@pytest.mark.anyio
+async def test_invitee_busy_in_another_team_is_rejected(session: AsyncSession):
+    alpha = await _make_team(session, "Alpha")
+    beta = await _make_team(session, "Beta")
+    alpha_boss = await _make_user(session, "boss@a.com", role=TeamRole.manager, team_id=alpha.id)
+    beta_boss = await _make_user(session, "boss@b.com", role=TeamRole.manager, team_id=beta.id)
+    shared = await _make_user(session, "shared@a.com", team_id=alpha.id)
+    free = await _make_user(session, "free@b.com", team_id=beta.id)
+    busy_meeting = await _create(session, alpha_boss, "Alpha sync", START, [shared.id])
+
+    # Пользователь перешёл в другую команду, но встреча в старой осталась.
+    shared.team_id = beta.id
+    await session.commit()
+
+    with pytest.raises(HTTPException) as exc:
+        await _create(session, beta_boss, "Beta sync", START + timedelta(minutes=30), [shared.id, free.id], check=True)
+    assert exc.value.status_code == 409
+    assert exc.value.detail["conflicts"] == [{"user_id": shared.id, "meeting_ids": [busy_meeting.id]}]
+
+    # Встык — не конфликт.
+    await _create(session, beta_boss, "Beta later", START + timedelta(hours=1), [shared.id], check=True)
+
+
+@pytest.mark.anyio
+async def test_moving_meeting_updates_participant_period(session: AsyncSession):
+    alpha = await _make_team(session, "Alpha")
+    beta = await _make_team(session, "Beta")
+    alpha_boss = await _make_user(session, "boss@a.com", role=TeamRole.manager, team_id=alpha.id)
+    beta_boss = await _make_user(session, "boss@b.com", role=TeamRole.manager, team_id=beta.id)
+    worker = await _make_user(session, "w@b.com", team_id=beta.id)
+    first = await _create(session, beta_boss, "First", START, [worker.id])
+    worker.team_id = alpha.id
+    await session.commit()
+    second = await _create(session, alpha_boss, "Second", START + timedelta(hours=3), [worker.id])
+
+    assert await find_busy_participants(session, [worker.id], START, START + timedelta(hours=1)) == {worker.id: [first.id]}
+
+    # Конец не меняется: иначе встреча по текущим правилам отменяется.
+    moved = START + timedelta(hours=2)
+    await crud.update_meeting(second.id, MeetingUpdate(starts_at=moved), session, check_participants=True)
+    assert await find_busy_participants(session, [worker.id], moved, moved + timedelta(minutes=30)) == {worker.id: [second.id]}
+
+    with pytest.raises(HTTPException) as exc:
+        await crud.update_meeting(second.id, MeetingUpdate(starts_at=START + timedelta(minutes=30)), session, check_participants=True)
+    assert exc.value.detail["conflicts"][0]["meeting_ids"] == [first.id]
+
+
+@pytest.mark.anyio
+async def test_add_participants_checks_meetings_of_other_teams(session: AsyncSession):
+    alpha = await _make_team(session, "Alpha")
+    beta = await _make_team(session, "Beta")
+    alpha_boss = await _make_user(session, "boss@a.com", role=TeamRole.manager, team_id=alpha.id)
+    beta_boss = await _make_user(session, "boss@b.com", role=TeamRole.manager, team_id=beta.id)
+    worker = await _make_user(session, "w@b.com", team_id=beta.id)
+    busy = await _create(session, beta_boss, "Beta", START, [worker.id])
+    worker.team_id = alpha.id
+    await session.commit()
+    meeting = await _create(session, alpha_boss, "Alpha", START + timedelta(minutes=15), [])
+
+    with pytest.raises(HTTPException) as exc:
+        await crud.add_participants(meeting.id, [worker.id], alpha_boss, session, check_participants=True)
+    assert exc.value.detail["conflicts"] == [{"user_id": worker.id, "meeting_ids": [busy.id]}]
+
+    assert await crud.add_participants(meeting.id, [worker.id], alpha_boss, session) == [worker.id]
+
+
+@pytest.mark.anyio
+async def test_participant_period_is_copied_for_orm_writes(session: AsyncSession):
+    team = await _make_team(session, "Alpha")
+    ann = await _make_user(session, "ann@a.com", team_id=team.id)
+    # связь Meeting.participants, как в админке: время в meeting_participants не передаётся
+    meeting = await _make_meeting(
+        session, team_id=team.id, starts_at=START, ends_at=START + timedelta(hours=1), participants=[ann],
+    )
+    assert await find_busy_participants(session, [ann.id], START, START + timedelta(minutes=30)) == {ann.id: [meeting.id]}
+
+    meeting.starts_at += timedelta(days=1)
+    meeting.ends_at += timedelta(days=1)
+    await session.commit()
+
+    assert await find_busy_participants(session, [ann.id], START, START + timedelta(hours=1)) == {}
+    moved = START + timedelta(days=1)
+    assert await find_busy_participants(session, [ann.id], moved, moved + timedelta(hours=1)) == {ann.id: [meeting.id]}
@@ -0,0 +1,97 @@
+from datetime import datetime, timedelta
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import event, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.meetings.availability import get_participant_ids
+from src.meetings.crud import MeetingCRUD
+from src.meetings.schemas import MeetingCreate
+from src.users.models import TeamRole, User
+from tests.helpers import _make_user, _make_team, _make_meeting
+
+
+START = datetime(2025, 6, 2, 10, 0, 0)
+
+
+async def _bulk_users(session: AsyncSession, team_id: int, count: int) -> list[int]:
+    await session.execute(insert(User), [
+        {"email": f"bulk{i}@t{team_id}.io", "hashed_password": "x", "team_id": team_id}
+        for i in range(count)
+    ])
+    return list((await session.scalars(
+        select(User.id).where(User.team_id == team_id, User.email.like("bulk%"))
+    )).all())
+
+
+@pytest.fixture
+def statements(engine):
+    executed: list[str] = []
+
+    def _collect(conn, cursor, statement, *args):
+        executed.append(statement)
+
+    event.listen(engine.sync_engine, "before_cursor_execute", _collect)
+    yield executed
+    event.remove(engine.sync_engine, "before_cursor_execute", _collect)
+
+
+@pytest.mark.anyio
+async def test_create_meeting_with_thousands_of_participants_in_one_insert(session: AsyncSession, statements):
+    team = await _make_team(session, "Alpha")
+    manager = await _make_user(session, "boss@a.com", role=TeamRole.manager, team_id=team.id)
+    invitees = await _bulk_users(session, team.id, 3000)
+    statements.clear()
+
+    meeting = await MeetingCRUD.create_meeting(
+        user=manager,
+        payload=MeetingCreate(
+            title="All hands", description=None,
+            starts_at=START, ends_at=START + timedelta(hours=1),
+            participant_ids=invitees,
+        ),
+        session=session,
+    )
+
+    inserts = [s for s in statements if s.startswith("INSERT") and "meeting_participants" in s]
+    assert len(inserts) == 1
+    assert await get_participant_ids(session, meeting.id) == sorted(invitees)
+
+
+@pytest.mark.anyio
+async def test_add_participants_is_idempotent_and_remove_deletes(session: AsyncSession):
+    team = await _make_team(session, "Beta")
+    manager = await _make_user(session, "boss@b.com", role=TeamRole.manager, team_id=team.id)
+    ann = await _make_user(session, "ann@b.com", team_id=team.id)
+    bob = await _make_user(session, "bob@b.com", team_id=team.id)
+    meeting = await _make_meeting(
+        session, team_id=team.id, starts_at=START, ends_at=START + timedelta(hours=1), participants=[ann],
+    )
+    crud = MeetingCRUD()
+
+    ids = await crud.add_participants(meeting.id, [ann.id, bob.id, bob.id], manager, session)
+    assert ids == sorted([ann.id, bob.id])
+
+    ids = await crud.remove_participants(meeting.id, [ann.id], manager, session)
+    assert ids == [bob.id]
+
+
+@pytest.mark.anyio
+async def test_add_participants_rejects_outsiders_and_foreign_meetings(session: AsyncSession):
+    team = await _make_team(session, "Gamma")
+    other_team = await _make_team(session, "Delta")
+    manager = await _make_user(session, "boss@g.com", role=TeamRole.manager, team_id=team.id)
+    outsider = await _make_user(session, "out@d.com", team_id=other_team.id)
+    meeting = await _make_meeting(session, team_id=team.id, starts_at=START, ends_at=START + timedelta(hours=1))
+    foreign = await _make_meeting(session, team_id=other_team.id, starts_at=START, ends_at=START + timedelta(hours=1))
+    crud = MeetingCRUD()
+
+    with pytest.raises(HTTPException) as exc:
+        await crud.add_participants(meeting.id, [manager.id, outsider.id], manager, session)
+    assert exc.value.status_code == 403
+    assert await get_participant_ids(session, meeting.id) == []
+
+    with pytest.raises(HTTPException) as exc:
+        await crud.add_participants(foreign.id, [manager.id], manager, session)
+    assert exc.value.status_code == 404
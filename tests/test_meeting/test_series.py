@@ -0,0 +1,188 @@
+from datetime import datetime, timedelta
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.meetings.checks.check_time import ensure_no_overlap
+from src.meetings.crud import MeetingCRUD, MeetingSeriesCRUD
+from src.meetings.models import Meeting, MeetingSeries, RecurrenceFreq
+from src.meetings.recurrence import MATERIALIZE_HORIZON, iter_occurrences
+from src.meetings.schemas import MeetingSeriesCreate
+from src.users.models import TeamRole
+from tests.helpers import _make_user, _make_team, _make_meeting
+
+
+NOW = datetime(2025, 1, 6, 8, 0, 0)
+START = datetime(2025, 1, 6, 10, 0, 0)
+
+
+def _series(freq: RecurrenceFreq, starts_at: datetime = START, **kw) -> MeetingSeries:
+    return MeetingSeries(
+        team_id=1,
+        title="standup",
+        starts_at=starts_at,
+        ends_at=starts_at + timedelta(minutes=30),
+        freq=freq,
+        interval=kw.pop("interval", 1),
+        until=kw.pop("until", None),
+        exdates=kw.pop("exdates", []),
+        materialized_until=starts_at,
+    )
+
+
+def _starts(series: MeetingSeries, start: datetime, end: datetime) -> list[datetime]:
+    return [s for s, _ in iter_occurrences(series, start, end)]
+
+
+def test_iter_occurrences_daily_window_and_exdates():
+    series = _series(RecurrenceFreq.daily, exdates=[(START + timedelta(days=2)).isoformat()])
+
+    starts = _starts(series, START + timedelta(days=1, minutes=15), START + timedelta(days=4))
+
+    assert starts == [START + timedelta(days=1), START + timedelta(days=3)]
+
+
+def test_iter_occurrences_weekly_interval_and_until():
+    series = _series(RecurrenceFreq.weekly, interval=2, until=START + timedelta(weeks=4))
+
+    starts = _starts(series, START, START + timedelta(weeks=52))
+
+    assert starts == [START, START + timedelta(weeks=2), START + timedelta(weeks=4)]
+
+
+def test_iter_occurrences_monthly_clamps_to_month_end():
+    series = _series(RecurrenceFreq.monthly, starts_at=datetime(2025, 1, 31, 10, 0))
+
+    starts = _starts(series, datetime(2025, 2, 1), datetime(2025, 5, 1))
+
+    assert starts == [
+        datetime(2025, 2, 28, 10, 0),
+        datetime(2025, 3, 31, 10, 0),
+        datetime(2025, 4, 30, 10, 0),
+    ]
+
+
+async def _manager(session: AsyncSession):
+    team = await _make_team(session, "Alpha")
+    manager = await _make_user(session, "boss@a.com", role=TeamRole.manager, team_id=team.id)
+    return team, manager
+
+
+def _payload(**kw) -> MeetingSeriesCreate:
+    return MeetingSeriesCreate(
+        title="standup",
+        starts_at=kw.pop("starts_at", START),
+        ends_at=kw.pop("ends_at", START + timedelta(minutes=30)),
+        freq=kw.pop("freq", RecurrenceFreq.weekly),
+        **kw,
+    )
+
+
+@pytest.mark.anyio
+async def test_create_series_materializes_only_within_horizon(session: AsyncSession):
+    team, manager = await _manager(session)
+
+    series = await MeetingSeriesCRUD().create_series(manager, _payload(), session, now=NOW)
+
+    stored = await session.scalar(select(func.count(Meeting.id)).where(Meeting.series_id == series.id))
+    assert series.materialized_until == NOW + MATERIALIZE_HORIZON
+    assert stored == 13
+
+    window_start = NOW + timedelta(days=200)
+    meetings = await MeetingCRUD().get_team_meetings(
+        session, manager, starts_after=window_start, ends_before=window_start + timedelta(weeks=3),
+    )
+    assert len(meetings) == 3
+    assert all(m.id is None and m.series_id == series.id for m in meetings)
+
+
+@pytest.mark.anyio
+async def test_create_series_conflicting_with_meeting_returns_409(session: AsyncSession):
+    team, manager = await _manager(session)
+    await _make_meeting(
+        session, team_id=team.id,
+        starts_at=START + timedelta(weeks=3, minutes=10), ends_at=START + timedelta(weeks=3, hours=1),
+    )
+
+    with pytest.raises(HTTPException) as exc:
+        await MeetingSeriesCRUD().create_series(manager, _payload(), session, now=NOW)
+
+    assert exc.value.status_code == 409
+    assert await session.scalar(select(func.count(MeetingSeries.id))) == 0
+
+
+@pytest.mark.anyio
+async def test_overlap_check_sees_virtual_occurrences(session: AsyncSession):
+    team, manager = await _manager(session)
+    await MeetingSeriesCRUD().create_series(manager, _payload(), session, now=NOW)
+    far = START + timedelta(weeks=30)
+
+    with pytest.raises(HTTPException) as exc:
+        await ensure_no_overlap(
+            session, team_id=team.id,
+            starts_at=far + timedelta(minutes=15), ends_at=far + timedelta(hours=1),
+        )
+    assert exc.value.status_code == 409
+
+    await ensure_no_overlap(
+        session, team_id=team.id, starts_at=far + timedelta(hours=1), ends_at=far + timedelta(hours=2),
+    )
+
+
+@pytest.mark.anyio
+async def test_add_exception_removes_materialized_occurrence(session: AsyncSession):
+    team, manager = await _manager(session)
+    crud = MeetingSeriesCRUD()
+    series = await crud.create_series(manager, _payload(), session, now=NOW)
+    skipped = START + timedelta(weeks=1)
+
+    series = await crud.add_exception(series.id, skipped, manager, session)
+
+    assert skipped.isoformat() in series.exdates
+    assert await session.scalar(
+        select(Meeting.id).where(Meeting.series_id == series.id, Meeting.starts_at == skipped)
+    ) is None
+    with pytest.raises(HTTPException) as exc:
+        await crud.add_exception(series.id, skipped + timedelta(hours=1), manager, session)
+    assert exc.value.status_code == 404
+
+
+@pytest.mark.anyio
+async def test_extend_horizon_materializes_tail_and_skips_conflicts(session: AsyncSession):
+    team, manager = await _manager(session)
+    crud = MeetingSeriesCRUD()
+    series = await crud.create_series(manager, _payload(freq=RecurrenceFreq.daily), session, now=NOW)
+    taken = START + timedelta(days=95)
+    await _make_meeting(session, team_id=team.id, starts_at=taken, ends_at=taken + timedelta(minutes=20))
+
+    created = await crud.extend_horizon(session, now=NOW + timedelta(days=10))
+
+    await session.refresh(series)
+    assert created == 9
+    assert series.materialized_until == NOW + timedelta(days=10) + MATERIALIZE_HORIZON
+    assert taken.isoformat() in series.exdates
+    assert await session.scalar(select(func.count(Meeting.id)).where(Meeting.series_id == series.id)) == 99
+
+
+@pytest.mark.anyio
+async def test_extend_horizon_keeps_series_participants(session: AsyncSession):
+    team, manager = await _manager(session)
+    member = await _make_user(session, "member@example.com", team_id=team.id)
+    series = await MeetingSeriesCRUD.create_series(manager, _payload(), session, now=NOW)
+    first = await session.scalar(select(Meeting.id).where(Meeting.series_id == series.id, Meeting.starts_at == START))
+    await MeetingCRUD.add_participants(first, [member.id], manager, session)
+
+    async def may_meetings():
+        return await MeetingCRUD.get_user_meetings(
+            session, member, starts_after=datetime(2025, 5, 1), ends_before=datetime(2025, 6, 1),
+        )
+
+    assert len(await may_meetings()) == 4
+
+    assert await MeetingSeriesCRUD.extend_horizon(session, now=datetime(2025, 4, 1)) > 0
+
+    meetings = await may_meetings()
+    assert len(meetings) == 4
+    assert all(m.id is not None for m in meetings)
@@ -0,0 +1,79 @@
+from datetime import datetime, time, timedelta
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.meetings.availability import freebusy_cache, pick_slots, suggest_slots, working_mask
+from tests.helpers import _make_user, _make_team, _make_meeting
+
+
+MONDAY = datetime(2025, 4, 7, 0, 0, 0)
+STEP = timedelta(minutes=15)
+
+
+def _at(day: int, hour: int, minute: int = 0) -> datetime:
+    return MONDAY + timedelta(days=day, hours=hour, minutes=minute)
+
+
+@pytest.fixture(autouse=True)
+def _clear_freebusy_cache():
+    freebusy_cache.clear()
+    yield
+    freebusy_cache.clear()
+
+
+def test_pick_slots_finds_common_free_runs_inside_working_hours():
+    size = 7 * 24 * 4
+    allowed = working_mask(MONDAY, STEP, size, time(9), time(18))
+    busy = [
+        [(_at(0, 9), _at(0, 10))],
+        [(_at(0, 10, 15), _at(0, 11))],
+        [(_at(0, 11, 30), _at(0, 17, 30))],
+    ]
+
+    slots = pick_slots(busy, MONDAY, STEP, size, timedelta(minutes=30), 3, allowed)
+
+    assert slots == [
+        (_at(0, 11), _at(0, 11, 30)),
+        (_at(0, 17, 30), _at(0, 18)),
+        (_at(1, 9), _at(1, 9, 30)),
+    ]
+
+
+def test_pick_slots_skips_weekends_and_handles_no_room():
+    size = 7 * 24 * 4
+    allowed = working_mask(MONDAY, STEP, size, time(9), time(18))
+    assert pick_slots([], MONDAY, STEP, size, timedelta(hours=10), 1, allowed) == []
+
+    everyday = working_mask(MONDAY, STEP, size, time(9), time(18), weekdays_only=False)
+    weekdays_busy = [[(_at(0, 0), _at(5, 0))]]
+    assert pick_slots(weekdays_busy, MONDAY, STEP, size, timedelta(hours=1), 1, allowed) == []
+    assert pick_slots(weekdays_busy, MONDAY, STEP, size, timedelta(hours=1), 1, everyday) == [
+        (_at(5, 9), _at(5, 10)),
+    ]
+
+
+@pytest.mark.anyio
+async def test_suggest_slots_respects_participants_and_team_meetings(session: AsyncSession):
+    team = await _make_team(session, "Alpha")
+    ann = await _make_user(session, "ann@a.com", team_id=team.id)
+    bob = await _make_user(session, "bob@a.com", team_id=team.id)
+    other_team = await _make_team(session, "Beta")
+
+    await _make_meeting(session, team_id=other_team.id, title="ann", starts_at=_at(0, 9), ends_at=_at(0, 10), participants=[ann])
+    await _make_meeting(session, team_id=team.id, title="team", starts_at=_at(0, 10), ends_at=_at(0, 11))
+
+    slots = await suggest_slots(
+        session,
+        team_id=team.id,
+        user_ids=[ann.id, bob.id],
+        starts_at=_at(0, 8, 50),
+        ends_at=_at(0, 13),
+        duration=timedelta(minutes=45),
+        count=2,
+        step=STEP,
+        work_start=time(9),
+        work_end=time(18),
+    )
+
+    assert slots == [(_at(0, 11), _at(0, 11, 45)), (_at(0, 11, 45), _at(0, 12, 30))]
@@ -33,3 +33,31 @@ async def test_update_meeting_updates_fields_and_sets_canceled_if_ends_at_in_pay
     with pytest.raises(HTTPException) as exc:
         await MeetingCRUD.update_meeting(meeting_id=m.id + 999, payload=MeetingUpdate(title="x"), session=session)
     assert exc.value.status_code == 404
+
+
+@pytest.mark.anyio
+async def test_update_meeting_into_overlapping_slot_raises_409(session: AsyncSession):
+    team = await _make_team(session, "Upsilon")
+    start = datetime(2025, 2, 3, 10, 0, 0)
+    await _make_meeting(session, team_id=team.id, title="a", starts_at=start, ends_at=start + timedelta(hours=1))
+    other = await _make_meeting(
+        session, team_id=team.id, title="b",
+        starts_at=start + timedelta(hours=2), ends_at=start + timedelta(hours=3),
+    )
+
+    with pytest.raises(HTTPException) as exc:
+        await MeetingCRUD.update_meeting(
+            meeting_id=other.id,
+            payload=MeetingUpdate(starts_at=start + timedelta(minutes=30)),
+            session=session,
+        )
+    assert exc.value.status_code == 409
+    assert "пересекающиеся" in exc.value.detail
+
+    moved = await MeetingCRUD.update_meeting(
+        meeting_id=other.id,
+        payload=MeetingUpdate(starts_at=start + timedelta(hours=1)),
+        session=session,
+    )
+    assert moved.starts_at == start + timedelta(hours=1)
+
@@ -0,0 +1,94 @@
+import json
+import threading
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from src.config import OutboxConfig, settings
+from src.outbox.dispatcher import OutboxDispatcher
+from src.outbox.models import OutboxMessage, OutboxStatus
+from src.sync.crud import record_change
+from src.tasks.crud import TaskCRUD
+from tests.helpers import _make_user, _make_team
+
+
+class _Handler(BaseHTTPRequestHandler):
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        if self.path == "/fail":
+            self.send_response(500)
+        else:
+            self.server.received.append(body)
+            self.send_response(204)
+        self.end_headers()
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def webhook_server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    server.received = []
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield server, f"http://127.0.0.1:{server.server_port}"
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+@pytest.mark.anyio
+async def test_task_events_are_delivered_in_batches_and_retried(session: AsyncSession, engine, webhook_server, monkeypatch):
+    server, base = webhook_server
+    config = OutboxConfig(
+        webhooks=[f"{base}/hook", f"{base}/fail"],
+        events_per_request=2, max_attempts=2, backoff_base_seconds=0, backoff_max_seconds=0,
+    )
+    monkeypatch.setattr(settings.outbox, "webhooks", config.webhooks)
+    team = await _make_team(session, "Alpha")
+    author = await _make_user(session, "author@a.com", team_id=team.id)
+    for name in ("A", "B", "C"):
+        await TaskCRUD.create_task(
+            session, team_id=team.id, author_id=author.id, name=name,
+            description="-", deadline_at=datetime(2025, 1, 1),
+        )
+    assert len((await session.scalars(select(OutboxMessage))).all()) == 6
+
+    dispatcher = OutboxDispatcher(async_sessionmaker(engine, expire_on_commit=False), config)
+    try:
+        assert await dispatcher.dispatch_once() == 6
+        assert [len(body["events"]) for body in server.received] == [2, 1]
+        names = [event["data"]["name"] for body in server.received for event in body["events"]]
+        assert sorted(names) == ["A", "B", "C"]
+        assert all(event["team_id"] == team.id for body in server.received for event in body["events"])
+
+        session.expire_all()
+        left = (await session.scalars(select(OutboxMessage))).all()
+        assert {(m.endpoint, m.status, m.attempts) for m in left} == {(f"{base}/fail", OutboxStatus.pending, 1)}
+
+        assert await dispatcher.dispatch_once() == 3
+        session.expire_all()
+        left = (await session.scalars(select(OutboxMessage))).all()
+        assert {(m.status, m.attempts) for m in left} == {(OutboxStatus.dead, 2)}
+        assert left[0].last_error.startswith("HTTPStatusError")
+        assert await dispatcher.dispatch_once() == 0
+    finally:
+        await dispatcher.client.aclose()
+
+
+@pytest.mark.anyio
+async def test_rolled_back_change_leaves_no_outbox_message(session: AsyncSession, monkeypatch):
+    monkeypatch.setattr(settings.outbox, "webhooks", ["http://127.0.0.1:9/hook"])
+    team = await _make_team(session, "Alpha")
+    team_id = team.id
+    await session.commit()
+
+    await record_change(session, team_id, "task", 1, {"id": 1})
+    await session.rollback()
+
+    assert (await session.scalars(select(OutboxMessage))).all() == []
@@ -0,0 +1,193 @@
+import time
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import update
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from src.meetings.crud import MeetingCRUD
+from src.meetings.models import Meeting
+from src.meetings.schemas import MeetingCreate
+from src.reminders.scheduler import ReminderScheduler, utc_now
+from src.sync.crud import change_listeners
+from src.tasks.models import Status
+from src.users.models import TeamRole
+from tests.helpers import _make_user, _make_team, _make_meeting, _make_task
+
+
+NOW = datetime(2025, 6, 2, 9, 0, 0)
+
+
+class CollectingSink:
+    def __init__(self):
+        self.sent = []
+
+    async def send(self, reminder):
+        self.sent.append(reminder)
+
+    async def close(self):
+        pass
+
+
+def _scheduler(engine, sink):
+    return ReminderScheduler(
+        async_sessionmaker(engine, expire_on_commit=False),
+        sink,
+        leads={"meeting": timedelta(minutes=15), "task": timedelta(hours=1)},
+        lookahead=timedelta(hours=1),
+        clock=lambda: NOW,
+    )
+
+
+@pytest.mark.anyio
+async def test_load_window_and_fire_with_recipients(session: AsyncSession, engine):
+    team = await _make_team(session, "Alpha")
+    worker = await _make_user(session, "w@a.com", team_id=team.id)
+    meeting = await _make_meeting(
+        session, team_id=team.id, starts_at=NOW + timedelta(minutes=30),
+        ends_at=NOW + timedelta(hours=1), participants=[worker],
+    )
+    await _make_meeting(session, team_id=team.id, starts_at=NOW + timedelta(hours=3), ends_at=NOW + timedelta(hours=4))
+    task = await _make_task(session, team_id=team.id, author_id=worker.id, status=Status.open, name="Soon")
+    task.deadline_at = NOW + timedelta(minutes=90)
+    task.assignee_id = worker.id
+    done = await _make_task(session, team_id=team.id, author_id=worker.id, status=Status.done, name="Done")
+    done.deadline_at = NOW + timedelta(minutes=90)
+    await session.commit()
+
+    sink = CollectingSink()
+    scheduler = _scheduler(engine, sink)
+    assert await scheduler.load(NOW) == 2
+
+    assert await scheduler.fire_due(NOW + timedelta(minutes=14)) == 0
+    assert await scheduler.fire_due(NOW + timedelta(minutes=30)) == 2
+    assert [(r.kind, r.entity_id, r.recipients) for r in sink.sent] == [
+        ("meeting", meeting.id, ("w@a.com",)),
+        ("task", task.id, ("w@a.com",)),
+    ]
+    assert len(scheduler) == 0
+
+
+@pytest.mark.anyio
+async def test_crud_writes_update_the_heap(session: AsyncSession, engine):
+    team = await _make_team(session, "Alpha")
+    boss = await _make_user(session, "boss@a.com", role=TeamRole.manager, team_id=team.id)
+    await session.commit()
+    sink = CollectingSink()
+    scheduler = _scheduler(engine, sink)
+    await scheduler.load(NOW)
+    change_listeners.append(scheduler.on_changes)
+    try:
+        starts_at = NOW + timedelta(minutes=20)
+        created = await MeetingCRUD.create_meeting(
+            user=boss,
+            payload=MeetingCreate(
+                title="Standup", description=None,
+                starts_at=starts_at, ends_at=starts_at + timedelta(minutes=15),
+                participant_ids=[boss.id],
+            ),
+            session=session,
+        )
+        assert len(scheduler) == 1
+        await MeetingCRUD.delete_meeting(created.id, session)
+        assert len(scheduler) == 0
+    finally:
+        change_listeners.remove(scheduler.on_changes)
+
+    assert await scheduler.fire_due(NOW + timedelta(hours=1)) == 0
+    assert sink.sent == []
+
+
+@pytest.mark.anyio
+async def test_reminder_moved_elsewhere_is_rechecked_before_sending(session: AsyncSession, engine):
+    team = await _make_team(session, "Alpha")
+    meeting = await _make_meeting(
+        session, team_id=team.id, starts_at=NOW + timedelta(minutes=20), ends_at=NOW + timedelta(minutes=50),
+    )
+    sink = CollectingSink()
+    scheduler = _scheduler(engine, sink)
+    await scheduler.load(NOW)
+
+    # Правка из другого воркера: слушатель этого процесса о ней не знает.
+    await session.execute(
+        update(Meeting).where(Meeting.id == meeting.id)
+        .values(starts_at=NOW + timedelta(minutes=40), ends_at=NOW + timedelta(minutes=70))
+    )
+    await session.commit()
+
+    assert await scheduler.fire_due(NOW + timedelta(minutes=5)) == 0
+    assert await scheduler.fire_due(NOW + timedelta(minutes=25)) == 1
+    assert sink.sent[0].due_at == NOW + timedelta(minutes=40)
+
+
+@pytest.mark.anyio
+async def test_restarted_scheduler_does_not_resend(session: AsyncSession, engine):
+    team = await _make_team(session, "Alpha")
+    await _make_meeting(
+        session, team_id=team.id, starts_at=NOW + timedelta(minutes=10), ends_at=NOW + timedelta(minutes=40),
+    )
+    first = CollectingSink()
+    scheduler = _scheduler(engine, first)
+    await scheduler.load(NOW)
+    assert await scheduler.fire_due(NOW) == 1
+
+    # перезапуск или новый лидер: окно загружается заново с пустой кучей
+    second = CollectingSink()
+    restarted = _scheduler(engine, second)
+    assert await restarted.load(NOW) == 1
+    assert await restarted.fire_due(NOW + timedelta(minutes=1)) == 0
+    assert second.sent == []
+
+
+@pytest.mark.anyio
+async def test_changes_from_other_workers_inside_loaded_window_are_picked_up(session: AsyncSession, engine):
+    team = await _make_team(session, "Alpha")
+    later = await _make_meeting(
+        session, team_id=team.id, title="later", starts_at=NOW + timedelta(hours=5), ends_at=NOW + timedelta(hours=6),
+    )
+    sink = CollectingSink()
+    scheduler = _scheduler(engine, sink)
+    assert await scheduler.load(NOW) == 0
+
+    # Другой воркер: слушатель этого процесса не вызывается.
+    created = await _make_meeting(
+        session, team_id=team.id, title="new", starts_at=NOW + timedelta(minutes=20), ends_at=NOW + timedelta(minutes=30),
+    )
+    await session.execute(
+        update(Meeting).where(Meeting.id == later.id)
+        .values(starts_at=NOW + timedelta(minutes=40), ends_at=NOW + timedelta(minutes=50))
+    )
+    await session.commit()
+
+    assert await scheduler.load(NOW + timedelta(minutes=1)) == 2
+    assert await scheduler.fire_due(NOW + timedelta(minutes=30)) == 2
+    assert {r.entity_id for r in sink.sent} == {created.id, later.id}
+
+
+@pytest.fixture
+def non_utc_host(monkeypatch):
+    monkeypatch.setenv("TZ", "Asia/Yekaterinburg")
+    time.tzset()
+    yield
+    monkeypatch.undo()
+    time.tzset()
+
+
+@pytest.mark.anyio
+async def test_due_times_are_naive_utc_on_non_utc_host(session: AsyncSession, engine, non_utc_host):
+    assert abs(utc_now() - datetime.now(timezone.utc).replace(tzinfo=None)) < timedelta(seconds=5)
+
+    team = await _make_team(session, "Alpha")
+    await session.commit()
+    sink = CollectingSink()
+    scheduler = _scheduler(engine, sink)
+    await scheduler.load(NOW)
+    # дедлайн задан в +03:00 — это NOW + 90 минут по UTC
+    scheduler.on_changes(team.id, [{
+        "entity": "task", "id": 7,
+        "data": {"id": 7, "team_id": team.id, "name": "Report", "status": "open",
+                 "deadline_at": "2025-06-02T13:30:00+03:00"},
+    }])
+    assert len(scheduler) == 1
+    assert scheduler._pending[("task", 7)].due_at == NOW + timedelta(minutes=90)
+    assert scheduler._pending[("task", 7)].fire_at == NOW + timedelta(minutes=30)
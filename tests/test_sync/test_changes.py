@@ -0,0 +1,118 @@
+import pytest
+from datetime import datetime, timedelta
+
+from fastapi import HTTPException
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.meetings.crud import MeetingCRUD
+from src.meetings.schemas import MeetingCreate
+from src.sync.crud import SyncCRUD, encode_cursor
+from src.sync.models import ChangeLog, ChangeOp
+from src.tasks.crud import TaskCRUD
+from src.users.models import TeamRole
+from tests.helpers import _make_user, _make_team
+
+
+task_crud = TaskCRUD()
+START = datetime(2025, 6, 2, 10, 0, 0)
+
+
+async def _create_task(session: AsyncSession, team_id: int, author_id: int, name: str):
+    return await task_crud.create_task(
+        session, team_id=team_id, author_id=author_id, name=name,
+        description="-", deadline_at=datetime(2025, 1, 1),
+    )
+
+
+@pytest.mark.anyio
+async def test_changes_since_cursor_keep_only_last_state_per_entity(session: AsyncSession):
+    team = await _make_team(session, "Alpha")
+    author = await _make_user(session, "author@a.com", team_id=team.id)
+    cursor, has_more, changes = await SyncCRUD.get_changes(session, team.id, since=None)
+    assert changes == [] and has_more is False
+
+    kept = await _create_task(session, team.id, author.id, "Keep")
+    dropped = await _create_task(session, team.id, author.id, "Drop")
+    await task_crud.update_task(session, team.id, kept.id, {"name": "Kept"}, user=author)
+    await task_crud.delete_task(session, team.id, dropped.id, user=author)
+
+    new_cursor, has_more, changes = await SyncCRUD.get_changes(session, team.id, since=cursor)
+
+    assert has_more is False
+    assert new_cursor != cursor
+    by_id = {change["id"]: change for change in changes}
+    assert len(changes) == 2
+    assert by_id[kept.id]["op"] == ChangeOp.upsert
+    assert by_id[kept.id]["data"]["name"] == "Kept"
+    assert by_id[dropped.id]["op"] == ChangeOp.delete
+    assert by_id[dropped.id]["data"] is None
+
+    assert await SyncCRUD.get_changes(session, team.id, since=new_cursor) == (new_cursor, False, [])
+
+
+@pytest.mark.anyio
+async def test_changes_are_paged_with_has_more(session: AsyncSession):
+    team = await _make_team(session, "Alpha")
+    author = await _make_user(session, "author@a.com", team_id=team.id)
+    cursor, _, _ = await SyncCRUD.get_changes(session, team.id, since=None)
+    for i in range(3):
+        await _create_task(session, team.id, author.id, f"T{i}")
+
+    cursor, has_more, changes = await SyncCRUD.get_changes(session, team.id, since=cursor, limit=2)
+    assert has_more is True and len(changes) == 2
+    cursor, has_more, changes = await SyncCRUD.get_changes(session, team.id, since=cursor, limit=2)
+    assert has_more is False and [c["data"]["name"] for c in changes] == ["T2"]
+
+
+@pytest.mark.anyio
+async def test_cursor_of_another_team_is_gone(session: AsyncSession):
+    alpha = await _make_team(session, "Alpha")
+    beta = await _make_team(session, "Beta")
+
+    with pytest.raises(HTTPException) as exc:
+        await SyncCRUD.get_changes(session, beta.id, since=encode_cursor(alpha.id, 0))
+    assert exc.value.status_code == 410
+
+    with pytest.raises(HTTPException) as exc:
+        await SyncCRUD.get_changes(session, beta.id, since="garbage")
+    assert exc.value.status_code == 410
+
+
+@pytest.mark.anyio
+async def test_meeting_changes_are_logged(session: AsyncSession):
+    team = await _make_team(session, "Alpha")
+    manager = await _make_user(session, "boss@a.com", role=TeamRole.manager, team_id=team.id)
+    cursor, _, _ = await SyncCRUD.get_changes(session, team.id, since=None)
+
+    meeting = await MeetingCRUD.create_meeting(
+        user=manager,
+        payload=MeetingCreate(
+            title="Sync", description=None,
+            starts_at=START, ends_at=START + timedelta(hours=1),
+            participant_ids=[manager.id],
+        ),
+        session=session,
+    )
+    await MeetingCRUD.delete_meeting(meeting.id, session)
+
+    _, _, changes = await SyncCRUD.get_changes(session, team.id, since=cursor)
+    assert [(c["entity"], c["id"], c["op"]) for c in changes] == [("meeting", meeting.id, ChangeOp.delete)]
+
+
+@pytest.mark.anyio
+async def test_compact_keeps_latest_row_per_entity(session: AsyncSession):
+    team = await _make_team(session, "Alpha")
+    author = await _make_user(session, "author@a.com", team_id=team.id)
+    task = await _create_task(session, team.id, author.id, "A")
+    for name in ("B", "C"):
+        await task_crud.update_task(session, team.id, task.id, {"name": name}, user=author)
+    session.add(ChangeLog(team_id=team.id + 100, entity="task", entity_id=1, op=ChangeOp.delete))
+    await session.commit()
+    before, _, expected = await SyncCRUD.get_changes(session, team.id, since=encode_cursor(team.id, 0))
+
+    removed = await SyncCRUD.compact(session)
+
+    assert removed == 3
+    assert await session.scalar(select(func.count()).select_from(ChangeLog)) == 1
+    assert await SyncCRUD.get_changes(session, team.id, since=encode_cursor(team.id, 0)) == (before, False, expected)
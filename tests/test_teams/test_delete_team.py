@@ -1,8 +1,10 @@
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from src.sync.models import ChangeLog, ChangeOp
 from src.teams.crud import TeamCRUD
-from src.teams.models import Team
+from src.teams.models import Team, TeamSnapshot
+from src.teams.snapshot import get_snapshot
 from src.users.models import TeamRole, User
 from tests.helpers import _make_user, _make_team
 
@@ -26,6 +28,25 @@ async def test_delete_team_unlinks_members_and_deletes_team(session: AsyncSessio
     assert await crud.delete_team(session, 999_999) is False
 
 
+async def test_delete_team_records_team_and_membership_tombstones(session: AsyncSession):
+    t = await _make_team(session, "Logged")
+    u1 = await _make_user(session, "l1@example.com", role=TeamRole.admin, team_id=t.id)
+    u2 = await _make_user(session, "l2@example.com", role=TeamRole.employee, team_id=t.id)
+    await get_snapshot(session, t.id)
+
+    assert await crud.delete_team(session, t.id) is True
+
+    rows = (await session.execute(
+        select(ChangeLog).where(ChangeLog.team_id == t.id).order_by(ChangeLog.id)
+    )).scalars().all()
+    assert [(r.entity, r.entity_id, r.op) for r in rows] == [
+        ("membership", u1.id, ChangeOp.delete),
+        ("membership", u2.id, ChangeOp.delete),
+        ("team", t.id, ChangeOp.delete),
+    ]
+    assert await session.scalar(select(TeamSnapshot).where(TeamSnapshot.team_id == t.id)) is None
+
+
 async def test_remove_team_users_success(session: AsyncSession):
     owner = await _make_user(session, "r-owner@example.com", role=TeamRole.admin)
     team = await _make_team(session, "Remove", owner_id=owner.id)
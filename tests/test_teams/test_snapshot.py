@@ -0,0 +1,154 @@
+import json
+from datetime import datetime
+
+import pytest
+from fastapi import HTTPException, Request
+from sqlalchemy import func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.meetings.crud import MeetingCRUD
+from src.meetings.schemas import MeetingCreate
+from src.tasks.crud import TaskCRUD
+from src.sync.models import ChangeLog
+from src.tasks.models import Status, Task
+from src.teams import snapshot
+from src.teams.models import TeamSnapshot
+from src.teams.router import get_team_snapshot
+from src.teams.snapshot import check_snapshot, get_snapshot, rebuild_snapshot
+from src.users.models import TeamRole
+from tests.helpers import _make_team, _make_user
+
+
+task_crud = TaskCRUD()
+START = datetime(2030, 6, 3, 10, 0, 0)
+
+
+async def _snapshot(session: AsyncSession, team_id: int) -> tuple[int, dict]:
+    row = await get_snapshot(session, team_id)
+    return row.version, json.loads(row.body)
+
+
+@pytest.mark.anyio
+async def test_snapshot_follows_task_and_meeting_writes(session: AsyncSession):
+    team = await _make_team(session, "Alpha")
+    author = await _make_user(session, "author@example.com", role=TeamRole.admin, team_id=team.id)
+    await session.commit()
+
+    version, doc = await _snapshot(session, team.id)
+    assert doc["team"]["name"] == "Alpha"
+    assert [m["user_id"] for m in doc["members"]] == [author.id]
+    assert doc["open_tasks"] == [] and doc["upcoming_meetings"] == []
+
+    task = await task_crud.create_task(session, team_id=team.id, author_id=author.id, name="Report", description="-", deadline_at=START)
+    await MeetingCRUD.create_meeting(
+        author,
+        MeetingCreate(title="Sync", description=None, starts_at=START, ends_at=START.replace(hour=11)),
+        session,
+    )
+    after_writes, doc = await _snapshot(session, team.id)
+    # обе записи накатываются одним чтением
+    assert after_writes == version + 1
+    assert [t["name"] for t in doc["open_tasks"]] == ["Report"]
+    assert [m["title"] for m in doc["upcoming_meetings"]] == ["Sync"]
+
+    await task_crud.update_task(session, team.id, task.id, {"status": Status.done}, user=author)
+    _, doc = await _snapshot(session, team.id)
+    assert doc["open_tasks"] == []
+    assert await check_snapshot(session, team.id) == []
+
+
+@pytest.mark.anyio
+async def test_check_snapshot_reports_drift_and_rebuild_fixes_it(session: AsyncSession):
+    team = await _make_team(session, "Alpha")
+    author = await _make_user(session, "author@example.com", team_id=team.id)
+    task = await task_crud.create_task(session, team_id=team.id, author_id=author.id, name="Report", description="-", deadline_at=START)
+    await get_snapshot(session, team.id)
+    assert await check_snapshot(session, team.id) == []
+
+    # запись в обход CRUD снимок не обновляет
+    await session.execute(update(Task).where(Task.id == task.id).values(name="Renamed"))
+    await session.commit()
+    assert await check_snapshot(session, team.id) == ["open_tasks"]
+
+    assert await rebuild_snapshot(session, team.id) is True
+    await session.commit()
+    assert await check_snapshot(session, team.id) == []
+
+
+@pytest.mark.anyio
+async def test_snapshot_is_built_lazily_and_missing_team_gives_none(session: AsyncSession):
+    team = await _make_team(session, "Alpha")
+    await session.commit()
+
+    assert await session.get(TeamSnapshot, 1) is None
+    assert await check_snapshot(session, team.id) == ["missing"]
+    row = await get_snapshot(session, team.id)
+    assert row.version == 1
+    assert await get_snapshot(session, 9999) is None
+
+
+@pytest.mark.anyio
+async def test_concurrent_snapshot_miss_rebuilds_over_neighbours_row(session: AsyncSession, monkeypatch):
+    team = await _make_team(session, "Alpha")
+    session.add(TeamSnapshot(team_id=team.id, body=b'{"stale":true}', version=1))
+    await session.commit()
+
+    # первая проверка «не видит» строку, как если бы сосед вставил её сразу после неё
+    locked_row, misses = snapshot._locked_row, [None]
+
+    async def racing_locked_row(session, team_id):
+        row = await locked_row(session, team_id)
+        return misses.pop() if misses else row
+
+    monkeypatch.setattr(snapshot, "_locked_row", racing_locked_row)
+    assert await rebuild_snapshot(session, team.id) is True
+    await session.commit()
+
+    assert await check_snapshot(session, team.id) == []
+    assert (await get_snapshot(session, team.id)).version == 2
+
+
+@pytest.mark.anyio
+async def test_writes_leave_snapshot_row_alone_until_read(session: AsyncSession):
+    team = await _make_team(session, "Alpha")
+    author = await _make_user(session, "author@example.com", team_id=team.id)
+    await session.commit()
+    team_id, author_id = team.id, author.id
+    version, _ = await _snapshot(session, team_id)
+    body = (await session.get(TeamSnapshot, team_id)).body
+
+    await task_crud.create_task(session, team_id=team_id, author_id=author_id, name="Report", description="-", deadline_at=START)
+    await task_crud.create_task(session, team_id=team_id, author_id=author_id, name="Review", description="-", deadline_at=START)
+    row = (await session.execute(
+        select(TeamSnapshot.version, TeamSnapshot.body, TeamSnapshot.log_id).where(TeamSnapshot.team_id == team_id)
+    )).one()
+    head = await session.scalar(select(func.max(ChangeLog.id)).where(ChangeLog.team_id == team_id))
+    assert (row.version, row.body) == (version, body)
+    assert row.log_id < head
+
+    after, doc = await _snapshot(session, team_id)
+    assert after == version + 1
+    assert sorted(t["name"] for t in doc["open_tasks"]) == ["Report", "Review"]
+    assert await session.scalar(select(TeamSnapshot.log_id).where(TeamSnapshot.team_id == team_id)) == head
+    assert await check_snapshot(session, team_id) == []
+
+
+@pytest.mark.anyio
+async def test_snapshot_route_is_limited_to_team_members(session: AsyncSession):
+    team = await _make_team(session, "Alpha")
+    other = await _make_team(session, "Beta")
+    member = await _make_user(session, "member@example.com", team_id=team.id)
+    stranger = await _make_user(session, "stranger@example.com", team_id=other.id)
+    await session.commit()
+    request = Request({"type": "http", "method": "GET", "headers": []})
+
+    with pytest.raises(HTTPException) as exc:
+        await get_team_snapshot(team.id, request, session, stranger)
+    assert exc.value.status_code == 403
+
+    response = await get_team_snapshot(team.id, request, session, member)
+    assert response.status_code == 200
+    assert json.loads(response.body)["team"]["name"] == "Alpha"
+
+    stranger.is_superuser = True
+    assert (await get_team_snapshot(team.id, request, session, stranger)).status_code == 200
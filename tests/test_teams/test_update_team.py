@@ -1,6 +1,7 @@
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from src.sync.models import ChangeLog, ChangeOp
 from src.teams.crud import TeamCRUD
 from src.teams.schemas import TeamMemberIn
 from src.users.models import TeamRole, User
@@ -42,3 +43,16 @@ async def test_update_team_renames_and_adds_members(session: AsyncSession):
     roles = {m.user.id: m.role for m in team_after.members}
     assert roles[nu1.id] == TeamRole.admin
     assert roles[nu2.id] == TeamRole.employee
+
+
+async def test_update_team_rename_records_team_change(session: AsyncSession):
+    owner = await _make_user(session, "rn-owner@example.com")
+    team = await _make_team(session, "Before", owner_id=owner.id)
+
+    await crud.update_team(session=session, team_id=team.id, new_name="After", members=[])
+
+    row = await session.scalar(
+        select(ChangeLog).where(ChangeLog.team_id == team.id, ChangeLog.entity == "team")
+    )
+    assert row.entity_id == team.id and row.op == ChangeOp.upsert
+    assert row.payload == {"id": team.id, "name": "After", "owner_id": owner.id}
@@ -0,0 +1,36 @@
+import pytest
+from fastapi_users_db_sqlalchemy import SQLAlchemyUserDatabase
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.core.cache import response_cache, team_tag
+from src.sync.models import ChangeLog, ChangeOp
+from src.users.manager import UserManager
+from src.users.models import User
+from tests.helpers import _make_team, _make_user
+
+
+@pytest.mark.anyio
+async def test_update_and_delete_record_membership_and_drop_team_cache(session: AsyncSession):
+    team = await _make_team(session, "Alpha")
+    user = await _make_user(session, "old@a.com", team_id=team.id)
+    await session.commit()
+    manager = UserManager(SQLAlchemyUserDatabase(session, User))
+
+    response_cache.set("team", b"body", [team_tag(team.id)])
+    # то же, что делает BaseUserManager.update после проверки данных
+    user = await manager.user_db.update(user, {"email": "new@a.com"})
+    await manager.on_after_update(user, {"email": "new@a.com"})
+    assert response_cache.get("team") is None
+
+    response_cache.set("team", b"body", [team_tag(team.id)])
+    await manager.delete(user)
+    assert response_cache.get("team") is None
+
+    rows = (await session.scalars(
+        select(ChangeLog).where(ChangeLog.entity == "membership").order_by(ChangeLog.id)
+    )).all()
+    assert [(r.team_id, r.entity_id, r.op) for r in rows] == [
+        (team.id, user.id, ChangeOp.upsert),
+        (team.id, user.id, ChangeOp.delete),
+    ]
@@ -1,9 +1,12 @@
 import pytest
 from unittest.mock import AsyncMock, patch
 from fastapi import HTTPException
+from sqlalchemy import select
 
+from src.sync.models import ChangeLog
 from src.users.actions.route_superuser import make_user_admin, SuperuserIn
 from src.users.models import TeamRole
+from tests.helpers import _make_team, _make_user
 
 
 @pytest.mark.asyncio
@@ -11,8 +14,11 @@ async def test_make_user_admin():
     mock_user = AsyncMock()
     mock_user.role_in_team = TeamRole.employee
 
+    mock_user.team_id = None
+
     mock_session = AsyncMock()
     mock_session.scalar.return_value = mock_user
+    mock_session.info = {}
 
     mock_superuser = AsyncMock()
 
@@ -20,6 +26,7 @@ async def test_make_user_admin():
 
     assert mock_user.role_in_team == TeamRole.admin
     assert response.status_code == 204
+    mock_session.commit.assert_awaited_once()
 
 
 @pytest.mark.asyncio
@@ -39,3 +46,17 @@ def test_superuser_in_schema():
     schema = SuperuserIn(email="test@test.com", password="pass123")
     assert schema.email == "test@test.com"
     assert schema.password == "pass123"
+
+
+@pytest.mark.anyio
+async def test_make_user_admin_records_membership_change(session):
+    team = await _make_team(session, "Alpha")
+    user = await _make_user(session, "emp@a.com", role=TeamRole.employee, team_id=team.id)
+    await session.commit()
+
+    await make_user_admin(user.id, AsyncMock(), session)
+
+    row = await session.scalar(select(ChangeLog).where(ChangeLog.entity == "membership"))
+    assert (row.team_id, row.entity_id, row.payload) == (
+        team.id, user.id, {"user_id": user.id, "team_id": team.id, "role": "admin"},
+    )